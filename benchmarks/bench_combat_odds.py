@@ -0,0 +1,76 @@
+"""戦闘の見込みの計算（combat_odds）とモンテカルロの比較ベンチマーク
+
+使い方:
+    python benchmarks/bench_combat_odds.py [--levels N] [--fights N] [--seed N]
+
+matrix : BalanceMatrix.build（全部の敵 × レベル 1..N × 武器・鎧・指輪の組み合わせ）の時間
+enemy  : 初期装備のプレイヤーが敵を倒すまでの攻撃回数。Fight.roll_em で --fights 回戦わせた平均と時間を、
+         combat_odds で計算した期待値と比べる
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_pathfinding import build_game  # noqa: E402
+from combat_odds import BalanceMatrix, get_fight_hit_damage, get_fight_odds, player_attack_odds  # noqa: E402
+from enemy import EnemyManager  # noqa: E402
+from fight import Fight  # noqa: E402
+from status import Status  # noqa: E402
+
+
+def attacks_to_kill(fight, player, enemy):
+    """Fight.roll_em で enemy の最大HP以上のダメージを与えるまでの攻撃回数"""
+    damage = attacks = 0
+    while damage < enemy.status.max_hp:
+        damage += fight.roll_em(player, enemy)[1]
+        attacks += 1
+    return attacks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, default=10)
+    parser.add_argument("--fights", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        matrix = BalanceMatrix()
+    start_time = time.perf_counter()
+    rows = matrix.build(range(1, args.levels + 1))
+    elapsed = time.perf_counter() - start_time
+    print(f"matrix : {len(rows)} rows in {elapsed:.3f}s ({elapsed / len(rows) * 1e6:.2f} us/row)")
+
+    game, player, _ = build_game(0, args.seed)
+    game.random = random.Random(args.seed)
+    fight = Fight(player, [], game, game.logger)
+    enemy_manager = EnemyManager()
+    for data in enemy_manager.enemy_data[:: max(1, len(enemy_manager.enemy_data) // 5)]:
+        enemy = enemy_manager.create_enemy(data["level"], 0, 0, game.random)
+        enemy.status = Status(data)  # 深い階の補正をしないYAMLのままのステータス
+
+        get_fight_odds.cache_clear()  # 行列を作ったときに求めた分布を使い回さない
+        get_fight_hit_damage.cache_clear()
+        start_time = time.perf_counter()
+        odds = player_attack_odds(player, enemy)
+        expected = odds.attacks_to_kill(enemy.status.max_hp)
+        exact_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        total = sum(attacks_to_kill(fight, player, enemy) for _ in range(args.fights))
+        monte_carlo_time = time.perf_counter() - start_time
+        print(
+            f"enemy  : {data['name']:>12}  exact {expected:6.2f} attacks in {exact_time * 1e3:6.2f} ms | "
+            f"{args.fights} fights {total / args.fights:6.2f} attacks in {monte_carlo_time * 1e3:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""ゲームデータ（assets/data のYAML）の読み込みが起動と階層生成に占める時間のベンチマーク
+
+使い方:
+    python benchmarks/bench_content_loading.py [--floors N] [--seed N]
+
+ゲームの起動（Simulationの組み立て）、アイテム管理クラスの生成、
+階層1つ分の生成（build_floor）の時間を表示する。
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from armor import ArmorManager  # noqa: E402
+from enemy import EnemyManager  # noqa: E402
+from floor_builder import build_floor  # noqa: E402
+from item_manager import ItemManager  # noqa: E402
+from potion import PotionManager  # noqa: E402
+from ring import RingManager  # noqa: E402
+from simulation import Simulation  # noqa: E402
+from weapon import WeaponManager  # noqa: E402
+
+MANAGERS = (WeaponManager, ArmorManager, RingManager, PotionManager, EnemyManager, ItemManager)
+
+
+def timed(function, *args):
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*args)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--floors", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    simulation, startup_time = timed(Simulation, None, 5, None, args.seed)
+    print(f"startup (Simulation setup): {startup_time * 1000:9.2f} ms")
+    for manager_class in MANAGERS:
+        _, elapsed = timed(manager_class)
+        print(f"{manager_class.__name__ + '()':26s}: {elapsed * 1000:9.3f} ms")
+
+    player, enemy_manager = simulation.player, simulation.enemy_manager
+    floor_times = [timed(build_floor, args.seed, level, enemy_manager, player)[1] for level in range(2, 2 + args.floors)]
+    print(f"build_floor (mean of {args.floors})   : {sum(floor_times) / len(floor_times) * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
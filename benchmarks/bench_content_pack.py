@@ -0,0 +1,85 @@
+"""ゲームデータの読み込み（コールドスタート）をYAMLとコンテンツパックで比べるベンチマーク
+
+使い方:
+    python benchmarks/bench_content_pack.py [--repeat N]
+
+assets をテンポラリディレクトリに複製し、パックなし（YAML）とパックありのそれぞれについて、
+新しいPythonプロセスでの「content_dbのimport＋全カテゴリの読み込み」の時間（うち読み込みだけの時間）と、
+assets 以下で開いたファイルの数を表示する。
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parent.parent.joinpath("src")
+sys.path.append(str(SRC_PATH))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from content_pack import build_pack  # noqa: E402
+
+# 子プロセスで実行するコード。assets 以下のファイルを開いた回数を監査フックで数える
+COLD_START = """
+import json, sys, time
+start_time = time.perf_counter()
+assets_path = sys.argv[1]
+opened = []
+sys.addaudithook(lambda event, args: event == "open" and str(args[0]).startswith(assets_path) and opened.append(args[0]))
+from content_db import ContentDatabase
+load_start_time = time.perf_counter()
+database = ContentDatabase(sys.argv[2])
+database.preload()
+end_time = time.perf_counter()
+print(json.dumps({
+    "elapsed": end_time - start_time,
+    "load": end_time - load_start_time,
+    "opened": len(opened),
+    "source": database.stats["source"],
+}))
+"""
+
+
+def cold_start(base_path):
+    assets_path = str(Path(base_path).joinpath("assets"))
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START, assets_path, str(base_path)],
+        cwd=SRC_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def report(label, base_path, repeat):
+    runs = [cold_start(base_path) for _ in range(repeat)]
+    elapsed = statistics.median(run["elapsed"] for run in runs)
+    load = statistics.median(run["load"] for run in runs)
+    print(
+        f"{label:6s}: cold start {elapsed * 1000:8.2f} ms (data load {load * 1000:7.2f} ms), "
+        f"files opened under assets: {runs[0]['opened']:3d} ({runs[0]['source']})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base_path:
+        shutil.copytree(SRC_PATH.parent.joinpath("assets"), Path(base_path).joinpath("assets"), dirs_exist_ok=True)
+        pack_path = Path(base_path).joinpath("assets", "content.pack")
+        pack_path.unlink(missing_ok=True)
+        report("yaml", base_path, args.repeat)
+        build_pack(Path(base_path).joinpath("assets"))
+        report("pack", base_path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""ダイスを振る処理のベンチマーク
+
+使い方:
+    python benchmarks/bench_dice.py [--attacks N] [--samples N] [--seed N]
+
+roll_em : Fight.roll_em（プレイヤーが武器ごとに敵を攻撃する。"1d6+1d6" のように項が複数の武器も含む）
+throw   : Game.calculate_throw_damage（武器・防具・指輪を投げたときのダメージ）
+enemy   : Enemy._roll_attack（敵からプレイヤーへの攻撃）
+sample  : DiceExpression.roll_many（random.Random）と DiceExpression.sample（NumPy）でまとめて振る速さ
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from armor import ArmorManager  # noqa: E402
+from bench_pathfinding import build_game  # noqa: E402
+from dice import parse_dice  # noqa: E402
+from fight import Fight  # noqa: E402
+from numpy_loader import get_numpy  # noqa: E402
+from ring import RingManager  # noqa: E402
+from weapon import WeaponManager  # noqa: E402
+
+
+def per_call(function, calls, repeat=5):
+    """function() 1回あたりの時間（repeat 回測った中で最も速いもの）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, time.perf_counter() - start_time)
+    return best / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attacks", type=int, default=20000)
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    game, player, _ = build_game(20, args.seed)
+    game.random = random.Random(args.seed)
+    enemy = game.get_enemies()[0]
+    fight = Fight(player, game.get_enemies(), game, game.logger)
+
+    weapons = WeaponManager().weapon_instance_list
+    for weapon in weapons:
+        player.equipped_weapon = weapon
+        roll_em = per_call(lambda: fight.roll_em(player, enemy), args.attacks // len(weapons))
+        print(f"roll_em : {roll_em * 1e6:7.3f} us/attack  ({weapon.name}, {weapon.wielded_dice})")
+
+    items = WeaponManager().weapon_instance_list + ArmorManager().armor_instance_list + RingManager().ring_instance_list
+    throws = itertools.cycle(items)
+    throw = per_call(lambda: game.calculate_throw_damage(next(throws)), args.attacks)
+    print(f"throw   : {throw * 1e6:7.3f} us/throw   ({len(items)} kinds of items)")
+    enemy_attack = per_call(lambda: enemy._roll_attack(player, game.random), args.attacks)
+    print(f"enemy   : {enemy_attack * 1e6:7.3f} us/attack  ({enemy.status.name})")
+
+    dice = parse_dice("3d6")
+    rng = random.Random(args.seed)
+    start_time = time.perf_counter()
+    dice.roll_many(args.samples, rng)
+    python_time = time.perf_counter() - start_time
+    print(f"sample  : {python_time / args.samples * 1e9:7.1f} ns/roll (roll_many, {dice})")
+    np = get_numpy()
+    if np is not None:
+        generator = np.random.default_rng(args.seed)
+        start_time = time.perf_counter()
+        dice.sample(args.samples, generator)
+        numpy_time = time.perf_counter() - start_time
+        print(f"sample  : {numpy_time / args.samples * 1e9:7.1f} ns/roll (sample with NumPy, {dice})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""ダンジョン生成のPython版とNumPy版の所要時間を、マップの大きさを変えて比べるベンチマーク
+
+使い方:
+    python benchmarks/bench_dungeon_generation.py [--scales 1,10,100] [--repeat N] [--seed N] [--compact]
+
+scale は 48x28 に対する面積の倍率。1回の GameMap 生成（tiles/room_info/walkableの構築を含む）の
+平均時間を表示する。同じシードなら両方の実装は同じダンジョンを生成する。
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import constants as const  # noqa: E402
+import map as map_module  # noqa: E402
+from map import GameMap  # noqa: E402
+
+BASE_WIDTH, BASE_HEIGHT = 48, 28
+
+
+def bench_generation(backend, repeat, seed, compact):
+    const.DUNGEON_GENERATOR = backend
+    rng = random.Random(seed)
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        GameMap(rng, compact=compact)
+    return (time.perf_counter() - start_time) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10,100")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compact", action="store_true", help="コンパクトなグリッド（map_storage）で生成する")
+    args = parser.parse_args()
+
+    backends = ["python"] + (["numpy"] if map_module.get_numpy() is not None else [])
+    print(f"{'size':>9s} " + " ".join(f"{backend:>10s}" for backend in backends))
+    for scale in (float(s) for s in args.scales.split(",")):
+        factor = math.sqrt(scale)
+        const.GAMEMAP_WIDTH = round(BASE_WIDTH * factor)
+        const.GAMEMAP_HEIGHT = round(BASE_HEIGHT * factor)
+        times = [bench_generation(backend, args.repeat, args.seed, args.compact) for backend in backends]
+        size = f"{const.GAMEMAP_WIDTH}x{const.GAMEMAP_HEIGHT}"
+        print(f"{size:>9s} " + " ".join(f"{elapsed * 1000:8.2f}ms" for elapsed in times))
+
+
+if __name__ == "__main__":
+    main()
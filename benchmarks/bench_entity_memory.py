@@ -0,0 +1,85 @@
+"""階層に置くアイテム・敵・ゴールドが1体あたりに使うメモリを tracemalloc で測るベンチマーク
+
+使い方:
+    python benchmarks/bench_entity_memory.py [--items N] [--enemies N] [--seed N]
+
+items   : Game.place_items_in_dungeon と同じ Manager・同じ割合（食料・武器・防具・指輪・ポーション）で作ったアイテム
+enemies : EnemyManager.create_enemy で作った敵（Status・インベントリ・エフェクトを含む）
+gold    : ゴールドの山
+
+テンプレート（ContentDatabase）やManagerの読み込みは測る前に済ませておき、インスタンス自体の分だけを数える。
+標準ライブラリ内部のキャッシュ（sys.intern など）がたまたま伸びた分は含めない。
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import constants as const  # noqa: E402
+from armor import ArmorManager  # noqa: E402
+from enemy import EnemyManager  # noqa: E402
+from food import Food  # noqa: E402
+from gold import Gold  # noqa: E402
+from potion import PotionManager  # noqa: E402
+from ring import RingManager  # noqa: E402
+from weapon import WeaponManager  # noqa: E402
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_FILTERS = [tracemalloc.Filter(True, os.path.join(REPO_DIR, "*"))]  # リポジトリのコードから確保したメモリだけを数える
+
+
+def measure(create, count):
+    """create() を count 回呼んで作ったオブジェクトを保持したまま、増えたメモリ（バイト/個）を返す"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(REPO_FILTERS)
+    objects = [create() for _ in range(count)]
+    gc.collect()
+    after = tracemalloc.take_snapshot().filter_traces(REPO_FILTERS)
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--enemies", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    wm, am, rm, pm = WeaponManager(), ArmorManager(), RingManager(), PotionManager(rng)
+    enemy_manager = EnemyManager()
+    item_factories = {
+        "food": lambda: Food(rng=rng),
+        "weapon": lambda: wm.get_random_weapon(rng),
+        "armor": lambda: am.get_random_armor(rng),
+        "ring": lambda: rm.get_random_ring(rng),
+        "potion": lambda: pm.get_random_potion(rng),
+    }
+    # 1回ずつ作って、遅延して読み込まれるテンプレートやキャッシュを測る前に用意しておく
+    for create in item_factories.values():
+        create()
+    enemy_manager.create_enemy(const.AMULETLEVEL, 0, 0, rng)
+
+    total = 0.0
+    for name, create in item_factories.items():
+        size = measure(create, args.items)
+        total += size
+        print(f"{name:8s}: {size:7.1f} bytes/item")
+    print(f"{'items':8s}: {total / len(item_factories):7.1f} bytes/item (average)")
+    size = measure(lambda: enemy_manager.create_enemy(const.AMULETLEVEL, 0, 0, rng), args.enemies)
+    print(f"{'enemy':8s}: {size:7.1f} bytes/enemy")
+    size = measure(Gold, args.items)
+    print(f"{'gold':8s}: {size:7.1f} bytes/pile")
+
+
+if __name__ == "__main__":
+    main()
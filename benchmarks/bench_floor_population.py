@@ -0,0 +1,95 @@
+"""階層へのエンティティ配置（teleport_entity によるランダムな空きマスの選択）のベンチマーク
+
+使い方:
+    python benchmarks/bench_floor_population.py [--repeat N] [--enemies N] [--seed N] [--width W --height H]
+
+teleport_entity 1回あたりの時間、place_items_in_dungeon と同じ数のエンティティの配置、
+teleport_all_entities、アイテム生成を含む階層全体の配置（敵・階段・ゴールド・アイテム）の時間を表示する。
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import constants as const  # noqa: E402
+from bench_pathfinding import build_game  # noqa: E402
+from gold import Gold  # noqa: E402
+from stair import Stairs  # noqa: E402
+
+
+def bench_teleport(game, repeat):
+    gold = Gold()
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        game.teleport_entity(gold)
+    return (time.perf_counter() - start_time) / repeat
+
+
+def bench_place_entities(game, count):
+    """place_items_in_dungeon と同じ数のエンティティを配置する（アイテムの生成は含まない）"""
+    start_time = time.perf_counter()
+    for _ in range(count):
+        gold = Gold()
+        game.teleport_entity(gold)
+        game.add_entity(gold)
+    return time.perf_counter() - start_time
+
+
+def bench_teleport_all(game):
+    start_time = time.perf_counter()
+    game.teleport_all_entities()
+    return time.perf_counter() - start_time
+
+
+def bench_populate_floor(game, player, enemy_manager, num_enemies):
+    """generate_next_floor と同じ手順で、新しいマップに敵・階段・ゴールド・アイテムを配置する"""
+    game.clear_entities()
+    game.game_map.init_explored()
+    start_time = time.perf_counter()
+    game.teleport_entity(player)
+    game.add_entity(player)
+    enemy_manager.create_enemies(game, player.status.level, num_enemies)
+    stair = Stairs()
+    game.teleport_entity(stair)
+    game.add_entity(stair)
+    game.place_gold_in_dungeon(player.status.level)
+    game.place_items_in_dungeon(player.status.level)
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--enemies", type=int, default=const.INITIAL_SPAWN_ENEMY_NUM)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--width", type=int, default=const.GAMEMAP_WIDTH)
+    parser.add_argument("--height", type=int, default=const.GAMEMAP_HEIGHT)
+    args = parser.parse_args()
+
+    const.GAMEMAP_WIDTH, const.GAMEMAP_HEIGHT = args.width, args.height
+    num_items = const.NUMTHINGS + 99  # place_items_in_dungeon と同じ数
+
+    game, player, enemy_manager = build_game(args.enemies, args.seed)
+    random.seed(args.seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        teleport_time = bench_teleport(game, args.repeat)
+        place_time = bench_place_entities(game, num_items)
+        teleport_all_time = bench_teleport_all(game)
+        populate_time = bench_populate_floor(game, player, enemy_manager, args.enemies)
+
+    print(f"map {args.width}x{args.height}, {args.enemies} enemies, {len(game.entity_locations)} entities")
+    print(f"teleport_entity      : {teleport_time * 1e6:10.1f} us/call")
+    print(f"place {num_items} entities  : {place_time * 1000:10.2f} ms")
+    print(f"teleport_all_entities: {teleport_all_time * 1000:10.2f} ms")
+    print(f"populate floor       : {populate_time * 1000:10.2f} ms (item generation included)")
+
+
+if __name__ == "__main__":
+    main()
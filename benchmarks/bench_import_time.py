@@ -0,0 +1,83 @@
+"""モジュールのimportにかかる時間を `python -X importtime` で計るベンチマーク
+
+使い方:
+    python benchmarks/bench_import_time.py [--repeat N] [--top N] [module ...]
+
+モジュールごとに新しいPythonプロセスでimportし、importの合計時間（中央値）と、
+pygame・yamlを読み込んだかどうか、時間のかかったimportの上位を表示する。
+ゲームロジックのモジュール（map, ai, fight, status, item, effect, game など）はpygameを読み込まないこと。
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parent.parent.joinpath("src")
+
+DEFAULT_MODULES = [
+    "constants",
+    "map",
+    "ai",
+    "status",
+    "effect",
+    "item",
+    "fight",
+    "game",
+    "simulation",
+    "batch_runner",
+    "draw",
+    "input_handler",
+    "main",
+]
+
+# "import time: self [us] | cumulative | imported package" の行
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile_import(module):
+    """moduleを新しいプロセスでimportし、[(モジュール名, self [us], cumulative [us], 深さ)] を返す"""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_PATH,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'module':16s} {'import [ms]':>11s}  pygame  yaml  heaviest imports (cumulative)")
+    for module in args.modules:
+        runs = [profile_import(module) for _ in range(args.repeat)]
+        total_us = statistics.median(sum(entry[1] for entry in entries) for entries in runs)
+        names = {entry[0] for entry in runs[0]}
+        # 直接・間接にimportしたモジュールのうち、時間のかかったもの（対象自身は除く）
+        heaviest = sorted((entry for entry in runs[0] if entry[0] != module), key=lambda entry: -entry[2])
+        heaviest_text = ", ".join(f"{name} {cumulative / 1000:.1f}" for name, _, cumulative, _ in heaviest[: args.top])
+        print(
+            f"{module:16s} {total_us / 1000:11.2f}  {'yes' if 'pygame' in names else 'no':>6s}"
+            f"  {'yes' if 'yaml' in names else 'no':>4s}  {heaviest_text}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""メインループのアイドル時のCPU使用率と、キー入力から画面に反映されるまでの時間を測るベンチマーク
+
+使い方:
+    python benchmarks/bench_main_loop.py [--idle SECONDS] [--keys N] [--loop event|polling|both]
+
+event   : main.run_event_loop（入力を pygame.event.wait で待つ）
+polling : main.run_polling_loop（毎フレーム入力を調べて描き直し、PYGAME_ONE_TURN_WAIT_MS 待つ）
+
+idle    : 入力のない間のCPU使用率（プロセスのCPU時間 / 経過時間）と描いたフレーム数
+latency : 別スレッドから KEYDOWN（テンキー5 = rest）を送ってから、そのキーを処理したフレームを描き終えるまでの時間
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+import constants as const  # noqa: E402
+
+const.MESSAGE_CONSOLE_OUTPUT = False  # メッセージをコンソールに書き出さない（main.pyの読み込み前に設定する）
+import main as game_main  # noqa: E402
+
+LOOPS = {"event": game_main.run_event_loop, "polling": game_main.run_polling_loop}
+
+
+class FrameRecorder:
+    """キーを処理したフレームを描き終えた時刻と、描いたフレーム数を記録する"""
+
+    def __init__(self, drawer):
+        self.frames = 0
+        self.pending_key = False
+        self.key_frame_times = []
+        self.update_game = game_main.update_game
+        self.render_frame = drawer.render_frame
+        game_main.update_game = self.recording_update_game
+        drawer.render_frame = self.recording_render_frame
+
+    def recording_update_game(self, game, input_handler, player, enemy_manager, drawer, events=None):
+        if events and any(event.type == pygame.KEYDOWN for event in events):
+            self.pending_key = True
+        return self.update_game(game, input_handler, player, enemy_manager, drawer, events)
+
+    def recording_render_frame(self, logs):
+        regions = self.render_frame(logs)
+        self.frames += 1
+        if self.pending_key:
+            self.key_frame_times.append(time.perf_counter())
+            self.pending_key = False
+        return regions
+
+
+def post_events(events, interval, post_times):
+    """interval 秒ごとにイベントを送り、送った時刻を記録する（最後にQUITを送る）"""
+    for event in events:
+        time.sleep(interval)
+        post_times.append(time.perf_counter())
+        pygame.event.post(event)
+    time.sleep(interval)
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def run(loop_name, screen, clock, game, drawer, input_handler, enemy_manager, events, interval):
+    recorder = FrameRecorder(drawer)
+    post_times = []
+    sender = threading.Thread(target=post_events, args=(events, interval, post_times), daemon=True)
+    pygame.event.clear()
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    sender.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            LOOPS[loop_name](screen, clock, game, drawer, input_handler, enemy_manager)
+    finally:
+        game_main.update_game = recorder.update_game
+        drawer.render_frame = recorder.render_frame
+    elapsed = time.perf_counter() - start_wall
+    cpu = time.process_time() - start_cpu
+    sender.join()
+    latencies = [frame - post for post, frame in zip(post_times, recorder.key_frame_times)]
+    return elapsed, cpu, recorder.frames, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--idle", type=float, default=3.0, help="入力のない状態を測る秒数")
+    parser.add_argument("--keys", type=int, default=20, help="レイテンシを測るキー入力の回数")
+    parser.add_argument("--loop", choices=("event", "polling", "both"), default="both")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        screen, clock = game_main.initialize_game()
+        game, drawer, input_handler, player, enemy_manager = game_main.setup_game(screen)
+    player.status.max_hp = player.status.current_hp = 10**9
+
+    rest = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_KP5, mod=0, unicode="", scancode=0)
+    loop_names = ("polling", "event") if args.loop == "both" else (args.loop,)
+    for loop_name in loop_names:
+        elapsed, cpu, frames, _ = run(loop_name, screen, clock, game, drawer, input_handler, enemy_manager, [], args.idle)
+        print(
+            f"{loop_name:7s} idle   : CPU {cpu / elapsed:6.1%} ({cpu * 1000:7.1f} ms CPU in {elapsed:5.2f} s), "
+            f"{frames} frames drawn"
+        )
+        elapsed, cpu, frames, latencies = run(
+            loop_name, screen, clock, game, drawer, input_handler, enemy_manager, [rest] * args.keys, 0.1
+        )
+        latencies_ms = sorted(latency * 1000 for latency in latencies)
+        print(
+            f"{loop_name:7s} latency: median {statistics.median(latencies_ms):6.2f} ms, "
+            f"max {latencies_ms[-1]:6.2f} ms ({len(latencies_ms)} keys)"
+        )
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""GameMapのリスト実装とコンパクト実装（map_storage）のメモリ・アクセス速度を比べるベンチマーク
+
+使い方:
+    python benchmarks/bench_map_storage.py [--scales 1,10,100] [--repeat N] [--seed N]
+
+scale は 48x28 に対する面積の倍率。マップ1枚あたりの保持メモリ（tracemalloc）、
+pickleしたサイズ、生成時間、マス単位の読み書きと全マス走査の時間を表示する。
+"""
+
+import argparse
+import math
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import constants as const  # noqa: E402
+from map import GameMap  # noqa: E402
+
+BASE_WIDTH, BASE_HEIGHT = 48, 28
+
+
+def build_map(compact, seed):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    game_map = GameMap(random.Random(seed), compact=compact)
+    elapsed = time.perf_counter() - start_time
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return game_map, elapsed, retained
+
+
+def bench_cell_access(game_map, repeat):
+    rng = random.Random(0)
+    cells = [(rng.randrange(game_map.width), rng.randrange(game_map.height)) for _ in range(repeat)]
+    tiles, explored = game_map.tiles, game_map.explored
+
+    start_time = time.perf_counter()
+    for x, y in cells:
+        tiles[y][x]
+        explored[y][x] = True
+        explored[y][x]
+        game_map.get_room_id(x, y)
+    return (time.perf_counter() - start_time) / repeat
+
+
+def bench_full_scan(game_map):
+    start_time = time.perf_counter()
+    count = 0
+    for tile_row, explored_row in zip(game_map.tiles, game_map.explored):
+        for tile, is_explored in zip(tile_row, explored_row):
+            if is_explored and tile == ".":
+                count += 1
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1,10,100")
+    parser.add_argument("--repeat", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'size':>9s} {'backend':8s} {'memory':>10s} {'pickle':>10s} {'generate':>10s} {'cell r/w':>11s} {'scan':>10s}")
+    for scale in (float(s) for s in args.scales.split(",")):
+        factor = math.sqrt(scale)
+        const.GAMEMAP_WIDTH = round(BASE_WIDTH * factor)
+        const.GAMEMAP_HEIGHT = round(BASE_HEIGHT * factor)
+        size = f"{const.GAMEMAP_WIDTH}x{const.GAMEMAP_HEIGHT}"
+        for compact in (False, True):
+            game_map, generate_time, retained = build_map(compact, args.seed)
+            pickle_size = len(pickle.dumps((game_map.tiles, game_map.explored, game_map.room_info)))
+            access_time = bench_cell_access(game_map, args.repeat)
+            scan_time = bench_full_scan(game_map)
+            print(
+                f"{size:>9s} {'compact' if compact else 'list':8s} {retained / 1024:8.1f}KB {pickle_size / 1024:8.1f}KB "
+                f"{generate_time * 1000:8.2f}ms {access_time * 1e9:8.1f}ns {scan_time * 1000:8.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
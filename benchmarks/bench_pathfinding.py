@@ -0,0 +1,113 @@
+"""経路探索と敵ターンのベンチマーク
+
+使い方:
+    python benchmarks/bench_pathfinding.py [--repeat N] [--enemies N] [--seed N] [--width W --height H]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import constants as const  # noqa: E402
+from ai import Node, a_star_search  # noqa: E402
+from enemy import ChasePlayerBehavior, Enemy, EnemyManager  # noqa: E402
+from game import Game  # noqa: E402
+from game_initializer import GameInitializer  # noqa: E402
+from map import GameMap  # noqa: E402
+from message_bus import MessageBus  # noqa: E402
+
+
+def build_game(num_enemies, seed):
+    random.seed(seed)
+    logger = MessageBus()  # シンクなし（メッセージはリングバッファに残るだけ）
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game_map = GameMap()
+        game = Game(game_map)
+        game.set_logger(logger, logger)
+        initializer = GameInitializer(game, logger)
+        player = initializer.setup_player()
+        initializer.setup_stairs()
+        enemy_manager = EnemyManager()
+        enemy_manager.create_enemies(game, player.status.level, num_enemies)
+        game.set_enemy_manager(enemy_manager)
+    return game, player, enemy_manager
+
+
+def bench_a_star(game, repeat):
+    tiles = game.game_map.get_walkable_tiles()
+    rng = random.Random(0)
+    pairs = [(rng.choice(tiles), rng.choice(tiles)) for _ in range(repeat)]
+
+    start_time = time.perf_counter()
+    found = 0
+    for (sx, sy), (gx, gy) in pairs:
+        if a_star_search(Node(sx, sy), Node(gx, gy), game) is not None:
+            found += 1
+    elapsed = time.perf_counter() - start_time
+    return elapsed / repeat, found
+
+
+def bench_enemy_turns(game, player, enemy_manager, repeat):
+    # プレイヤーを眠らせず、敵の攻撃で死なないようにHPを十分に持たせる
+    player.status.max_hp = player.status.current_hp = 10**9
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            enemy_manager.update_enemies(game)
+    elapsed = time.perf_counter() - start_time
+    return elapsed / repeat
+
+
+def bench_chase(game, player, repeat):
+    """全ての敵がプレイヤーを追跡する場合の1ターン分の行動決定時間を測る"""
+    enemies = [entity for entities in game.entity_positions.values() for entity in entities if isinstance(entity, Enemy)]
+    behavior = ChasePlayerBehavior()
+    # 毎ターンプレイヤーが動いた想定で、隣接する2マスを行き来させる
+    x, y = player.x, player.y
+    neighbors = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))]
+    positions = [(x, y)] + [pos for pos in neighbors if game.game_map.is_walkable(*pos)][:1]
+
+    start_time = time.perf_counter()
+    for turn in range(repeat):
+        old_pos = (player.x, player.y)
+        player.x, player.y = positions[turn % len(positions)]
+        game.update_entity_position(player, old_pos)
+        for enemy in enemies:
+            behavior.determine_action(enemy, game)
+    elapsed = time.perf_counter() - start_time
+    return elapsed / repeat, len(enemies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--enemies", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--width", type=int, default=const.GAMEMAP_WIDTH)
+    parser.add_argument("--height", type=int, default=const.GAMEMAP_HEIGHT)
+    args = parser.parse_args()
+
+    const.GAMEMAP_WIDTH, const.GAMEMAP_HEIGHT = args.width, args.height
+
+    game, player, enemy_manager = build_game(args.enemies, args.seed)
+
+    a_star_time, found = bench_a_star(game, args.repeat)
+    print(f"a_star_search : {a_star_time * 1000:9.3f} ms/search ({found}/{args.repeat} found, {args.width}x{args.height})")
+
+    chase_time, num_chasers = bench_chase(game, player, args.repeat)
+    print(f"chase decide  : {chase_time * 1000:9.3f} ms/turn ({num_chasers} chasing enemies)")
+
+    turn_time = bench_enemy_turns(game, player, enemy_manager, args.repeat)
+    print(f"enemy turn    : {turn_time * 1000:9.3f} ms/turn ({args.enemies} enemies)")
+
+
+if __name__ == "__main__":
+    main()
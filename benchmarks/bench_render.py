@@ -0,0 +1,96 @@
+"""描画1フレームあたりの時間を測るベンチマーク（SDLのダミードライバで実行）
+
+使い方:
+    python benchmarks/bench_render.py [--frames N] [--enemies N] [--mode immediate|layered]
+
+immediate: 各パネルを毎フレーム描き直して display.flip() する従来の描画
+layered  : Draw.render_frame() によるレイヤー合成と差分更新
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+import constants as const  # noqa: E402
+from assets_manager import AssetsManager  # noqa: E402
+from bench_pathfinding import build_game  # noqa: E402
+from draw import Draw  # noqa: E402
+from message_log import MessageLog  # noqa: E402
+
+
+def draw_immediate(drawer, game, log_messages):
+    player = game.get_player()
+    drawer.draw_game_map()
+    drawer.draw_entity()
+    drawer.draw_log_window(log_messages)
+    drawer.draw_status_window(player.status)
+    drawer.draw_inventory_window(player)
+    pygame.display.flip()
+
+
+def draw_layered(drawer, game, log_messages):
+    drawer.render_frame(log_messages)
+
+
+def run(draw_frame, drawer, game, log_messages, frames, move_enemy, add_log=False):
+    enemies = game.get_enemies()
+    start_time = time.perf_counter()
+    for frame in range(frames):
+        if add_log:
+            # 戦闘ログのような、折り返しが必要な長さのメッセージを毎フレーム1件追加する
+            log_messages.append(
+                f"2024-01-01 12:00:{frame % 60:02d},000 - Turn {frame}: "
+                f"Hobgoblin attacks Player and hits for {frame % 7} damage. Player HP is low."
+            )
+        if move_enemy and enemies:
+            # 敵を1体だけ左右に往復させる
+            enemy = enemies[0]
+            old_pos = (enemy.x, enemy.y)
+            dx = 1 if frame % 2 == 0 else -1
+            if game.game_map.is_walkable(enemy.x + dx, enemy.y):
+                enemy.x += dx
+                game.update_entity_position(enemy, old_pos)
+        draw_frame(drawer, game, log_messages)
+    return (time.perf_counter() - start_time) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--enemies", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=("immediate", "layered"), default="layered")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((const.WINDOW_SIZE_W, const.WINDOW_SIZE_H))
+    game, player, _ = build_game(args.enemies, args.seed)
+    # 全マスを探索済みにして描画負荷を最大にする
+    for row in game.game_map.explored:
+        row[:] = [True] * len(row)
+    log_messages = MessageLog(f"log message {i}" for i in range(50))
+
+    drawer = Draw(screen, AssetsManager(), game.game_map, game)
+    game.set_drawer(drawer)
+    draw_frame = draw_immediate if args.mode == "immediate" else draw_layered
+    draw_frame(drawer, game, log_messages)  # ウォームアップ
+    drawer.assets_manager.reset_cache_stats()
+
+    idle = run(draw_frame, drawer, game, log_messages, args.frames, move_enemy=False)
+    print(f"{args.mode:9s} idle        : {idle * 1000:8.3f} ms/frame")
+    moving = run(draw_frame, drawer, game, log_messages, args.frames, move_enemy=True)
+    print(f"{args.mode:9s} enemy moving: {moving * 1000:8.3f} ms/frame")
+    logging = run(draw_frame, drawer, game, log_messages, args.frames, move_enemy=False, add_log=True)
+    print(f"{args.mode:9s} new log line: {logging * 1000:8.3f} ms/frame")
+    print(f"{args.mode:9s} cache stats : {drawer.assets_manager.get_cache_stats()}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""ヘッドレスでゲームを進め、ターン処理のスループットを測るベンチマーク
+
+使い方:
+    python benchmarks/bench_turns.py [--turns N] [--enemies N] [--seed N] [--width W --height H]
+                                     [--policy random|stairs] [--mortal] [--memory]
+
+ターン/秒、処理の内訳（プレイヤー行動・敵の更新・エフェクト・再出現）、
+--memory 指定時は tracemalloc によるピークメモリを表示する。
+既定ではプレイヤーを不死にして、指定ターン数を最後まで回す。
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import constants as const  # noqa: E402
+from simulation import PHASES, RandomPolicy, Simulation, StairsPolicy, get_policy_seed  # noqa: E402
+
+POLICIES = {"random": RandomPolicy, "stairs": StairsPolicy}
+
+
+def run_simulation(args):
+    policy = POLICIES[args.policy](get_policy_seed(args.seed))
+    simulation = Simulation(policy, num_enemies=args.enemies, seed=args.seed)
+    if not args.mortal:
+        player = simulation.player
+        player.status.max_hp = player.status.current_hp = 10**9
+
+    start_time = time.perf_counter()
+    summary = simulation.run(args.turns)
+    elapsed = time.perf_counter() - start_time
+    return simulation, summary, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--enemies", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--width", type=int, default=const.GAMEMAP_WIDTH)
+    parser.add_argument("--height", type=int, default=const.GAMEMAP_HEIGHT)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--mortal", action="store_true", help="プレイヤーが倒されたら終了する")
+    parser.add_argument("--memory", action="store_true", help="tracemallocでピークメモリを測る（計測は遅くなる）")
+    args = parser.parse_args()
+
+    const.GAMEMAP_WIDTH, const.GAMEMAP_HEIGHT = args.width, args.height
+
+    if args.memory:
+        tracemalloc.start()
+    # ゲーム内のprintは捨てる
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            simulation, summary, elapsed = run_simulation(args)
+        finally:
+            sys.stdout = stdout
+    if args.memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    turns = summary["turns"]
+    print(
+        f"{turns} turns in {elapsed:.3f} s: {turns / elapsed:10.1f} turns/s "
+        f"({args.width}x{args.height}, {args.enemies} enemies, policy={args.policy})"
+    )
+    print(f"result        : depth {summary['depth']}, exp level {summary['exp_level']}, game over {summary['game_over']}")
+    for phase in PHASES:
+        phase_time = simulation.phase_times[phase]
+        print(f"{phase:14s}: {phase_time / max(turns, 1) * 1000:9.4f} ms/turn ({phase_time / elapsed:6.1%})")
+    if args.memory:
+        print(f"peak memory   : {peak / 1024 / 1024:9.2f} MiB (tracemalloc)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""敵からプレイヤーが見えるかの判定（Enemy.can_see_player と描画の注目マーク）のベンチマーク
+
+使い方:
+    python benchmarks/bench_visibility.py [--turns N] [--frames N] [--enemies N] [--seed N] [--width W --height H]
+
+ai      : 毎ターンプレイヤーが1マス動き、全ての敵が can_see_player を呼ぶ（EnemyManager.update_enemies と同じく、
+          可視性のスナップショットはターンごとに1回取得する）
+sprites : プレイヤーが止まったまま、Draw.collect_entity_sprites（注目マークの判定を含む）を毎フレーム呼ぶ
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+import constants as const  # noqa: E402
+from assets_manager import AssetsManager  # noqa: E402
+from bench_pathfinding import build_game  # noqa: E402
+from draw import Draw  # noqa: E402
+
+
+def bench_ai(game, player, turns):
+    enemies = game.get_enemies()
+    # 毎ターンプレイヤーが動いた想定で、隣接するマスを行き来させる
+    x, y = player.x, player.y
+    neighbors = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))]
+    positions = [(x, y)] + [pos for pos in neighbors if game.game_map.is_walkable(*pos)][:1]
+
+    seen = 0
+    start_time = time.perf_counter()
+    for turn in range(turns):
+        player.x, player.y = positions[turn % len(positions)]
+        game.update_entity_position(player)
+        visibility = game.get_player_visibility()
+        for enemy in enemies:
+            if enemy.can_see_player(game, visibility):
+                seen += 1
+    elapsed = time.perf_counter() - start_time
+    return elapsed / turns, seen / turns
+
+
+def bench_sprites(drawer, frames):
+    start_time = time.perf_counter()
+    for _ in range(frames):
+        drawer.collect_entity_sprites()
+    return (time.perf_counter() - start_time) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--enemies", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--width", type=int, default=const.GAMEMAP_WIDTH)
+    parser.add_argument("--height", type=int, default=const.GAMEMAP_HEIGHT)
+    args = parser.parse_args()
+
+    const.GAMEMAP_WIDTH, const.GAMEMAP_HEIGHT = args.width, args.height
+
+    pygame.init()
+    screen = pygame.display.set_mode((const.WINDOW_SIZE_W, const.WINDOW_SIZE_H))
+    game, player, _ = build_game(args.enemies, args.seed)
+    num_enemies = len(game.get_enemies())
+    drawer = Draw(screen, AssetsManager(), game.game_map, game)
+
+    ai_time, seen = bench_ai(game, player, args.turns)
+    print(
+        f"ai      : {ai_time * 1000:8.3f} ms/turn, {ai_time / num_enemies * 1e6:6.3f} us/enemy "
+        f"({num_enemies} enemies, {seen:.1f} see the player, {args.width}x{args.height})"
+    )
+    sprites_time = bench_sprites(drawer, args.frames)
+    print(f"sprites : {sprites_time * 1000:8.3f} ms/frame, {sprites_time / num_enemies * 1e6:6.3f} us/enemy")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
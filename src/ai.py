@@ -1,3 +1,13 @@
+import heapq
+from array import array
+from collections import deque
+
+# 8方向の移動（すべて1ターンで移動できる）
+NEIGHBOR_OFFSETS = [(0, 1), (1, 0), (0, -1), (-1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)]
+STRAIGHT_COST = 1  # 上下左右の移動コスト
+DIAGONAL_COST = 1  # 斜めの移動コスト
+
+
 class Node:
     """経路探索のためのノード"""
 
@@ -10,42 +20,275 @@ class Node:
         self.f = 0  # g + h
 
 
+def octile_distance(dx, dy):
+    """オクタイル距離（斜め移動のコストを考慮した距離）"""
+    dx, dy = abs(dx), abs(dy)
+    return STRAIGHT_COST * (dx + dy) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(dx, dy)
+
+
 def heuristic(node, goal):
-    """ヒューリスティック関数（ここではマンハッタン距離を使用）"""
-    return abs(node.x - goal.x) + abs(node.y - goal.y)
-
-
-def a_star_search(start, goal, game):
-    """A*アルゴリズムによる経路探索"""
-    open_set = [start]
-    closed_set = set()
-
-    while open_set:
-        current_node = min(open_set, key=lambda node: node.f)
-        if (current_node.x, current_node.y) == (goal.x, goal.y):
-            path = []
-            while current_node.parent:
-                path.append(current_node)
-                current_node = current_node.parent
-            return path[::-1]  # ゴールからスタートへの経路を逆順にして返す
-
-        open_set.remove(current_node)
-        closed_set.add((current_node.x, current_node.y))
-
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)]:
-            neighbor = Node(current_node.x + dx, current_node.y + dy, current_node)
-            if (neighbor.x, neighbor.y) in closed_set:
-                continue
-            if not game.is_walkable(neighbor.x, neighbor.y):
-                continue
+    """ヒューリスティック関数（8方向移動と整合するオクタイル距離を使用）"""
+    return octile_distance(node.x - goal.x, node.y - goal.y)
+
+
+class AStarContext:
+    """A*探索用のバッファを保持し、複数回の探索で使い回すためのコンテキスト
+
+    g値・親・オープン/クローズ状態はマス番号（y * width + x）で引く配列に持つ。
+    探索ごとに世代番号を進め、世代が一致しない要素は未訪問として扱うため、
+    探索のたびに配列をクリアする必要はない。
+    """
+
+    def __init__(self, width=0, height=0):
+        self.width = 0
+        self.height = 0
+        self.search_id = 0
+        self.heap = []
+        self.ensure_size(width, height)
+
+    def ensure_size(self, width, height):
+        """マップサイズが変わった場合のみバッファを確保し直す"""
+        if (width, height) == (self.width, self.height):
+            return
+        size = width * height
+        self.width = width
+        self.height = height
+        self.g_score = array("i", bytes(4 * size))
+        self.parent = array("i", bytes(4 * size))
+        self.open_id = array("I", bytes(4 * size))  # g_scoreが有効な世代
+        self.closed_id = array("I", bytes(4 * size))  # クローズ済みになった世代
+        self.search_id = 0
+
+    def next_search_id(self):
+        self.search_id += 1
+        if self.search_id >= 0xFFFFFFFF:
+            # 世代番号が一周したらバッファをリセットする
+            self.open_id = array("I", bytes(4 * self.width * self.height))
+            self.closed_id = array("I", bytes(4 * self.width * self.height))
+            self.search_id = 1
+        return self.search_id
+
+    def search(self, start, goal, game):
+        """A*で経路を探索し、スタートの次のマスからゴールまでのNodeのリストを返す"""
+        game_map = game.game_map
+        width, height = game_map.width, game_map.height
+        self.ensure_size(width, height)
+        if not (0 <= start.x < width and 0 <= start.y < height):
+            return None
+
+        search_id = self.next_search_id()
+        g_score, parent = self.g_score, self.parent
+        open_id, closed_id = self.open_id, self.closed_id
+        heap = self.heap
+        heap.clear()
+
+        goal_x, goal_y = goal.x, goal.y
+        start_index = start.y * width + start.x
+        goal_index = goal_y * width + goal_x
+        g_score[start_index] = 0
+        parent[start_index] = -1
+        open_id[start_index] = search_id
+        h = octile_distance(start.x - goal_x, start.y - goal_y)
+        # (f, h, 挿入順, マス番号) 同じfならゴールに近いものを優先
+        counter = 0
+        heap.append((h, h, counter, start_index))
+
+        while heap:
+            _, _, _, index = heapq.heappop(heap)
+            if closed_id[index] == search_id:
+                continue  # 遅延削除：より良いg値で既に展開済み
+            closed_id[index] = search_id
+
+            if index == goal_index:
+                return self.build_path(start, goal_index, width)
+
+            x, y = index % width, index // width
+            next_g = g_score[index] + 1
+            for dx, dy in NEIGHBOR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                if closed_id[neighbor] == search_id:
+                    continue
+                if open_id[neighbor] == search_id and g_score[neighbor] <= next_g:
+                    continue
+                if not game.is_walkable(nx, ny):
+                    continue
+
+                g_score[neighbor] = next_g
+                parent[neighbor] = index
+                open_id[neighbor] = search_id
+                h = octile_distance(nx - goal_x, ny - goal_y)
+                counter += 1
+                heapq.heappush(heap, (next_g + h, h, counter, neighbor))
+
+        return None  # 経路が見つからない場合
+
+    def build_path(self, start, goal_index, width):
+        """親配列をたどってNodeの経路（スタートを含まない）を組み立てる"""
+        indices = []
+        index = goal_index
+        while self.parent[index] != -1:
+            indices.append(index)
+            index = self.parent[index]
+
+        goal_g = self.g_score[goal_index]
+        path = []
+        current = start
+        for index in reversed(indices):
+            node = Node(index % width, index // width, current)
+            node.g = self.g_score[index]
+            node.h = goal_g - node.g  # 経路上では残りコストが確定している
+            node.f = goal_g
+            path.append(node)
+            current = node
+        return path
 
-            neighbor.g = current_node.g + 1
-            neighbor.h = heuristic(neighbor, goal)
-            neighbor.f = neighbor.g + neighbor.h
 
-            if any(node for node in open_set if (node.x, node.y) == (neighbor.x, neighbor.y) and node.g <= neighbor.g):
+_default_context = AStarContext()
+
+
+def a_star_search(start, goal, game, context=None):
+    """A*アルゴリズムによる経路探索
+
+    context を渡すとそのバッファを使う。省略時はモジュール共通のコンテキストを使い回す。
+    """
+    if context is None:
+        context = _default_context
+    return context.search(start, goal, game)
+
+
+class PlayerVisibility:
+    """ある位置にいるプレイヤーが、どのマスにいる敵から見えるかのスナップショット
+
+    敵とプレイヤーが同じ部屋にいれば見える。どちらかが部屋の外（通路）にいれば、距離 sight_radius 以内なら見える。
+    プレイヤーの部屋IDと、通路の判定で見える近くのマスの集合を一度だけ求めておき、
+    敵ごとの判定は集合の参照と部屋IDの比較だけにする。
+    プレイヤーが移動するか、透明化状態かマップが変わるまで、敵のAIと描画で使い回す。
+    """
+
+    def __init__(self, game_map, origin_x, origin_y, invisible=False, sight_radius=3):
+        self.game_map = game_map
+        self.map_version = game_map.version
+        self.origin = (origin_x, origin_y)
+        self.invisible = invisible
+        self.room_id = None
+        self.room_info = game_map.room_info
+        self.near_cells = frozenset()
+        if not invisible and 0 <= origin_x < game_map.width and 0 <= origin_y < game_map.height:
+            self.compute(sight_radius)
+
+    def compute(self, sight_radius):
+        game_map = self.game_map
+        origin_x, origin_y = self.origin
+        self.room_id = game_map.get_room_id(origin_x, origin_y)
+        near_cells = set()
+        for dy in range(-sight_radius, sight_radius + 1):
+            y = origin_y + dy
+            if not 0 <= y < game_map.height:
                 continue
+            for dx in range(-sight_radius, sight_radius + 1):
+                x = origin_x + dx
+                # 平方根を取らず、距離の2乗で比べる
+                if 0 <= x < game_map.width and dx * dx + dy * dy <= sight_radius * sight_radius:
+                    # プレイヤーが部屋にいるとき、部屋の中のマスは距離ではなく部屋IDで判定する
+                    if self.room_id is None or game_map.get_room_id(x, y) is None:
+                        near_cells.add((x, y))
+        self.near_cells = frozenset(near_cells)
+
+    def is_valid_for(self, game_map, origin_x, origin_y, invisible):
+        """同じマップ・同じ位置・同じ透明化状態で計算済みか（マップが書き換わっていないか）を返す"""
+        return (
+            self.game_map is game_map
+            and self.map_version == game_map.version
+            and self.origin == (origin_x, origin_y)
+            and self.invisible == invisible
+        )
+
+    def can_see(self, x, y):
+        """(x, y) にいる敵からプレイヤーが見えるか"""
+        if self.invisible:
+            return False
+        if (x, y) in self.near_cells:
+            return True
+        # 部屋の外は None（コンパクトなグリッドでは -1）なので、部屋IDとそのまま比べてよい
+        return self.room_id is not None and self.room_info[y][x] == self.room_id
+
 
-            open_set.append(neighbor)
+class DistanceField:
+    """ある地点からの歩数（8方向BFS）を全マス分保持する距離マップ
 
-    return None  # 経路が見つからない場合
+    地形の移動可否だけを見て計算するため、キャラクターの位置が変わっても再計算は不要。
+    同じ地点を目指す複数の敵で1つの距離マップを共有し、各敵は隣接マスのうち
+    距離が最も小さいマスへ進むだけでよい。
+    """
+
+    UNREACHABLE = -1
+
+    def __init__(self, game_map, origin_x, origin_y):
+        self.game_map = game_map
+        self.map_version = game_map.version
+        self.width = game_map.width
+        self.height = game_map.height
+        self.origin = (origin_x, origin_y)
+        self.distances = array("i", [self.UNREACHABLE]) * (self.width * self.height)
+        self.compute()
+
+    def compute(self):
+        width, height = self.width, self.height
+        walkable = self.game_map.walkable
+        distances = self.distances
+        origin_x, origin_y = self.origin
+        if not (0 <= origin_x < width and 0 <= origin_y < height):
+            return
+
+        start = origin_y * width + origin_x
+        distances[start] = 0
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            x, y = index % width, index // width
+            next_distance = distances[index] + 1
+            for dx, dy in NEIGHBOR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    neighbor = ny * width + nx
+                    if walkable[neighbor] and distances[neighbor] == self.UNREACHABLE:
+                        distances[neighbor] = next_distance
+                        queue.append(neighbor)
+
+    def is_valid_for(self, game_map, origin_x, origin_y):
+        """同じマップ・同じ起点で計算済みか（マップが書き換わっていないか）を返す"""
+        return (
+            self.game_map is game_map
+            and self.map_version == game_map.version
+            and self.origin == (origin_x, origin_y)
+        )
+
+    def get_distance(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.distances[y * self.width + x]
+        return self.UNREACHABLE
+
+    def next_step(self, x, y, is_blocked=None):
+        """(x, y)から起点へ近づく隣接マスを返す。近づけない場合はNone
+
+        is_blocked(nx, ny) が True を返すマスは候補から外す。
+        """
+        current = self.get_distance(x, y)
+        if current == self.UNREACHABLE:
+            return None
+
+        best_step = None
+        best_distance = current
+        for dx, dy in NEIGHBOR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            distance = self.get_distance(nx, ny)
+            if distance == self.UNREACHABLE or distance >= best_distance:
+                continue
+            if is_blocked is not None and is_blocked(nx, ny):
+                continue
+            best_step = (nx, ny)
+            best_distance = distance
+        return best_step
@@ -2,9 +2,22 @@ from equipment import Equipment
 from assets_manager import AssetsManager
 import random
 from typing import List
+from dice import DiceField, parse_dice
+from flyweight import KindTemplate, TemplateField, get_kind_template
 
 
 class Armor(Equipment):
+    __slots__ = ()
+
+    type = TemplateField()
+    armor = TemplateField()
+    throw_dice = TemplateField()
+    throw_roll = DiceField("throw_dice")  # 解析済みのダイス式
+    protection_bonus = TemplateField()
+    avoidance_bonus = TemplateField()
+    use_effect = TemplateField()
+    flavor_text = TemplateField()
+
     def __init__(self, x=0, y=0, armor_data={}, is_cursed=False):
         super().__init__("Armor", x, y, char="]", color="white", is_cursed=is_cursed)
         self.load_data(armor_data)
@@ -14,19 +27,27 @@ class Armor(Equipment):
             print("Warning: Empty Armor data loaded.", data)
             return
 
-        self.type = data.get("type", "Armor")
-        self.name = data.get("name", "Unknown weapon")
-        self.char = data.get("char", ")")
-        self.color = data.get("color", "white")
-        self.undefined_name = data.get("undefined_name", "Unknown weapon")
-        self.armor = data.get("armor", "0")
-        self.throw_dice = data.get("throw_dice", "0d0")
-        self.protection_bonus = data.get("protection_bonus", "0")
-        self.avoidance_bonus = data.get("avoidance_bonus", "0")
-        self.use_effect = data.get("use_effect", None)
-        self.flavor_text = data.get("flavor_text", "")
+        self.template = get_kind_template(Armor.build_template, data)
         self.display_name = self.undefined_name
 
+    @staticmethod
+    def build_template(data):
+        throw_dice = data.get("throw_dice", "0d0")
+        return KindTemplate(
+            type=data.get("type", "Armor"),
+            name=data.get("name", "Unknown weapon"),
+            char=data.get("char", ")"),
+            color=data.get("color", "white"),
+            undefined_name=data.get("undefined_name", "Unknown weapon"),
+            armor=int(data.get("armor", 0)),
+            throw_dice=throw_dice,
+            throw_roll=parse_dice(throw_dice),
+            protection_bonus=int(data.get("protection_bonus", 0)),
+            avoidance_bonus=int(data.get("avoidance_bonus", 0)),
+            use_effect=data.get("use_effect", None),
+            flavor_text=data.get("flavor_text", ""),
+        )
+
     def attach_equip_info(self):
         equip_msg = ""
         if self.is_equipped:
@@ -92,9 +113,9 @@ class ArmorManager:
             armor_instance_list.append(armor_instance)
         return armor_instance_list
 
-    def get_random_armor(self) -> Armor:
+    def get_random_armor(self, rng=random) -> Armor:
         if self.armor_data_list:
-            armor_data = random.choice(self.armor_data_list)
+            armor_data = rng.choice(self.armor_data_list)
             return Armor(armor_data=armor_data)
         else:
             return None
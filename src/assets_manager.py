@@ -1,24 +1,95 @@
 import os
 import glob
-import yaml
+from collections import OrderedDict
 from pathlib import Path
-import pygame
-from typing import List
+from typing import List, Tuple
+from content_db import get_content_database
 
 
 class AssetsManager:
-    def __init__(self, base_path=None):
+    FONT_CACHE_SIZE = 16  # 保持するフォントの最大数
+    GLYPH_CACHE_SIZE = 2048  # 保持する描画済み文字列の最大数
+
+    def __init__(self, base_path=None, font_cache_size=FONT_CACHE_SIZE, glyph_cache_size=GLYPH_CACHE_SIZE):
         if base_path is None:
             self.base_path = Path(__file__).parent.parent
         else:
             self.base_path = Path(base_path)
 
+        # LRUキャッシュ（最後に使ったものが末尾に来る）
+        self.font_cache = OrderedDict()  # (フォント名, サイズ) -> pygame.font.Font
+        self.glyph_cache = OrderedDict()  # (フォント名, サイズ, 文字列, 色, アンチエイリアス, 太字) -> Surface
+        self.font_cache_size = font_cache_size
+        self.glyph_cache_size = glyph_cache_size
+        self.reset_cache_stats()
+
     def get_font_path(self, font_name):
         return self.base_path.joinpath('assets', 'fonts', font_name)
 
     def load_font(self, font_name, size):
+        """フォントを読み込む。一度読み込んだフォントはキャッシュから返す
+
+        返すフォントは共有されるため、set_boldなどで状態を変えた場合は元に戻すこと。
+        """
+        key = (font_name, size)
+        font = self.font_cache.get(key)
+        if font is not None:
+            self.font_cache.move_to_end(key)
+            self.cache_stats["font_hits"] += 1
+            return font
+
+        self.cache_stats["font_misses"] += 1
+        import pygame  # データだけを使う場合（ゲームロジック・ヘッドレス実行）はpygameを読み込まない
+
         font_path = self.get_font_path(font_name)
-        return pygame.font.Font(str(font_path), size)
+        font = pygame.font.Font(str(font_path), size)
+        self.font_cache[key] = font
+        if len(self.font_cache) > self.font_cache_size:
+            self.font_cache.popitem(last=False)
+        return font
+
+    def render_text(self, font_name, size, text, color, antialias=True, bold=False):
+        """文字列を描画したSurfaceを返す。同じ引数で描画済みのものはキャッシュから返す
+
+        返すSurfaceは共有されるため、書き換えずにblitだけに使うこと。
+        """
+        if isinstance(color, list):
+            color = tuple(color)
+        key = (font_name, size, text, color, antialias, bold)
+        surface = self.glyph_cache.get(key)
+        if surface is not None:
+            self.glyph_cache.move_to_end(key)
+            self.cache_stats["glyph_hits"] += 1
+            return surface
+
+        self.cache_stats["glyph_misses"] += 1
+        font = self.load_font(font_name, size)
+        if bold:
+            font.set_bold(True)
+            try:
+                surface = font.render(text, antialias, color)
+            finally:
+                font.set_bold(False)
+        else:
+            surface = font.render(text, antialias, color)
+        self.glyph_cache[key] = surface
+        if len(self.glyph_cache) > self.glyph_cache_size:
+            self.glyph_cache.popitem(last=False)
+        return surface
+
+    def get_cache_stats(self):
+        """フォント／文字列キャッシュのヒット数・ミス数と現在の保持数を返す"""
+        stats = dict(self.cache_stats)
+        stats["fonts_cached"] = len(self.font_cache)
+        stats["glyphs_cached"] = len(self.glyph_cache)
+        return stats
+
+    def reset_cache_stats(self):
+        self.cache_stats = {"font_hits": 0, "font_misses": 0, "glyph_hits": 0, "glyph_misses": 0}
+
+    def clear_cache(self):
+        self.font_cache.clear()
+        self.glyph_cache.clear()
 
     def get_chara_path(self, data_name) -> Path:
         return self.base_path.joinpath("assets", "data", "chara", data_name)
@@ -36,16 +107,22 @@ class AssetsManager:
     def get_config_path(self, data_name="config") -> Path:
         return self.base_path.joinpath("assets", data_name)
 
-    def get_item_data_list(self, data_name) -> List:
-        directory = self.get_item_path(data_name)
-        # print(f"directory = {directory}")
-        file_paths = list(directory.glob("*.yaml"))
-        # print(f"file_paths = {file_paths}")
-
-        data_list = []
-        for file_path in file_paths:
-            with open(file_path, "r", encoding="utf-8") as file:
-                data = yaml.safe_load(file)
-                data_list.append(data)
-        # print(f"len(data_list) = {len(data_list)}")
-        return data_list
+    def get_content_database(self):
+        """ゲームデータのYAMLを1回だけ読み込んで共有するデータベース"""
+        return get_content_database(self.base_path)
+
+    def get_item_data_list(self, data_name) -> Tuple:
+        """アイテムの種類（weapon, armor, ...）ごとのデータ（変更できないテンプレート）"""
+        return self.get_content_database().get_templates(f"item/{data_name}")
+
+    def get_item_data(self, data_name, file_name):
+        return self.get_content_database().get_template(f"item/{data_name}", file_name)
+
+    def get_enemy_data_list(self) -> Tuple:
+        return self.get_content_database().get_templates("enemy")
+
+    def get_chara_data(self, data_name):
+        return self.get_content_database().get_template("chara", data_name)
+
+    def get_config_data(self, data_name="config.yaml"):
+        return self.get_content_database().get_template("config", data_name)
@@ -0,0 +1,162 @@
+"""シード付きのヘッドレスゲームをプロセスプールで大量に実行し、結果をJSONL/CSVに書き出す
+
+使い方:
+    python src/batch_runner.py --games 1000 [--first-seed N] [--workers N] [--max-turns N]
+                               [--enemies N] [--policy random|stairs] [--output results.jsonl|results.csv]
+
+各ゲームは自分専用の random.Random(シード) だけを使うので、どのワーカーで何番目に
+実行されても同じシードなら同じ結果になる。結果は終わった順に1行ずつ書き出す。
+"""
+
+import argparse
+import collections
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import init_project  # noqa: F401
+from content_db import get_content_database
+
+# 1ゲーム分の結果として書き出す項目
+RESULT_FIELDS = (
+    "seed",
+    "depth",
+    "turns",
+    "steps",
+    "exp_level",
+    "kills",
+    "game_over",
+    "cause_of_death",
+    "elapsed",
+)
+
+
+def init_worker():
+    """ワーカープロセスの初期化。ゲーム内のprintは捨て、描画ドライバは使わない"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    sys.stdout = open(os.devnull, "w")
+
+
+def run_game(task):
+    """1ゲームを最後まで（またはmax_turnsまで）実行して結果のdictを返す"""
+    from simulation import RandomPolicy, Simulation, StairsPolicy, get_policy_seed
+
+    seed, max_turns, num_enemies, policy_name = task
+    policy_class = {"random": RandomPolicy, "stairs": StairsPolicy}[policy_name]
+
+    start_time = time.perf_counter()
+    simulation = Simulation(policy_class(get_policy_seed(seed)), num_enemies=num_enemies, seed=seed)
+    result = simulation.run(max_turns)
+    result["elapsed"] = round(time.perf_counter() - start_time, 4)
+    return result
+
+
+class ResultWriter:
+    """結果を1件ずつファイルへ書き出す（拡張子が.csvならCSV、それ以外はJSONL）"""
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.csv_writer = None
+        if path.endswith(".csv"):
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            self.csv_writer.writeheader()
+
+    def write(self, result):
+        row = {field: result.get(field) for field in RESULT_FIELDS}
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def run_batch(seeds, max_turns, num_enemies, policy_name="stairs", workers=None, on_result=None):
+    """seedsの各シードで1ゲームずつ実行し、終わった順に on_result(result) を呼ぶ
+
+    Returns:
+        list[dict]: シード順に並べた全ゲームの結果
+    """
+    tasks = [(seed, max_turns, num_enemies, policy_name) for seed in seeds]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # ゲームデータは先に読み込んでおき、forkしたワーカーには読み込み済みの状態を引き継ぐ
+    get_content_database().preload()
+
+    results = []
+    if workers <= 1:
+        # プールを作らずにこのプロセスで実行する（デバッグ・テスト用）
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            for task in tasks:
+                result = run_game(task)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    else:
+        # 1ゲームの実行時間はばらつくので、少しずつ配って終わった順に受け取る
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+            for result in pool.imap_unordered(run_game, tasks, chunksize=chunksize):
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+    results.sort(key=lambda result: result["seed"])
+    return results
+
+
+def summarize(results):
+    """全ゲームの結果を集計する"""
+    games = len(results)
+    if games == 0:
+        return {"games": 0}
+    causes = collections.Counter(result["cause_of_death"] for result in results if result["game_over"])
+    return {
+        "games": games,
+        "deaths": sum(causes.values()),
+        "mean_depth": sum(result["depth"] for result in results) / games,
+        "max_depth": max(result["depth"] for result in results),
+        "mean_turns": sum(result["turns"] for result in results) / games,
+        "mean_kills": sum(result["kills"] for result in results) / games,
+        "causes_of_death": dict(causes.most_common()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-turns", type=int, default=5000)
+    parser.add_argument("--enemies", type=int, default=5)
+    parser.add_argument("--policy", choices=("random", "stairs"), default="stairs")
+    parser.add_argument("--output", default="batch_results.jsonl")
+    args = parser.parse_args()
+
+    seeds = range(args.first_seed, args.first_seed + args.games)
+    writer = ResultWriter(args.output)
+    start_time = time.perf_counter()
+    try:
+        results = run_batch(seeds, args.max_turns, args.enemies, args.policy, args.workers, writer.write)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start_time
+
+    print(f"{len(results)} games in {elapsed:.2f} s ({len(results) / elapsed:.1f} games/s, {args.workers} workers)")
+    print(json.dumps(summarize(results), ensure_ascii=False, indent=2))
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
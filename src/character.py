@@ -10,13 +10,37 @@ from weapon import Weapon
 from armor import Armor
 from ring import Ring
 from effect import RegenerationEffect, StrengthEffect, ProtectionEffect, SleepEffect, InvisibilityEffect, PoisonEffect
-import pygame
 import sys
 
 
 class Character(Entity):
+    __slots__ = (
+        "char",
+        "color",
+        "status",
+        "logger",
+        "turn",
+        "turns_since_last_recovery",
+        "inventory",
+        "equipped_weapon",
+        "equipped_armor",
+        "equipped_right_ring",
+        "equipped_left_ring",
+        "enemy_search_active",
+        "damage_bonus",
+        "hit_bonus",
+        "can_act",
+        "effects",
+        "is_player",
+        "is_invisible",
+        "evasion_bonus",
+        "can_see_invisible",
+    )
+
     def __init__(self, x, y, status: Status, logger=None):
-        super().__init__(x, y, status.char, status.color)
+        super().__init__(x, y)
+        self.char = status.char
+        self.color = status.color
         self.status = status
         self.logger = logger
         self.turn = 0
@@ -73,7 +97,9 @@ class Character(Entity):
     def move(self, dx, dy, game):
         new_x, new_y = int(self.x + dx), int(self.y + dy)
         if game.game_map.is_walkable(new_x, new_y):
+            old_pos = (self.x, self.y)
             self.x, self.y = new_x, new_y
+            game.update_entity_position(self, old_pos)
             self.pick_up_item_at_feet(game)
 
     def is_alive(self):
@@ -125,9 +151,9 @@ class Character(Entity):
             self.turns_since_last_recovery = 0  # ターン数をリセット
 
     def add_logger(self, msg: str):
+        # 標準出力やファイルへの書き出しは、メッセージバスのシンクが行う
         if self.logger:
             self.logger.info(msg)
-        print(msg)  # 標準出力にも表示
 
     def pick_up_item_at_feet(self, game):
         item = game.get_item_at_position(self.x, self.y)
@@ -145,18 +171,20 @@ class Character(Entity):
         level_factor = const.LEVEL_FACTOR
         return int(base_exp * (level_factor ** (self.status.exp_level - 1)))
 
-    def gain_experience(self, value):
+    def gain_experience(self, value, rng=None):
         """経験値獲得処理"""
         self.status.exp += value
         self.status.next_exp = self.calculate_exp_to_next_level()
         
         # レベルアップチェック
         while self.status.exp >= self.calculate_exp_to_next_level():
-            self.level_up()
+            self.level_up(rng=rng)
 
-    def level_up(self, debug=False):
+    def level_up(self, debug=False, rng=None):
         """レベルアップ処理"""
         import random
+        if rng is None:
+            rng = random
         
         # 経験値の処理
         if debug is False:
@@ -164,8 +192,8 @@ class Character(Entity):
         self.status.exp_level += 1
 
         # ステータス上昇値の計算
-        hp_gain = random.randint(3, 5)
-        strength_gain = random.randint(1, 2)
+        hp_gain = rng.randint(3, 5)
+        strength_gain = rng.randint(1, 2)
 
         # ステータスの更新
         self.status.max_hp += hp_gain
@@ -178,22 +206,24 @@ class Character(Entity):
         self.add_logger(f"MAX HP +{hp_gain}")
         self.add_logger(f"Str + {strength_gain}")
 
-    def level_down(self):
+    def level_down(self, rng=None):
         """レベルダウン処理"""
         import random
+        if rng is None:
+            rng = random
 
         if self.status.exp_level > 1:  # レベル1未満にはならない
             self.status.exp_level -= 1
 
             # ステータス減少値の計算
-            hp_loss = random.randint(3, 5)
-            strength_loss = random.randint(1, 2)  # 1-2の攻撃力減少
+            hp_loss = rng.randint(3, 5)
+            strength_loss = rng.randint(1, 2)  # 1-2の攻撃力減少
             # defense_loss = random.randint(0, 1)  # 0-1の防御力減少
 
             # ステータスの更新（最低値を下回らないように）
             self.status.max_hp = max(1, self.status.max_hp - hp_loss)
             self.status.current_hp = min(self.status.current_hp, self.status.max_hp)
-            self.status.strength_power = max(1, self.status.strength - strength_loss)
+            self.status.strength = max(1, self.status.strength - strength_loss)
             # self.status.defense_power = max(0, self.status.defense_power - defense_loss)
 
             # 経験値のリセット
@@ -252,10 +282,16 @@ class Character(Entity):
         if self.is_player:  # プレイヤーの場合
             self.status.current_hp = 0
             self.add_logger("You have been defeated...")
-            
+
+            # ヘッドレス実行では演出・入力待ち・再スタートを行わず、ゲーム終了とする
+            if game.headless:
+                game.game_over = True
+                return
+            import pygame
+
             # 最後のゲーム状態を描画
             game.drawer.draw_game_map()
-            game.drawer.draw_entity(game.entity_positions.values())
+            game.drawer.draw_entity()
             game.drawer.draw_status_window(self.status)
             game.drawer.draw_inventory_window(self)
             game.drawer.draw_log_window(game.log_messages)
@@ -354,20 +390,23 @@ class Character(Entity):
 
         else:  # 敵の場合
             # 経験値の計算と付与
-            exp_gain = self.calculate_exp_reward()
+            exp_gain = self.calculate_exp_reward(game.random)
             player = game.get_player()
             if player:
-                player.gain_experience(exp_gain)
+                player.gain_experience(exp_gain, game.random)
                 self.add_logger(f"{self.status.name} was defeated! Gained {exp_gain} experience!")
             
             # 敵の削除処理
+            game.record_kill(self)
             game.remove_entity(self)
 
-    def calculate_exp_reward(self):
+    def calculate_exp_reward(self, rng=None):
         """経験値報酬の計算"""
         import random
+        if rng is None:
+            rng = random
         base_exp = self.status.level * 10  # 基本経験値
-        variance = random.randint(-5, 5)    # ±5の変動
+        variance = rng.randint(-5, 5)    # ±5の変動
         bonus = 0
         
         # ボーナス経験値の計算（オプション）
@@ -0,0 +1,346 @@
+"""戦闘の命中率・ダメージ分布・倒すまでのターン数を、乱数を振らずに計算する（敵のYAMLのバランス調整用）
+
+Fight.roll_em / swing / _calculate_damage（プレイヤーの攻撃）と Enemy._roll_attack（敵の攻撃）と同じ式で、
+1回の攻撃のダメージの分布を畳み込みで求める。外れは0ダメージとして分布に含める。
+命中率とダメージの分布は Fraction の厳密な値、倒すまでの攻撃回数・ターン数の期待値はfloatで返す。
+
+使い方:
+    python src/combat_odds.py [--levels N] [--output matrix.jsonl|matrix.csv]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from fractions import Fraction
+from functools import lru_cache
+
+import init_project  # noqa: F401
+import constants as const
+from dice import convolve, get_term_distribution, parse_dice
+
+UNARMED_DICE = parse_dice("0d0")  # Fight.UNARMED_DICE と同じ（素手）
+
+
+class AttackOdds:
+    """1回の攻撃の結果の分布
+
+    hit_chance: 命中する（roll_em では少なくとも1つの項が当たる）確率
+    damage: ダメージの分布 {ダメージ: 確率}（外れた場合の0を含む）
+    """
+
+    __slots__ = ("hit_chance", "damage", "mean_damage", "_expected_attacks", "_float_damage", "_miss")
+
+    def __init__(self, hit_chance, damage):
+        self.hit_chance = hit_chance
+        self.damage = damage
+        self.mean_damage = sum(value * p for value, p in damage.items())  # 1回の攻撃のダメージの期待値
+        self._expected_attacks = [0.0]  # HP -> 倒すまでの攻撃回数の期待値（必要になった分だけ求める）
+        self._float_damage = [(value, float(p)) for value, p in damage.items() if value > 0]
+        self._miss = float(damage.get(0, 0))  # 0ダメージ（外れを含む）の確率
+
+    def __repr__(self):
+        return f"AttackOdds(hit_chance={float(self.hit_chance):.3f}, mean_damage={float(self.mean_damage):.2f})"
+
+    def attacks_to_kill(self, hp):
+        """HP hp の相手を倒すまで（ダメージの合計が hp 以上になるまで）の攻撃回数の期待値
+
+        E[h] = 1 + Σ P(d) E[h - d] を h の小さい順に求める。0ダメージでは h が変わらないので両辺から移項する。
+        ダメージを与えられない場合は inf。
+        """
+        expected = self._expected_attacks
+        if hp < len(expected):
+            return expected[max(hp, 0)]
+        if self._miss >= 1.0:
+            return float("inf")
+        for h in range(len(expected), hp + 1):
+            total = 1.0
+            for value, p in self._float_damage:
+                if value < h:
+                    total += p * expected[h - value]
+            expected.append(total / (1.0 - self._miss))
+        return expected[hp]
+
+    def kill_chance(self, hp, attacks):
+        """attacks 回以内の攻撃で HP hp の相手を倒す確率（Fraction）"""
+        if hp <= 0:
+            return Fraction(1)
+        alive = {0: Fraction(1)}  # まだ倒れていない場合のダメージの合計 -> 確率
+        for _ in range(attacks):
+            alive = {total: p for total, p in convolve(alive, self.damage).items() if total < hp}
+        return 1 - sum(alive.values())
+
+
+def mix(hit_chance, hit_damage):
+    """確率 hit_chance で hit_damage、それ以外は0ダメージになる分布"""
+    damage = {0: 1 - hit_chance}
+    for value, p in hit_damage.items():
+        damage[value] = damage.get(value, 0) + hit_chance * p
+    return damage
+
+
+def d20_chance(need):
+    """20面ダイスで need 以上が出る確率"""
+    return Fraction(min(max(21 - need, 0), 20), 20)
+
+
+def add_spread(max_damage_distribution, divisor):
+    """max_damage に randint(-r, r)（r = int(max_damage / divisor) + 1）を足した分布"""
+    result = {}
+    for max_damage, p in max_damage_distribution.items():
+        spread = int(max_damage / divisor) + 1
+        share = p / (2 * spread + 1)
+        for offset in range(-spread, spread + 1):
+            result[max_damage + offset] = result.get(max_damage + offset, 0) + share
+    return result
+
+
+def clamp(distribution, floor):
+    """値を floor 以上に切り上げた分布"""
+    result = {}
+    for value, p in distribution.items():
+        value = max(floor, value)
+        result[value] = result.get(value, 0) + p
+    return dict(sorted(result.items()))
+
+
+def swing_chance(attacker_level, defender_armor, hit_bonus):
+    """Fight.swing が当たる確率"""
+    return d20_chance((20 - attacker_level) - defender_armor - hit_bonus)
+
+
+@lru_cache(maxsize=None)
+def get_fight_hit_damage(term, flat_bonus, modifier):
+    """Fight._calculate_damage で、ダイス式の1つの項 term が当たったときのダメージの分布
+
+    flat_bonus は int(基本ダメージ / 2) + 武器のダメージボーナス、modifier は装備による補正（負の値）。
+    """
+    count, sides, bonus = term
+    rolled = {value + flat_bonus: p for value, p in get_term_distribution(count, sides, bonus).items()}
+    return clamp({value + modifier: p for value, p in add_spread(rolled, 16).items()}, 0)
+
+
+@lru_cache(maxsize=None)
+def get_fight_odds(attack_damage, base_damage, weapon_bonus, modifier, hit_chance):
+    """Fight.roll_em の1回の攻撃の分布。ダイス式の項ごとに hit_chance で当たり、当たった項のダメージを足す"""
+    flat_bonus = int(base_damage / 2) + weapon_bonus
+    damage = {0: Fraction(1)}
+    for term in attack_damage.terms:
+        damage = convolve(damage, mix(hit_chance, get_fight_hit_damage(term, flat_bonus, modifier)))
+    return AttackOdds(1 - (1 - hit_chance) ** len(attack_damage.terms), damage)
+
+
+@lru_cache(maxsize=None)
+def get_enemy_odds(level, strength, dice_count, dice_sides, target_armor):
+    """Enemy._roll_attack の1回の攻撃の分布"""
+    hit_chance = d20_chance(5 - level + target_armor // 2)
+    base_damage = strength // 2 + level // 2
+    rolled = {int(base_damage / 2) + value: p for value, p in get_term_distribution(dice_count, dice_sides).items()}
+    hit_damage = clamp({value - target_armor: p for value, p in add_spread(rolled, 8).items()}, 1)
+    return AttackOdds(hit_chance, mix(hit_chance, hit_damage))
+
+
+def get_equipment_modifier(defender):
+    """Fight._calculate_equipment_modifier と同じ、防御側の装備による補正"""
+    modifier = 0
+    if defender.equipped_armor:
+        modifier -= defender.equipped_armor.armor
+        modifier -= getattr(defender.equipped_armor, "protection_bonus", 0)
+    for ring in (defender.equipped_left_ring, defender.equipped_right_ring):
+        if ring:
+            modifier -= getattr(ring, "protection_bonus", 0)
+    return modifier
+
+
+def player_attack_odds(attacker, defender, is_throw=False):
+    """attacker が Fight.roll_em で defender を攻撃するときの AttackOdds（装備・指輪の効果は今の状態を使う）"""
+    weapon = attacker.equipped_weapon
+    if weapon is None:
+        attack_damage, hit_bonus, weapon_bonus = UNARMED_DICE, 0, 0
+    else:
+        attack_damage = weapon.throw_roll if is_throw else weapon.wielded_roll
+        hit_bonus, weapon_bonus = weapon.hit_bonus, weapon.dmg_bonus
+    hit_chance = swing_chance(attacker.status.exp_level, defender.status.armor, hit_bonus)
+    base_damage = attacker.status.strength // 2
+    return get_fight_odds(attack_damage, base_damage, weapon_bonus, get_equipment_modifier(defender), hit_chance)
+
+
+def enemy_attack_odds(enemy, target):
+    """敵 enemy が Enemy._roll_attack で target を攻撃するときの AttackOdds"""
+    status = enemy.status
+    return get_enemy_odds(status.level, status.strength, status.dice_count, status.dice_sides, target.status.armor)
+
+
+def expected_attacks(odds, hp_distribution):
+    """HP が分布 {HP: 確率} のとき、倒すまでの攻撃回数の期待値"""
+    return sum(float(p) * odds.attacks_to_kill(hp) for hp, p in hp_distribution.items())
+
+
+def get_attacks_per_turn(status):
+    """1ターンに行動する回数（TurnScheduler.get_delay と同じ式）"""
+    speed = getattr(status, "speed", const.NORMAL_SPEED)
+    return const.TICKS_PER_TURN / max(1, const.TICKS_PER_TURN * const.NORMAL_SPEED // max(speed, 1))
+
+
+def get_ring_bonus(ring, player_data):
+    """指輪の効果で変わる (筋力, 防御力)。効果を装備していないキャラクターにかけて差をとる"""
+    from effect import EFFECT_MAP
+    from player import Player
+    from status import Status
+
+    if ring is None or ring.effect_name not in EFFECT_MAP:
+        return 0, 0
+    probe = Player(0, 0, Status(player_data), None)
+    strength, armor = probe.status.strength, probe.status.armor
+    EFFECT_MAP[ring.effect_name]().apply_effect(probe)
+    return probe.status.strength - strength, probe.status.armor - armor
+
+
+class BalanceMatrix:
+    """敵の種類 × プレイヤーのレベル × 装備（武器・鎧・指輪）の組み合わせごとの戦闘の見込み
+
+    プレイヤーのレベル L の筋力と最大HPは、初期値に Character.level_up の上昇（筋力 1-2、HP 3-5）を
+    L - 1 回足した分布として扱う。敵は YAML のステータスのまま（深い階での補正はしない）。
+    指輪は鎧の後に装備するものとする（鎧を装備すると防御力が鎧の値に置き換わるため）。
+    戦闘中の回復や状態異常は考えない。
+    """
+
+    def __init__(self, enemy_data=None, weapons=None, armors=None, rings=None, player_data=None):
+        from armor import ArmorManager
+        from assets_manager import AssetsManager
+        from enemy import EnemyManager
+        from ring import RingManager
+        from status import Status
+        from weapon import WeaponManager
+
+        if enemy_data is None:
+            enemy_data = EnemyManager().enemy_data
+        if weapons is None:
+            weapons = WeaponManager().weapon_instance_list
+        if armors is None:
+            armors = ArmorManager().armor_instance_list
+        if rings is None:
+            rings = [None] + RingManager().ring_instance_list
+        if player_data is None:
+            player_data = AssetsManager().get_chara_data("player.yaml")
+        self.enemies = [Status(data) for data in enemy_data]
+        self.weapons = list(weapons)
+        self.armors = list(armors)
+        self.rings = list(rings)
+        self.player_data = player_data
+
+    def get_player_stats(self, level):
+        """レベル level のプレイヤーの (筋力の分布, 最大HPの分布)"""
+        gains = level - 1
+        strength = get_term_distribution(gains, 2, self.player_data.get("strength", 1))
+        max_hp = get_term_distribution(gains, 3, self.player_data.get("max_hp", 10) + 2 * gains)
+        return strength, max_hp
+
+    def build(self, levels):
+        """levels のレベルごとに、すべての組み合わせの行（dict）のリストを返す"""
+        base_armor = self.player_data.get("armor", 0)
+        # 装備の組み合わせ: (武器・鎧・指輪の名前, 武器の番号, 指輪の筋力補正, プレイヤーの防御力)
+        ring_bonuses = [get_ring_bonus(ring, self.player_data) for ring in self.rings]
+        loadouts = []
+        for index, weapon in enumerate(self.weapons):
+            for armor in self.armors:
+                for ring, (strength_bonus, armor_bonus) in zip(self.rings, ring_bonuses):
+                    player_armor = (armor.armor if armor else base_armor) + armor_bonus
+                    names = (weapon.name, armor.name if armor else None, ring.name if ring else None)
+                    loadouts.append((names, index, strength_bonus, player_armor))
+        weapons = [(weapon.wielded_roll, weapon.hit_bonus, weapon.dmg_bonus) for weapon in self.weapons]
+        strength_bonuses = sorted({loadout[2] for loadout in loadouts})
+        player_armors = sorted({loadout[3] for loadout in loadouts})
+        player_stats = {}
+        for level in levels:
+            strength, max_hp = self.get_player_stats(level)
+            player_stats[level] = (
+                [(value, float(p)) for value, p in strength.items()],
+                {value: float(p) for value, p in max_hp.items()},
+            )
+
+        rows = []
+        for enemy in self.enemies:
+            enemy_hp = {enemy.max_hp: 1.0}
+            enemy_attacks_per_turn = get_attacks_per_turn(enemy)
+            for level in levels:
+                strength_distribution, hp_distribution = player_stats[level]
+                # プレイヤーの攻撃は (武器, 指輪の筋力補正) だけ、敵の攻撃はプレイヤーの防御力だけで決まる
+                player_side = {}
+                for index, (attack_damage, hit_bonus, weapon_bonus) in enumerate(weapons):
+                    hit_chance = swing_chance(level, enemy.armor, hit_bonus)
+                    for strength_bonus in strength_bonuses:
+                        mean_damage = attacks = 0.0
+                        for strength, p in strength_distribution:
+                            base_damage = (strength + strength_bonus) // 2
+                            odds = get_fight_odds(attack_damage, base_damage, weapon_bonus, 0, hit_chance)
+                            mean_damage += p * float(odds.mean_damage)
+                            attacks += p * expected_attacks(odds, enemy_hp)
+                        player_side[index, strength_bonus] = (float(hit_chance), mean_damage, attacks)
+                enemy_side = {}
+                for player_armor in player_armors:
+                    odds = get_enemy_odds(enemy.level, enemy.strength, enemy.dice_count, enemy.dice_sides, player_armor)
+                    turns = expected_attacks(odds, hp_distribution) / enemy_attacks_per_turn
+                    enemy_side[player_armor] = (float(odds.hit_chance), float(odds.mean_damage), turns)
+                for (weapon_name, armor_name, ring_name), index, strength_bonus, player_armor in loadouts:
+                    hit_chance, mean_damage, turns_to_kill = player_side[index, strength_bonus]
+                    enemy_hit_chance, enemy_mean_damage, turns_to_die = enemy_side[player_armor]
+                    rows.append(
+                        {
+                            "enemy": enemy.name,
+                            "player_level": level,
+                            "weapon": weapon_name,
+                            "armor": armor_name,
+                            "ring": ring_name,
+                            "hit_chance": hit_chance,
+                            "mean_damage": mean_damage,
+                            "turns_to_kill": turns_to_kill,
+                            "enemy_hit_chance": enemy_hit_chance,
+                            "enemy_mean_damage": enemy_mean_damage,
+                            "turns_to_die": turns_to_die,
+                        }
+                    )
+        return rows
+
+
+def write_rows(path, rows):
+    """行を書き出す（拡張子が.csvならCSV、それ以外はJSONL）"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="敵 × プレイヤーのレベル × 装備の戦闘の見込みを計算する")
+    parser.add_argument("--levels", type=int, default=10, help="プレイヤーのレベル 1..N を計算する")
+    parser.add_argument("--output", help="書き出すファイル（.jsonl または .csv）")
+    args = parser.parse_args(argv)
+
+    matrix = BalanceMatrix()
+    start_time = time.perf_counter()
+    rows = matrix.build(range(1, args.levels + 1))
+    elapsed = time.perf_counter() - start_time
+    if args.output:
+        write_rows(args.output, rows)
+    print(f"{len(rows)} rows in {elapsed:.3f}s", file=sys.stderr)
+
+    # 初期装備のプレイヤー（レベル1）から見た敵ごとの見込み
+    initial_equipment = matrix.player_data.get("initial_equipment", {})
+    loadout = (1, initial_equipment.get("weapon"), initial_equipment.get("armor"), None)
+    for row in rows:
+        if (row["player_level"], row["weapon"], row["armor"], row["ring"]) == loadout:
+            print(
+                f"{row['enemy']:>14}: hit {row['hit_chance']:.2f} dmg {row['mean_damage']:5.2f} "
+                f"kill {row['turns_to_kill']:5.1f} turns | hit {row['enemy_hit_chance']:.2f} "
+                f"dmg {row['enemy_mean_damage']:5.2f} die {row['turns_to_die']:5.1f} turns"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,3 @@
-import pygame
-
 WINDOW_SIZE_H = 720
 WINDOW_SIZE_W = 1280
 
@@ -15,6 +13,9 @@ LOG_FONT_SIZE = 20  # 20
 LOG_WRAP_SIZE = 57
 
 DRAW_LOG_SIZE = 7
+LOG_HISTORY_SIZE = 200  # メッセージログに残す件数（古いものから捨てる）
+MESSAGE_VERBOSITY = 20  # メッセージウィンドウに残す重要度の下限（10: 戦闘の計算過程も残す, 20: 通常）
+MESSAGE_CONSOLE_OUTPUT = True  # Trueならゲーム（main.py）のメッセージを標準出力にも書き出す
 DRAW_LOG_MARGIN = 20
 
 # https://www.pygame.org/docs/ref/color_list.html
@@ -24,38 +25,15 @@ PYGAME_COLOR_RED = (255, 0, 0)
 
 PYGAME_FPS = 60
 PYGAME_ONE_TURN_WAIT_MS = 30  # [ms]
+EVENT_DRIVEN_MAIN_LOOP = True  # Trueなら入力を待ち、入力（睡眠中の自動行動・押し続けているキー）があるときだけ描き直す
+IDLE_EVENT_TIMEOUT_MS = 1000  # [ms] 何も起きていないときにイベントを待つ最長時間
 
 PLAYER_STATUS = "player.yaml"
 BASED_HIT_RATE = 90
 
-a_z_KEY = [
-    pygame.K_a,
-    pygame.K_b,
-    pygame.K_c,
-    pygame.K_d,
-    pygame.K_e,
-    pygame.K_f,
-    pygame.K_g,
-    pygame.K_h,
-    pygame.K_i,
-    pygame.K_j,
-    pygame.K_k,
-    pygame.K_l,
-    pygame.K_m,
-    pygame.K_n,
-    pygame.K_o,
-    pygame.K_p,
-    pygame.K_q,
-    pygame.K_r,
-    pygame.K_s,
-    pygame.K_t,
-    pygame.K_u,
-    pygame.K_v,
-    pygame.K_w,
-    pygame.K_x,
-    pygame.K_y,
-    pygame.K_z,
-]
+# pygame（SDL2）のキーコードは英小文字のASCIIコードと同じ（pygame.K_a == ord("a")）。
+# ゲームロジックからも読まれる定数なので、ここではpygameをimportしない
+a_z_KEY = [ord(char) for char in "abcdefghijklmnopqrstuvwxyz"]
 
 # game balance
 MAXROOMS = 9
@@ -117,3 +95,27 @@ BORDER_HP_WARNING_THRESHOLD = 1/2    # HPが半分以下の場合に黄枠
 BORDER_COLOR_NORMAL = PYGAME_COLOR_WHITE
 BORDER_COLOR_WARNING = (255, 255, 0)  # 黄色
 BORDER_COLOR_CRITICAL = PYGAME_COLOR_RED
+
+# headless simulation
+SIMULATION_MAX_STEPS_PER_TURN = 4  # ターンを消費しない行動が続いた場合に打ち切るまでの目安
+
+# map storage
+COMPACT_MAP_STORAGE = False  # Trueならマップを1次元配列のコンパクトなグリッドで持つ（大きなマップ向け）
+
+# dungeon generation
+DUNGEON_GENERATOR = "auto"  # "auto"（NumPyがあれば使う） / "numpy" / "python"
+DUNGEON_MAX_LAYOUT_ATTEMPTS = 100  # 部屋数が範囲に収まる配置が見つかるまで並べ直す上限
+
+# floor pre-generation
+FLOOR_PREGENERATION = True  # Trueなら今の階層にいる間に次の階層をワーカースレッドで生成しておく
+
+# content pack
+USE_CONTENT_PACK = True  # Trueならゲームデータを assets/content.pack から読む（YAMLと一致しない場合はYAMLから読む）
+
+# monster turns
+NORMAL_SPEED = 10  # 敵の速さ（speed）の基準値。この速さの敵は1ターンに1回行動する
+TICKS_PER_TURN = 120  # ターンスケジューラの1ターンの長さ（速さの比で割り切れるよう約数の多い値にする）
+MONSTER_SLEEP_IN_UNEXPLORED_AREAS = True  # Trueなら未探索の部屋・通路にいる敵はプレイヤーが近づくまで眠っている
+MONSTER_WAKE_RADIUS = 5  # プレイヤーが部屋（通路は区画）からこのマス数以内に来たら、そこで眠っている敵が起きる
+MONSTER_SLEEP_AREA_SIZE = 8  # 通路で眠っている敵をまとめて起こす区画（と起こす範囲の索引のグリッド）の一辺のマス数
+ENEMY_SIGHT_RADIUS = 3  # 通路や部屋の外では、この距離以内の敵からプレイヤーが見える
@@ -0,0 +1,157 @@
+"""assets 以下のゲームデータ（キャラクター・敵・アイテム・設定のYAML）をプロセスで1回だけ読み込むデータベース
+
+読み込んだデータは変更できないテンプレート（FrozenDict / tuple）として共有する。
+各Managerはここからテンプレートを受け取り、インスタンスはテンプレートから毎回作る。
+YAMLと一致するコンテンツパック（content_pack.py で作る assets/content.pack）があれば、そちらから読む。
+"""
+
+import threading
+from pathlib import Path
+
+import constants as const
+
+# 読み込むカテゴリと、そのYAMLがあるディレクトリ（assets からの相対パス）
+CATEGORIES = {
+    "chara": "data/chara",
+    "enemy": "data/enemy",
+    "item/weapon": "data/item/weapon",
+    "item/armor": "data/item/armor",
+    "item/ring": "data/item/ring",
+    "item/potion": "data/item/potion",
+    "item/food": "data/item/food",
+    "item/names": "data/item/names",
+    "config": "config",
+}
+
+
+class FrozenDict(dict):
+    """変更できないdict。pickle・deepcopyでは中身をコピーしたFrozenDictになる"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("content templates are read-only")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value):
+    """YAMLから読んだ値を、dictはFrozenDict、listはtupleにして変更できなくする"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def get_category_path(assets_path, category):
+    return Path(assets_path).joinpath(CATEGORIES.get(category, f"data/{category}"))
+
+
+def read_yaml_category(assets_path, category):
+    """カテゴリのYAMLをすべて読み、{ファイル名: データ} で返す"""
+    # コンテンツパックから読む場合はPyYAMLを使わないので、YAMLを読むときに初めて読み込む
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as SafeLoader  # libyamlがあればCの実装で読む
+    except ImportError:
+        from yaml import SafeLoader
+
+    data = {}
+    for file_path in get_category_path(assets_path, category).glob("*.yaml"):
+        with open(file_path, "r", encoding="utf-8") as file:
+            data[file_path.name] = yaml.load(file, Loader=SafeLoader)
+    return data
+
+
+class ContentDatabase:
+    def __init__(self, base_path=None, use_pack=None):
+        if base_path is None:
+            base_path = Path(__file__).parent.parent
+        self.assets_path = Path(base_path).joinpath("assets")
+        self.use_pack = const.USE_CONTENT_PACK if use_pack is None else use_pack
+        self.categories = {}  # カテゴリ -> {ファイル名: テンプレート}（ファイル名順）
+        self.template_lists = {}  # カテゴリ -> テンプレートのtuple（ファイル名順）
+        self.packed_categories = None  # コンテンツパックの中身（未読み込みならNone、使えなければ空）
+        self.lock = threading.Lock()  # 階層の先読みスレッドからも呼ばれる
+        self.stats = {"source": None, "files_opened": 0}
+
+    def read_pack(self):
+        """YAMLと一致するコンテンツパックがあれば、その中身（カテゴリ -> {ファイル名: データ}）を返す"""
+        if not self.use_pack:
+            return {}
+        from content_pack import PackError, get_pack_path, load_pack
+
+        pack_path = get_pack_path(self.assets_path)
+        if not pack_path.is_file():
+            return {}
+        self.stats["files_opened"] += 1
+        try:
+            return load_pack(pack_path, self.assets_path)
+        except PackError as e:
+            print(f"Warning: {e}. Loading YAML instead (rebuild with: python src/content_pack.py)")
+            return {}
+
+    def load_category(self, category):
+        """カテゴリのデータを読み込む（読み込み済みなら何もしない）"""
+        templates = self.categories.get(category)
+        if templates is not None:
+            return templates
+        with self.lock:
+            if category not in self.categories:
+                if self.packed_categories is None:
+                    self.packed_categories = self.read_pack()
+                data = self.packed_categories.get(category)
+                if data is None:
+                    data = read_yaml_category(self.assets_path, category)
+                    self.stats["files_opened"] += len(data)
+                    self.stats["source"] = "yaml"
+                elif self.stats["source"] is None:
+                    self.stats["source"] = "pack"
+                # 乱数での選び方がファイルシステムに依存しないよう、ファイル名順に並べる
+                templates = {name: freeze(data[name]) for name in sorted(data)}
+                self.template_lists[category] = tuple(templates.values())
+                self.categories[category] = templates
+            return self.categories[category]
+
+    def preload(self):
+        """すべてのカテゴリを読み込む"""
+        for category in CATEGORIES:
+            self.load_category(category)
+
+    def get_templates(self, category):
+        """カテゴリのテンプレートをファイル名順のtupleで返す"""
+        self.load_category(category)
+        return self.template_lists[category]
+
+    def get_template(self, category, file_name):
+        """カテゴリ内のファイル1つ分のテンプレートを返す"""
+        templates = self.load_category(category)
+        if file_name not in templates:
+            raise FileNotFoundError(get_category_path(self.assets_path, category).joinpath(file_name))
+        return templates[file_name]
+
+    def clear(self):
+        with self.lock:
+            self.categories.clear()
+            self.template_lists.clear()
+            self.packed_categories = None
+            self.stats = {"source": None, "files_opened": 0}
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_content_database(base_path=None):
+    """プロセスで共有するContentDatabaseを返す（base_pathごとに1つ）"""
+    if base_path is None:
+        base_path = Path(__file__).parent.parent
+    key = Path(base_path).resolve()
+    database = _databases.get(key)
+    if database is None:
+        with _databases_lock:
+            database = _databases.setdefault(key, ContentDatabase(key))
+    return database
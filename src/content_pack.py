@@ -0,0 +1,129 @@
+"""assets 以下のゲームデータのYAMLを、1つのバイナリファイル（コンテンツパック）にまとめる
+
+使い方:
+    python src/content_pack.py           # assets/content.pack を作り直す
+    python src/content_pack.py --check   # パックがいまのYAMLと一致しているか確認する
+
+パックは先頭のヘッダ（マジック・形式のバージョン・marshalのバージョン）と、marshalで書いた辞書からなる。
+辞書には元にしたYAMLの一覧（相対パス・サイズ・更新時刻）と内容のハッシュ、読み込んだデータを入れる。
+読み込むときはYAMLを開かずに一覧だけを比べ、1つでも違えばパックは使わない。
+"""
+
+import marshal
+import os
+import sys
+from pathlib import Path
+
+from content_db import CATEGORIES, get_category_path, read_yaml_category
+
+PACK_FILE_NAME = "content.pack"
+PACK_MAGIC = b"PYROGUE-PACK"
+PACK_FORMAT_VERSION = 1
+
+
+class PackError(Exception):
+    """コンテンツパックが読めない、またはYAMLと一致しない"""
+
+
+def get_pack_path(assets_path):
+    return Path(assets_path).joinpath(PACK_FILE_NAME)
+
+
+def get_pack_header():
+    # marshalの形式はPythonのバージョンで変わるので、書いたときのバージョンもヘッダに入れる
+    return PACK_MAGIC + bytes((PACK_FORMAT_VERSION, marshal.version))
+
+
+def list_sources(assets_path):
+    """パックに入れるYAMLを (assetsからの相対パス, サイズ, 更新時刻) のソート済みリストで返す（ファイルは開かない）"""
+    sources = []
+    for category in CATEGORIES:
+        directory = get_category_path(assets_path, category)
+        if not directory.is_dir():
+            continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".yaml") and entry.is_file():
+                    stat = entry.stat()
+                    sources.append((f"{CATEGORIES[category]}/{entry.name}", stat.st_size, stat.st_mtime_ns))
+    return sorted(sources)
+
+
+def hash_sources(assets_path, sources):
+    """YAMLの相対パスと中身から、パックの内容を表すハッシュを作る"""
+    import hashlib  # パックを読むだけのとき（ゲームの起動時）は使わないので、ここで読み込む
+
+    digest = hashlib.sha256()
+    for relative_path, _, _ in sources:
+        digest.update(relative_path.encode("utf-8") + b"\0")
+        digest.update(Path(assets_path).joinpath(relative_path).read_bytes())
+    return digest.hexdigest()
+
+
+def build_pack(assets_path, pack_path=None):
+    """YAMLを読み込んでパックを書き出し、内容のハッシュを返す"""
+    assets_path = Path(assets_path)
+    pack_path = get_pack_path(assets_path) if pack_path is None else Path(pack_path)
+    sources = list_sources(assets_path)
+    pack = {
+        "sources": sources,
+        "hash": hash_sources(assets_path, sources),
+        "categories": {category: read_yaml_category(assets_path, category) for category in CATEGORIES},
+    }
+    # 途中で失敗しても壊れたパックが残らないよう、一時ファイルに書いてから置き換える
+    temp_path = pack_path.with_name(pack_path.name + ".tmp")
+    with open(temp_path, "wb") as file:
+        file.write(get_pack_header())
+        marshal.dump(pack, file)
+    os.replace(temp_path, pack_path)
+    return pack["hash"]
+
+
+def read_pack(pack_path):
+    """パックの辞書を返す。形式が違う場合は PackError"""
+    with open(pack_path, "rb") as file:
+        data = file.read()
+    header = get_pack_header()
+    if not data.startswith(header):
+        raise PackError(f"{pack_path} was built by another version")
+    try:
+        return marshal.loads(data[len(header) :])
+    except (EOFError, ValueError, TypeError) as e:
+        raise PackError(f"{pack_path} is corrupted ({e})")
+
+
+def load_pack(pack_path, assets_path):
+    """YAMLと一致するパックの中身（カテゴリ -> {ファイル名: データ}）を返す。一致しなければ PackError"""
+    pack = read_pack(pack_path)
+    if pack.get("sources") != list_sources(assets_path):
+        raise PackError(f"{pack_path} is out of date")
+    return pack["categories"]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", default=Path(__file__).parent.parent.joinpath("assets"), type=Path)
+    parser.add_argument("--check", action="store_true", help="パックを書き出さずに、YAMLと一致しているかだけ確認する")
+    args = parser.parse_args()
+
+    pack_path = get_pack_path(args.assets)
+    if args.check:
+        try:
+            pack = read_pack(pack_path)
+            sources = list_sources(args.assets)
+            if pack.get("sources") != sources or pack.get("hash") != hash_sources(args.assets, sources):
+                raise PackError(f"{pack_path} is out of date")
+        except (OSError, PackError) as e:
+            print(f"NG: {e}")
+            sys.exit(1)
+        print(f"OK: {pack_path} ({pack['hash'][:12]})")
+        return
+
+    content_hash = build_pack(args.assets, pack_path)
+    print(f"Wrote {pack_path} ({len(list_sources(args.assets))} files, {content_hash[:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""ダイス式（YAMLの "1d6", "2d4+1", "1d6+1d6" など）
+
+YAMLのダイス文字列はアイテムの種類を読み込むときに parse_dice で1回だけ解析し、
+(個数, 面数, 修正値) の項のタプルを持つ DiceExpression にする。攻撃のたびに文字列を分割し直さない。
+
+"+" で区切った "NdS" の項はそれぞれ別の一撃になる（Fight.roll_em は項ごとに命中判定する）。
+数字だけの項は直前の項の修正値になる。投擲ダメージなどではすべての項の合計を使う。
+"""
+
+import random
+from fractions import Fraction
+from functools import lru_cache
+
+from flyweight import TemplateField
+from numpy_loader import get_numpy
+
+
+def roll_dice(ndice: int, nsides: int, rng=random) -> int:
+    """Roll a specified number of dice with a given number of sides.
+
+    Args:
+        ndice (int): Number of dice to roll
+        nsides (int): Number of sides on each die
+        rng: Random number generator to use (defaults to the random module)
+
+    Returns:
+        int: Total of all dice rolls
+    """
+    return sum(rng.randint(1, nsides) for _ in range(ndice))
+
+
+@lru_cache(maxsize=None)
+def get_term_distribution(count, sides, bonus=0):
+    """1つの項（count 個の sides 面ダイス + bonus）の合計の分布を {合計: 確率（Fraction）} で返す"""
+    ways = {0: 1}  # 合計 -> 出方の数
+    for _ in range(count):
+        rolled = {}
+        for total, n in ways.items():
+            for face in range(1, sides + 1):
+                rolled[total + face] = rolled.get(total + face, 0) + n
+        ways = rolled
+    outcomes = sides**count if sides else 1
+    return {total + bonus: Fraction(n, outcomes) for total, n in sorted(ways.items())}
+
+
+def convolve(first, second):
+    """2つの分布 {値: 確率} の和の分布を返す"""
+    result = {}
+    for a, p in first.items():
+        for b, q in second.items():
+            result[a + b] = result.get(a + b, 0) + p * q
+    return dict(sorted(result.items()))
+
+
+class DiceExpression:
+    """解析済みのダイス式。terms は (個数, 面数, 修正値) のタプル。変更しないこと（同じ文字列で共有する）"""
+
+    __slots__ = ("text", "terms", "_distribution")
+
+    def __init__(self, terms, text=None):
+        self.terms = tuple(terms)
+        if text is None:
+            text = "+".join(f"{count}d{sides}" + (f"+{bonus}" if bonus else "") for count, sides, bonus in self.terms)
+        self.text = text
+        self._distribution = None
+
+    def __repr__(self):
+        return f"DiceExpression({self.text!r})"
+
+    def __str__(self):
+        return self.text
+
+    def __reduce__(self):
+        # pickle・deepcopyでも解析済みの共有オブジェクトを使う
+        return parse_dice, (self.text,)
+
+    def roll(self, rng=random):
+        """すべての項を振った合計（roll_dice と同じ順に乱数を使う）"""
+        total = 0
+        for count, sides, bonus in self.terms:
+            total += roll_dice(count, sides, rng) + bonus
+        return total
+
+    def roll_many(self, size, rng=random):
+        """size 回振った合計のリスト"""
+        return [self.roll(rng) for _ in range(size)]
+
+    def sample(self, size, generator=None):
+        """size 回振った合計をNumPyでまとめて振って配列で返す（バランス調整・シミュレーション用）
+
+        generator は numpy.random.Generator。ゲーム本体の乱数（random.Random）とは別の系列になる。
+        """
+        np = get_numpy()
+        if np is None:
+            raise ImportError("DiceExpression.sample requires numpy")
+        if generator is None:
+            generator = np.random.default_rng()
+        total = np.full(size, sum(bonus for _, _, bonus in self.terms), dtype=np.int64)
+        for count, sides, _ in self.terms:
+            if count and sides:
+                total += generator.integers(1, sides + 1, size=(size, count)).sum(axis=1)
+        return total
+
+    @property
+    def minimum(self):
+        return sum(count + bonus if sides else bonus for count, sides, bonus in self.terms)
+
+    @property
+    def maximum(self):
+        return sum(count * sides + bonus for count, sides, bonus in self.terms)
+
+    @property
+    def mean(self):
+        """合計の期待値（Fraction）"""
+        return sum((Fraction(count * (sides + 1), 2) if sides else 0) + bonus for count, sides, bonus in self.terms)
+
+    def distribution(self):
+        """合計の分布を {合計: 確率（Fraction）} で返す（値の小さい順）"""
+        if self._distribution is None:
+            distribution = {0: Fraction(1)}
+            for term in self.terms:
+                distribution = convolve(distribution, get_term_distribution(*term))
+            self._distribution = distribution
+        return self._distribution
+
+
+@lru_cache(maxsize=None)
+def parse_dice(text):
+    """ダイス文字列を解析する。同じ文字列からは同じ DiceExpression を返す
+
+    Raises:
+        ValueError: "NdS" と整数を "+" でつないだ形でない場合
+    """
+    terms = []
+    for part in str(text).replace(" ", "").split("+"):
+        if not part:
+            continue
+        if "d" in part:
+            count, _, sides = part.partition("d")
+            try:
+                terms.append([int(count) if count else 1, int(sides), 0])
+            except ValueError:
+                raise ValueError(f"invalid dice expression {text!r}") from None
+        else:
+            try:
+                bonus = int(part)
+            except ValueError:
+                raise ValueError(f"invalid dice expression {text!r}") from None
+            if terms:
+                terms[-1][2] += bonus
+            else:
+                terms.append([0, 0, bonus])
+    return DiceExpression((tuple(term) for term in terms), str(text))
+
+
+class DiceField(TemplateField):
+    """テンプレートのダイス文字列の属性（text_field）を解析した DiceExpression
+
+    テンプレートを作るときに解析して入れておく。解析済みの値を持たないテンプレート（古いセーブデータ）では、
+    初めて読んだときに解析してテンプレートに入れる。
+    """
+
+    def __init__(self, text_field):
+        self.text_field = text_field
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        template = instance.template
+        try:
+            return getattr(template, self.name)
+        except AttributeError:
+            dice = parse_dice(getattr(template, self.text_field))
+            setattr(template, self.name, dice)
+            return dice
@@ -1,10 +1,11 @@
+from collections import Counter, OrderedDict
+
 import pygame
 import constants as const
 from status import Status
 from player import Player
 from character import Character
 from inventory import Inventory
-from stair import Stairs
 
 
 class Draw:
@@ -16,90 +17,289 @@ class Draw:
         self.game_map = game_map
         self.game = game
 
-    def draw_game_map(self):
-        width, height = self.get_game_map_size_px()
-        log_font = self.assets_manager.load_font(const.FONT_DEFAULT, const.LOG_FONT_SIZE)
-        log_window_height = log_font.get_height() * const.DRAW_LOG_SIZE + 10
-
-        map_height = const.WINDOW_SIZE_H - log_window_height  # 画面全体の高さからログウィンドウ分を引く
-
-        # プレイヤーのHP状態に応じて縁取りの色を決定
+        self.glyph_size = self.game_map_font.size("W")  # 等幅フォントの1文字の大きさ（マスより大きいことがある）
+        # マップレイヤー: 探索済みのマップを描いておくSurfaceと、描いた時点の各マスの表示文字
+        self.map_layer = None
+        self.map_layer_cells = []
+        self.map_layer_border_color = None
+        self.map_layer_key = None  # map_layer_cells を作ったときのマップ（タイルの版と探索済みグリッド）
+        # 前フレームで描いたエンティティ／パネルの内容（差分検出用）
+        self.last_sprites = []
+        self.panel_keys = {}
+        self.needs_full_redraw = True
+        self.rendering_frame = False
+        # ログのメッセージごとに折り返した行（フォントか幅が変わったら捨てる）
+        self.log_line_cache = OrderedDict()  # メッセージ -> 折り返した行のtuple
+        self.log_line_cache_key = None  # (フォント, 幅)
+
+    def get_glyph(self, char, color):
+        """マップ用フォントで描画したグリフを返す（AssetsManagerのキャッシュを共有）"""
+        return self.assets_manager.render_text(const.FONT_DEFAULT, const.FONT_SIZE, char, color)
+
+    def invalidate(self):
+        """render_frame以外で画面に直接描いた場合、次のフレームで全体を描き直す"""
+        if not self.rendering_frame:
+            self.needs_full_redraw = True
+
+    def get_border_color(self):
+        """プレイヤーのHP状態に応じて縁取りの色を決定"""
         player = self.game.get_player()
         border_color = const.BORDER_COLOR_NORMAL  # デフォルトは白
-        
+
         if player and player.status.current_hp > 0:
             hp_ratio = player.status.current_hp / player.status.max_hp
             if hp_ratio <= const.BORDER_HP_CRITICAL_THRESHOLD:  # HPが1/16以下の場合
                 border_color = const.BORDER_COLOR_CRITICAL
             elif hp_ratio <= const.BORDER_HP_WARNING_THRESHOLD:  # HPが半分以下の場合
                 border_color = const.BORDER_COLOR_WARNING
+        return border_color
+
+    def get_map_area_height(self):
+        log_window_height = self.log_font.get_height() * const.DRAW_LOG_SIZE + 10
+        return const.WINDOW_SIZE_H - log_window_height  # 画面全体の高さからログウィンドウ分を引く
+
+    def get_map_area_rect(self):
+        width, _ = self.get_game_map_size_px()
+        return pygame.Rect(0, 0, width, self.get_map_area_height())
+
+    def update_map_layer(self, border_color):
+        """マップレイヤーのうち、探索済みフラグが変わったマスだけを描き直す
+
+        タイルが変わった（game_map.version が進んだ）か探索済みグリッドが差し替えられたときは全体を作り直す。
+        探索済みフラグの変化は GameMap.pop_explored_changes で受け取るので、何も変わらないフレームは何もしない。
+
+        Returns:
+            list[pygame.Rect]: 描き直した領域
+        """
+        map_rect = self.get_map_area_rect()
+        game_map = self.game_map
+        tiles = game_map.tiles
+        explored = game_map.explored
+        changes = game_map.pop_explored_changes()
+        key = (id(game_map), game_map.version, id(explored))
+
+        if (
+            self.map_layer is None
+            or self.map_layer.get_size() != map_rect.size
+            or border_color != self.map_layer_border_color
+            or key != self.map_layer_key
+        ):
+            self.map_layer = pygame.Surface(map_rect.size)
+            self.map_layer_border_color = border_color
+            self.map_layer_key = key
+            # 各マスの表示文字（未探索ならNone）
+            self.map_layer_cells = [
+                [tile if is_explored else None for tile, is_explored in zip(tile_row, explored_row)]
+                for tile_row, explored_row in zip(tiles, explored)
+            ]
+            self.redraw_map_layer_region(map_rect)
+            return [map_rect]
+
+        dirty = []
+        cells = self.map_layer_cells
+        for x, y in sorted(changes, key=lambda position: (position[1], position[0])):
+            cell = tiles[y][x] if explored[y][x] else None
+            if cells[y][x] != cell:
+                cells[y][x] = cell
+                dirty.append(self.get_cell_rect(x, y))
+        for rect in dirty:
+            self.redraw_map_layer_region(rect)
+        return dirty
+
+    def get_cell_rect(self, x, y):
+        """マスとそのグリフが占める領域"""
+        glyph_w, glyph_h = self.glyph_size
+        return pygame.Rect(
+            x * const.GRID_SIZE, y * const.GRID_SIZE, max(const.GRID_SIZE, glyph_w), max(const.GRID_SIZE, glyph_h)
+        )
+
+    def redraw_map_layer_region(self, rect):
+        """マップレイヤーの指定領域を、縁取りとその領域に掛かるグリフで描き直す"""
+        layer = self.map_layer
+        layer.set_clip(rect)
+        layer.fill(const.PYGAME_COLOR_BLACK)
+        pygame.draw.rect(layer, self.map_layer_border_color, layer.get_rect(), 2)
+
+        # グリフはマスより大きいことがあるので、領域に掛かりうるマスを行優先（従来と同じ順）で描く
+        glyph_w, glyph_h = self.glyph_size
+        map_height = layer.get_height()
+        first_x = max(0, (rect.left - glyph_w) // const.GRID_SIZE)
+        first_y = max(0, (rect.top - glyph_h) // const.GRID_SIZE)
+        last_x = rect.right // const.GRID_SIZE
+        last_y = rect.bottom // const.GRID_SIZE
+        for y, row in enumerate(self.map_layer_cells[first_y : last_y + 1], first_y):
+            pixel_y = y * const.GRID_SIZE
+            if pixel_y + const.GRID_SIZE > map_height:
+                continue
+            for x, cell in enumerate(row[first_x : last_x + 1], first_x):
+                if cell is not None:
+                    layer.blit(self.get_glyph(cell, "gray"), (x * const.GRID_SIZE, pixel_y))
+        layer.set_clip(None)
+
+    def draw_game_map(self):
+        self.invalidate()
+        border_color = self.get_border_color()
+        self.update_map_layer(border_color)
+        self.screen.blit(self.map_layer, (0, 0))
+
+    def collect_entity_sprites(self):
+        """描画順に並べたエンティティのスプライト（差分検出のためタプルで表す）を返す"""
+        # Gameの種類別バケットからエンティティを取得
+        buckets = self.game.entity_buckets
+        player = self.game.get_player()
+        explored = self.game_map.explored
+        # 注目マークは、敵ごとではなくフレームごとに1回取得した可視性のスナップショットで判定する
+        visibility = self.game.get_player_visibility() if player else None
 
-        # 画面全体を描画
-        self.draw_window(0, 0, width, map_height, border_color=border_color, border_width=2)
-        for y in range(len(self.game_map.tiles)):
-            for x in range(len(self.game_map.tiles[y])):
-                pixel_y = y * const.GRID_SIZE
-                if pixel_y + const.GRID_SIZE > map_height:
-                    continue
-                if self.game_map.explored[y][x]:
-                    tile_char = self.game_map.get_tile(x, y)
-                    tile_text = self.game_map_font.render(tile_char, True, "gray")
-                    self.screen.blit(tile_text, (x * const.GRID_SIZE, pixel_y))
-
-    def draw_entity(self, entities_list):
-        items = []
-        enemies = []
-        player = None
-        stairs = []
-
-        from player import Player
-        from enemy import Enemy
-        from item import Item
-
-        # すべてのエンティティを分類
-        for entities in entities_list:
-            for entity in entities:
-                if isinstance(entity, Player):
-                    player = entity
-                elif isinstance(entity, Enemy):
-                    enemies.append(entity)
-                elif isinstance(entity, Item):
-                    items.append(entity)
-                elif isinstance(entity, Stairs):
-                    stairs.append(entity)
-                else:
-                    # その他のエンティティ（必要なら追加）
-                    pass
+        def entity_sprite(entity):
+            return ("entity", entity.x, entity.y, entity.char, entity.color)
 
+        sprites = []
         # 1. アイテムを先に描画
-        for item in items:
-            self.draw_single_entity(item)
+        for item in buckets["items"]:
+            if explored[item.y][item.x]:
+                sprites.append(entity_sprite(item))
         # 2. 敵を描画
-        for enemy in enemies:
-            self.draw_single_entity(enemy)
-            if player and enemy.can_see_player(self.game):
-                self.draw_attention_mark(enemy)
+        for enemy in buckets["enemies"]:
+            if explored[enemy.y][enemy.x]:
+                sprites.append(entity_sprite(enemy))
+            if visibility is not None and visibility.can_see(enemy.x, enemy.y):
+                sprites.append(("attention", enemy.x, enemy.y))
         # 3. 階段を描画
-        for stair in stairs:
-            self.draw_single_entity(stair)
+        for stair in buckets["stairs"]:
+            if explored[stair.y][stair.x]:
+                sprites.append(entity_sprite(stair))
         # 4. 最後にプレイヤーを描画
         if player:
-            self.draw_single_entity(player, is_player=True)
+            sprites.append(entity_sprite(player))
+        return sprites
+
+    def get_sprite_rect(self, sprite):
+        if sprite[0] == "attention":
+            return self.get_attention_mark_rect(sprite[1], sprite[2])
+        return self.get_cell_rect(sprite[1], sprite[2])
+
+    def draw_sprite(self, sprite):
+        if sprite[0] == "attention":
+            self.draw_attention_mark_at(sprite[1], sprite[2])
+        else:
+            _, x, y, char, color = sprite
+            self.draw_glyph_cell(x, y, char, color)
+
+    def draw_glyph_cell(self, x, y, char, color):
+        pixel_pos = (x * const.GRID_SIZE, y * const.GRID_SIZE)
+        rect = pygame.Rect(pixel_pos, (const.GRID_SIZE, const.GRID_SIZE))
+        pygame.draw.rect(self.screen, const.PYGAME_COLOR_BLACK, rect)
+        self.screen.blit(self.get_glyph(char, color), pixel_pos)
+
+    def draw_entity(self):
+        self.invalidate()
+        for sprite in self.collect_entity_sprites():
+            self.draw_sprite(sprite)
 
     def draw_single_entity(self, entity, is_player=False, enemy_search_active=False, is_enemy=False):
-        pixel_pos = (entity.x * const.GRID_SIZE, entity.y * const.GRID_SIZE)
+        self.invalidate()
         try:
             # 敵サーチ中は敵だけは未踏破でも描画
             if (self.game_map.explored[entity.y][entity.x] or is_player or (enemy_search_active and is_enemy)):
-                rect = pygame.Rect(pixel_pos, (const.GRID_SIZE, const.GRID_SIZE))
-                pygame.draw.rect(self.screen, const.PYGAME_COLOR_BLACK, rect)
-
                 color = "yellow" if (enemy_search_active and is_enemy) else entity.color
-                entity_text = self.game_map_font.render(entity.char, True, color)
-                self.screen.blit(entity_text, pixel_pos)
+                self.draw_glyph_cell(entity.x, entity.y, entity.char, color)
         except Exception as e:
             print("FAIL: ", entity, entity.x, entity.y, entity.color, "e: ", e)
 
+    def compose_map_region(self, region, sprites):
+        """マップ領域の一部を、マップレイヤーとその領域に掛かるスプライトで描き直す"""
+        self.screen.set_clip(region)
+        self.screen.blit(self.map_layer, region.topleft, region)
+        for sprite in sprites:
+            if region.colliderect(self.get_sprite_rect(sprite)):
+                self.draw_sprite(sprite)
+        self.screen.set_clip(None)
+
+    def render_panel(self, name, key, rect, draw):
+        """パネルの内容(key)が前フレームから変わった場合のみ描き直し、描いた領域を返す"""
+        if not self.needs_full_redraw and self.panel_keys.get(name) == key:
+            return []
+        self.panel_keys[name] = key
+        draw()
+        return [rect.clip(self.screen.get_rect())]
+
+    def render_frame(self, logs):
+        """マップ・エンティティ・各ウィンドウを合成して1フレーム描画する
+
+        変化したマスやウィンドウだけを描き直し、その領域だけを pygame.display.update で反映する。
+
+        Returns:
+            list[pygame.Rect]: 画面に反映した領域
+        """
+        self.rendering_frame = True
+        try:
+            full_redraw = self.needs_full_redraw
+            border_color = self.get_border_color()
+            map_rect = self.get_map_area_rect()
+            layer_dirty = self.update_map_layer(border_color)
+
+            sprites = self.collect_entity_sprites()
+            if full_redraw:
+                regions = [map_rect]
+            else:
+                # 同じ敵が同じマスに重なると、はみ出したグリフの重ね塗りで見た目が変わるので個数も比べる
+                counts, last_counts = Counter(sprites), Counter(self.last_sprites)
+                changed = (counts - last_counts) + (last_counts - counts)
+                regions = layer_dirty + [self.get_sprite_rect(sprite) for sprite in changed]
+            self.last_sprites = sprites
+
+            dirty = []
+            for region in regions:
+                region = region.clip(map_rect)
+                if region.width and region.height:
+                    self.compose_map_region(region, sprites)
+                    dirty.append(region)
+
+            player = self.game.get_player()
+            map_width = map_rect.width
+            log_height = self.log_font.get_height() * const.DRAW_LOG_SIZE + 10
+            status_height = const.FONT_SIZE * 12
+            inventory_y = const.FONT_SIZE * 8
+            # MessageLogは上限に達するとlen()が変わらないので、通算の件数で更新を判断する
+            log_key = (getattr(logs, "total_count", len(logs)), logs[-1] if logs else None, border_color)
+            dirty += self.render_panel(
+                "log",
+                log_key,
+                pygame.Rect(0, const.WINDOW_SIZE_H - log_height, map_width, log_height),
+                lambda: self.draw_log_window(logs),
+            )
+            if player:
+                status_key = (tuple(self.get_status_lines(player.status)), border_color)
+                status_dirty = self.render_panel(
+                    "status",
+                    status_key,
+                    pygame.Rect(map_width, 0, const.WINDOW_SIZE_W - map_width, status_height),
+                    lambda: self.draw_status_window(player.status),
+                )
+                if status_dirty:
+                    # インベントリウィンドウはステータスウィンドウの下部に重なっているので描き直す
+                    self.panel_keys.pop("inventory", None)
+                dirty += status_dirty
+                inventory_txt, is_defined_list = player.get_inventory_str_list()
+                inventory_key = (tuple(inventory_txt), tuple(is_defined_list), border_color)
+                dirty += self.render_panel(
+                    "inventory",
+                    inventory_key,
+                    pygame.Rect(map_width, inventory_y, const.WINDOW_SIZE_W - map_width, const.WINDOW_SIZE_H),
+                    lambda: self.draw_inventory_window(player),
+                )
+
+            if full_redraw:
+                dirty = [self.screen.get_rect()]
+            self.needs_full_redraw = False
+        finally:
+            self.rendering_frame = False
+
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
+
     def draw_window(
         self,
         x,
@@ -110,6 +310,7 @@ class Draw:
         border_width=1,
         background_color=const.PYGAME_COLOR_BLACK,
     ):
+        self.invalidate()
         pygame.draw.rect(self.screen, background_color, (x, y, width, height))
         pygame.draw.rect(self.screen, border_color, (x, y, width, height), border_width)
 
@@ -138,7 +339,7 @@ class Draw:
             for line in wrapped_lines:
                 if log_y + log_font.get_height() > max_log_height:
                     return  # ウィンドウを超えたら終了
-                log_text = log_font.render(line, True, color)
+                log_text = self.assets_manager.render_text(font, font_size, line, color)
                 self.screen.blit(log_text, (x + 5, log_y))
                 log_y += log_font.get_height()
 
@@ -156,7 +357,7 @@ class Draw:
         x, y = self.get_game_map_size_px()
         window_width = x
 
-        log_font = self.assets_manager.load_font(const.FONT_DEFAULT, const.LOG_FONT_SIZE)
+        log_font = self.log_font
         font_height = log_font.get_height()
         window_height = font_height * n + 10
 
@@ -164,49 +365,39 @@ class Draw:
         window_y = const.WINDOW_SIZE_H - window_height
 
         # プレイヤーのHP状態に応じて縁取りの色を決定
-        player = self.game.get_player()
-        border_color = const.BORDER_COLOR_NORMAL  # デフォルトは白
-        
-        if player and player.status.current_hp > 0:
-            hp_ratio = player.status.current_hp / player.status.max_hp
-            if hp_ratio <= const.BORDER_HP_CRITICAL_THRESHOLD:  # HPが1/16以下の場合
-                border_color = const.BORDER_COLOR_CRITICAL
-            elif hp_ratio <= const.BORDER_HP_WARNING_THRESHOLD:  # HPが半分以下の場合
-                border_color = const.BORDER_COLOR_WARNING
+        border_color = self.get_border_color()
 
-        # 折り返しを考慮して、下からn行分だけを表示
-        wrapped_lines = []
-        log_colors = []
-        for log, color in zip(reversed(logs), reversed(["white"] * len(logs))):
-            lines = self.wrap_text(log, log_font, window_width - 10)
-            for line in reversed(lines):
-                wrapped_lines.insert(0, (line, color))
-                if len(wrapped_lines) >= n:
-                    break
-            if len(wrapped_lines) >= n:
+        # 折り返しを考慮して、新しいメッセージから表示するn行分だけを集める
+        newest_lines = []
+        for log in reversed(logs):
+            newest_lines.extend(reversed(self.get_wrapped_log_lines(log, log_font, window_width - 10)))
+            if len(newest_lines) >= n:
                 break
 
-        # wrapped_linesは最新が下に来るように並んでいる
-        display_lines = wrapped_lines[-n:]
+        # 最新が下に来るように並べる
+        display_lines = newest_lines[:n][::-1]
 
-        # 描画
+        # 描画（行のSurfaceはAssetsManagerのキャッシュから受け取る）
         self.draw_window(0, window_y, window_width, window_height, border_color=border_color)
         log_y = window_y + 5
-        for line, color in display_lines:
-            log_text = log_font.render(line, True, color)
+        for line in display_lines:
+            log_text = self.assets_manager.render_text(const.FONT_DEFAULT, const.LOG_FONT_SIZE, line, "white")
             self.screen.blit(log_text, (5, log_y))
             log_y += font_height
 
-    def draw_status_window(self, status: Status):
+    def get_status_lines(self, status: Status):
         x, y = self.game.get_player_position()
         status_txt = status.generate_status_txt(x, y)
-        
+
         # エフェクト情報を追加
         player = self.game.get_player()
         effect_symbols = player.get_effect_info()
         if effect_symbols:
             status_txt.append(f"Effects: {''.join(effect_symbols)}")
-        
+        return status_txt
+
+    def draw_status_window(self, status: Status):
+        status_txt = self.get_status_lines(status)
         log_colors = ["white"] * len(status_txt)
 
         x, y = self.get_game_map_size_px()
@@ -215,14 +406,7 @@ class Draw:
         status_window_height = const.FONT_SIZE * 12
 
         # プレイヤーのHP状態に応じて縁取りの色を決定
-        border_color = const.BORDER_COLOR_NORMAL  # デフォルトは白
-        
-        if player and player.status.current_hp > 0:
-            hp_ratio = player.status.current_hp / player.status.max_hp
-            if hp_ratio <= const.BORDER_HP_CRITICAL_THRESHOLD:  # HPが1/16以下の場合
-                border_color = const.BORDER_COLOR_CRITICAL
-            elif hp_ratio <= const.BORDER_HP_WARNING_THRESHOLD:  # HPが半分以下の場合
-                border_color = const.BORDER_COLOR_WARNING
+        border_color = self.get_border_color()
 
         # ステータスウィンドウの位置を調整
         self.draw_window_with_logs(
@@ -240,21 +424,29 @@ class Draw:
         status_window_height = const.FONT_SIZE * 8
 
         # プレイヤーのHP状態に応じて縁取りの色を決定
-        player = self.game.get_player()
-        border_color = const.BORDER_COLOR_NORMAL  # デフォルトは白
-        
-        if player and player.status.current_hp > 0:
-            hp_ratio = player.status.current_hp / player.status.max_hp
-            if hp_ratio <= const.BORDER_HP_CRITICAL_THRESHOLD:  # HPが1/16以下の場合
-                border_color = const.BORDER_COLOR_CRITICAL
-            elif hp_ratio <= const.BORDER_HP_WARNING_THRESHOLD:  # HPが半分以下の場合
-                border_color = const.BORDER_COLOR_WARNING
+        border_color = self.get_border_color()
 
         self.draw_window_with_logs(
             x, status_window_height, window_width, window_height, inventory_txt, log_colors, 
             border_color=border_color, font_size=16
         )
 
+    def get_wrapped_log_lines(self, message, font, max_width):
+        """ログのメッセージを折り返した行を返す。一度折り返したメッセージはキャッシュから返す"""
+        if self.log_line_cache_key != (font, max_width):
+            self.log_line_cache.clear()
+            self.log_line_cache_key = (font, max_width)
+        lines = self.log_line_cache.get(message)
+        if lines is None:
+            lines = tuple(self.wrap_text(message, font, max_width))
+            self.log_line_cache[message] = lines
+            # ログに残っている件数より少し多めに保持する
+            if len(self.log_line_cache) > const.LOG_HISTORY_SIZE * 2:
+                self.log_line_cache.popitem(last=False)
+        else:
+            self.log_line_cache.move_to_end(message)
+        return lines
+
     def wrap_text(self, text, font, max_width):
         """テキストをmax_widthで折り返し、行リストで返す"""
         words = text.split(' ')
@@ -273,6 +465,7 @@ class Draw:
         return lines
 
     def draw_help_window(self, keymap):
+        # keymapは InputHandler.keymap（CompiledKeymap）。実際に割り当てられているキーだけが並ぶ
         help_lines = []
         for action, keys in keymap.items():
             key_names = ", ".join(keys)
@@ -385,21 +578,36 @@ class Draw:
             pygame.time.wait(10)
         return selected_id
 
-    def draw_attention_mark(self, entity):
-        from constants import GRID_SIZE, PYGAME_COLOR_RED, FONT_DEFAULT
-        # フォントサイズを大きめに
-        font_size = max(14, GRID_SIZE // 2)
-        # 太字フォントを取得（pygame.font.Fontはbold引数がないのでset_boldを使う）
-        font = self.assets_manager.load_font(FONT_DEFAULT, font_size)
-        font.set_bold(True)
-        mark_text = font.render("!", True, PYGAME_COLOR_RED)
-        # 右上隅の座標
+    def get_attention_mark(self):
+        """!マークのグリフと、それを囲む〇の半径"""
+        # フォントサイズを大きめに、太字で描画
+        font_size = max(14, const.GRID_SIZE // 2)
+        mark_text = self.assets_manager.render_text(
+            const.FONT_DEFAULT, font_size, "!", const.PYGAME_COLOR_RED, bold=True
+        )
         circle_radius = max(mark_text.get_width(), mark_text.get_height()) // 2 + 2
+        return mark_text, circle_radius
+
+    def get_attention_mark_center(self, x, y):
+        _, circle_radius = self.get_attention_mark()
         # 右上隅の中心座標
-        center_x = entity.x * GRID_SIZE + GRID_SIZE - circle_radius
-        center_y = entity.y * GRID_SIZE + circle_radius
-        center_x += GRID_SIZE // 2
-        center_y -= GRID_SIZE // 2
+        center_x = x * const.GRID_SIZE + const.GRID_SIZE - circle_radius + const.GRID_SIZE // 2
+        center_y = y * const.GRID_SIZE + circle_radius - const.GRID_SIZE // 2
+        return center_x, center_y
+
+    def get_attention_mark_rect(self, x, y):
+        _, circle_radius = self.get_attention_mark()
+        center_x, center_y = self.get_attention_mark_center(x, y)
+        size = circle_radius * 2 + 2
+        return pygame.Rect(center_x - circle_radius - 1, center_y - circle_radius - 1, size, size)
+
+    def draw_attention_mark(self, entity):
+        self.invalidate()
+        self.draw_attention_mark_at(entity.x, entity.y)
+
+    def draw_attention_mark_at(self, x, y):
+        mark_text, circle_radius = self.get_attention_mark()
+        center_x, center_y = self.get_attention_mark_center(x, y)
         # 白い〇を描画
         pygame.draw.circle(self.screen, (255, 255, 255), (center_x, center_y), circle_radius)
         # !マークを〇の中心に重ねて描画
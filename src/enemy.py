@@ -4,23 +4,27 @@ from game import Game
 from status import Status
 from assets_manager import AssetsManager
 import os
-import yaml
 import glob
-import math
 import random
-from collections import deque
+from ai import DistanceField
+from dice import roll_dice
+from message_bus import MessageType
 
 
 class Enemy(Character):
+    __slots__ = ("behavior", "attack_range", "chase_power", "chase_turns", "speed")
+
     def __init__(self, x, y, status: Status):
         super().__init__(x, y, status)
-        self.behavior = RandomWalkBehavior()
+        self.behavior = RANDOM_WALK
         self.attack_range = 1
         # yamlからchase_powerを取得（なければデフォルト0）
         self.chase_power = getattr(status, "chase_power", 0)
         self.chase_turns = 0
+        # yamlからspeedを取得（なければ1ターンに1回行動する）
+        self.speed = getattr(status, "speed", const.NORMAL_SPEED)
 
-    def update(self, game: Game):
+    def update(self, game: Game, visibility=None):
         player = game.get_player()
         if not player:
             return None
@@ -28,7 +32,7 @@ class Enemy(Character):
         # プレイヤーが睡眠状態の場合は、敵の行動不能状態に関係なく攻撃可能
         if not player.can_act:
             # プレイヤーが見えるかどうかに関係なく攻撃を試みる
-            self.behavior = ChasePlayerBehavior()
+            self.behavior = CHASE_PLAYER
             action = self.behavior.determine_action(self, game)
             if action:
                 return action
@@ -39,15 +43,15 @@ class Enemy(Character):
         if not self.can_act:
             return None
 
-        if self.can_see_player(game):
-            self.behavior = ChasePlayerBehavior()
+        if self.can_see_player(game, visibility):
+            self.behavior = CHASE_PLAYER
             # 追跡ターンをchase_powerベースでリセット
-            self.chase_turns = self.chase_power + random.randint(0, 2)
+            self.chase_turns = self.chase_power + game.random.randint(0, 2)
         elif self.chase_turns > 0:
-            self.behavior = ChasePlayerBehavior()
+            self.behavior = CHASE_PLAYER
             self.chase_turns -= 1
         else:
-            self.behavior = RandomWalkBehavior()
+            self.behavior = RANDOM_WALK
 
         action = self.behavior.determine_action(self, game)
         return action
@@ -55,28 +59,26 @@ class Enemy(Character):
     def attack(self, target, game):
         """攻撃処理"""
         # 攻撃の成功を判定
-        did_hit, damage = self._roll_attack(target)
+        did_hit, damage = self._roll_attack(target, game.random)
         
         if did_hit:
             is_killed = target.take_damage(damage)
-            message = f"{self.status.name} attacks {target.status.name} for {damage} damage."
-            game.logger.info(message)
-            target.add_logger(message)
+            game.logger.post(MessageType.ATTACK, self.status.name, target.status.name, damage)
             
             if is_killed:
+                if target.is_player:
+                    game.killed_by = self.status.name
                 target.die(game)
         else:
-            message = f"{self.status.name} missed {target.status.name}!"
-            game.logger.info(message)
-            target.add_logger(message)
+            game.logger.post(MessageType.MISS, self.status.name, target.status.name)
 
-    def _roll_attack(self, target):
+    def _roll_attack(self, target, rng=random):
         """攻撃の成功判定とダメージ計算"""
         # 基本ダメージ（筋力の半分）
         base_dmg = self.status.strength // 2
         
         # 命中判定（20面ダイス）
-        res = random.randint(1, 20)
+        res = rng.randint(1, 20)
         # 基本命中率を75%に設定し、レベルと防御力で調整
         base_hit = 5  # 20面ダイスで75%の確率（5以上）
         level_bonus = self.status.level  # レベルが上がるほど命中率が上がる
@@ -87,8 +89,7 @@ class Enemy(Character):
         
         if did_hit:
             # ステータスからダイス情報を取得してロール
-            roll_result = sum(random.randint(1, self.status.dice_sides) 
-                            for _ in range(self.status.dice_count))
+            roll_result = roll_dice(self.status.dice_count, self.status.dice_sides, rng)
             
             # 基本ダメージにレベル補正を加算（レベルが上がるほど補正が大きくなる）
             level_bonus = self.status.level // 2
@@ -99,7 +100,7 @@ class Enemy(Character):
             
             # ばらつきの追加（基本ダメージの1/8）
             rnd_damage = int(max_damage / 8) + 1
-            max_damage += random.randint(-rnd_damage, rnd_damage)
+            max_damage += rng.randint(-rnd_damage, rnd_damage)
             
             # 防御力による軽減（最小ダメージ1を保証）
             damage = max(1, max_damage - target.status.armor)
@@ -108,10 +109,10 @@ class Enemy(Character):
         else:
             return False, 0
 
-    def calculate_exp_reward(self):
+    def calculate_exp_reward(self, rng=random):
         """経験値報酬の計算"""
         base_exp = self.status.level * self.status.exp  # 基本経験値
-        variance = random.randint(-5, 5)    # ±5の変動
+        variance = rng.randint(-5, 5)    # ±5の変動
         bonus = 0
         
         # 追跡力の高い敵はより多くの経験値
@@ -128,16 +129,17 @@ class Enemy(Character):
     def die(self, game):
         """敵の死亡処理"""
         # 経験値の付与
-        exp_gain = self.calculate_exp_reward()
+        exp_gain = self.calculate_exp_reward(game.random)
         player = game.get_player()
         if player:
-            player.gain_experience(exp_gain)
+            player.gain_experience(exp_gain, game.random)
             self.add_logger(f"Defeated {self.status.name}! Gained {exp_gain} experience!")
         
         # アイテムドロップ処理（オプション）
         self.drop_items(game)
         
         # 敵の削除
+        game.record_kill(self)
         game.remove_entity(self)
 
     def drop_items(self, game):
@@ -145,27 +147,14 @@ class Enemy(Character):
         # ここにアイテムドロップのロジックを実装
         pass
 
-    def can_see_player(self, game):
-        player = game.get_player()
-        if not player or player.is_invisible:  # 透明化状態のプレイヤーは見えない
-            return False
-
-        # 敵が現在どのタイプのセルにいるかを判断
-        current_room_id = game.game_map.room_info[self.y][self.x]
-        player_position = game.get_player_position()
-        if player_position is None:
-            return False
-
-        player_room_id = game.game_map.room_info[player_position[1]][player_position[0]]
-
-        if current_room_id is not None and player_room_id is not None:
-            # 両者とも部屋内
-            return player_room_id == current_room_id
-        else:
-            # 通路や部屋の外の場合、距離3以内なら見える
-            dx, dy = player_position[0] - self.x, player_position[1] - self.y
-            distance = math.sqrt(dx**2 + dy**2)
-            return distance <= 3
+    def can_see_player(self, game, visibility=None):
+        # 両者とも部屋内なら同じ部屋のときだけ、通路や部屋の外の場合は距離3以内なら見える
+        # （透明化状態のプレイヤーは見えない）。判定はプレイヤーの位置ごとのスナップショットで行う
+        if visibility is None:
+            visibility = game.get_player_visibility()
+            if visibility is None:
+                return False
+        return visibility.can_see(self.x, self.y)
 
 
 class EnemyManager:
@@ -173,42 +162,36 @@ class EnemyManager:
         self.enemy_data = self.load_enemy_data_from_directory()
 
     def load_enemy_data_from_directory(self):
+        # YAMLはContentDatabaseがプロセスで1回だけ読み込む
         assets_manager = AssetsManager()
-        directorys = assets_manager.get_all_enemy_paths()
-
-        enemy_list = []
-        for file_path in directorys:
-            with open(file_path, "r", encoding="utf-8") as file:
-                enemy_data = yaml.safe_load(file)
-                enemy_list.append(enemy_data)
-        return enemy_list
+        return assets_manager.get_enemy_data_list()
 
-    def tune_enemy_status(self, enemy_status: Status, current_level):
+    def tune_enemy_status(self, enemy_status: Status, current_level, rng=random):
         # ステータスの補正を適用
         lev_add = max(current_level - const.AMULETLEVEL, 0)
         enemy_status.level += lev_add
-        enemy_status.max_hp += random.randint(1, 8) * lev_add  # 8面ダイスを lev_add 回振る
+        enemy_status.max_hp += rng.randint(1, 8) * lev_add  # 8面ダイスを lev_add 回振る
         enemy_status.attack_power += lev_add
         enemy_status.defense_power -= lev_add
         enemy_status.exp += lev_add * 10  # 経験値の補正
 
-    def create_enemy(self, current_level, x, y):
+    def create_enemy(self, current_level, x, y, rng=random):
         # 現在のレベル以下のモンスターを選択
         suitable_enemies = [e for e in self.enemy_data if e.get("level", 99) <= current_level]
         if not suitable_enemies:
             return None  # 適切なモンスターがいない場合
 
         # 現在のレベル以下の敵からランダムに選出
-        selected_enemy = random.choice(suitable_enemies)
+        selected_enemy = rng.choice(suitable_enemies)
 
         enemy_status = Status(selected_enemy)
-        self.tune_enemy_status(enemy_status, current_level)
+        self.tune_enemy_status(enemy_status, current_level, rng)
 
         return Enemy(x, y, enemy_status)
 
     def add_enemy(self, game: Game, current_level):
         """add 1 enemy"""
-        enemy = self.create_enemy(current_level, 0, 0)
+        enemy = self.create_enemy(current_level, 0, 0, game.random)
         if enemy:
             game.teleport_entity(enemy)
             game.add_entity(enemy)
@@ -218,32 +201,38 @@ class EnemyManager:
             self.add_enemy(game, current_level)
 
     def update_enemies(self, game: Game):
-        # まず全ての敵を取得
-        enemies = [entity for entities in game.entity_positions.values() 
-                  for entity in entities if isinstance(entity, Enemy)]
-        
-        # 各敵の行動を処理
-        for enemy in enemies:
-            action = enemy.update(game)  # Enemy の行動を決定
+        # プレイヤーが近づいた場所で眠っている敵を起こす
+        player = game.get_player()
+        if player:
+            game.scheduler.wake_near(player.x, player.y)
+
+        # プレイヤーが見えるかは、プレイヤーの行動後に1回だけ作るスナップショットで判定する
+        # （敵の行動ではプレイヤーは動かない）
+        visibility = game.get_player_visibility()
+
+        # このターンに行動時刻が来た敵だけを、時刻の早い順に行動させる
+        for enemy in game.scheduler.advance():
+            action = enemy.update(game, visibility)  # Enemy の行動を決定
             if action:
                 game.apply_enemy_action(enemy, action)  # Game クラスに行動を適用させる
 
 
 class EnemyBehavior:
+    __slots__ = ()
+
     def determine_action(self, enemy: Enemy, game: Game):
         # この基底クラスメソッドはオーバーライドされるべきです
         raise NotImplementedError("This method should be overridden by subclasses")
 
 
 class ChasePlayerBehavior(EnemyBehavior):
+    __slots__ = ()
+
     def determine_action(self, enemy: Enemy, game: Game):
         player = game.get_player()
         if not player or player.is_invisible:  # 透明化状態のプレイヤーは追跡しない
             return None
 
-        player_pos = (player.x, player.y)
-        enemy_pos = (enemy.x, enemy.y)
-
         # プレイヤーとの距離を計算（ユークリッド距離）
         dx = abs(player.x - enemy.x)
         dy = abs(player.y - enemy.y)
@@ -252,23 +241,27 @@ class ChasePlayerBehavior(EnemyBehavior):
         if dx <= enemy.attack_range and dy <= enemy.attack_range:
             # プレイヤーが睡眠状態の場合は、より積極的に攻撃する
             if not player.can_act:
-                message = f"{enemy.status.name} sees you are asleep and attacks!"
-                game.logger.info(message)
-                player.add_logger(message)
+                game.logger.info(f"{enemy.status.name} sees you are asleep and attacks!")
             return {"type": "attack", "target": player}
             
-        # 攻撃範囲外の場合は追跡
-        next_step = find_next_step(game.game_map, enemy_pos, player_pos)
-        if next_step != enemy_pos:
+        # 攻撃範囲外の場合は、全ての敵で共有するプレイヤーからの距離マップを下って追跡
+        field = game.get_player_distance_field()
+        # 他のキャラクターがいるマスは避け、空いている中で最もプレイヤーに近いマスへ進む
+        next_step = field.next_step(
+            enemy.x,
+            enemy.y,
+            is_blocked=lambda x, y: any(isinstance(e, Character) for e in game.get_entities_at_position(x, y)),
+        )
+        if next_step is not None:
             new_x, new_y = next_step
-            # 移動先に他のキャラクターがいないことを確認
-            if not any(isinstance(e, Character) for e in game.get_entities_at_position(new_x, new_y)):
-                return {"type": "move", "new_x": new_x, "new_y": new_y}
+            return {"type": "move", "new_x": new_x, "new_y": new_y}
 
         return None
 
 
 class RandomWalkBehavior:
+    __slots__ = ()
+
     def determine_action(self, enemy: Enemy, game: Game):
         # 8方向のいずれかにランダムに移動する
         possible_moves = [
@@ -283,7 +276,7 @@ class RandomWalkBehavior:
         ]
         
         # 移動可能な方向をランダムにシャッフル
-        random.shuffle(possible_moves)
+        game.random.shuffle(possible_moves)
         
         for dx, dy in possible_moves:
             new_x, new_y = enemy.x + dx, enemy.y + dy
@@ -295,24 +288,14 @@ class RandomWalkBehavior:
         return None
 
 
+# 行動は状態を持たないので、すべての敵で同じインスタンスを使う
+CHASE_PLAYER = ChasePlayerBehavior()
+RANDOM_WALK = RandomWalkBehavior()
+
+
 def find_next_step(game_map, start, goal):
-    width, height = game_map.width, game_map.height
-    visited = set()
-    queue = deque()
-    queue.append((start, []))
-
-    while queue:
-        (x, y), path = queue.popleft()
-        if (x, y) == goal:
-            if path:
-                return path[0]  # 最初の一歩を返す
-            else:
-                return (x, y)  # すでにゴール
-
-        for dx, dy in [(-1,0),(1,0),(0,-1),(0,1), (-1,-1), (1,-1), (-1,1), (1,1)]:
-            nx, ny = x + dx, y + dy
-            if (0 <= nx < width and 0 <= ny < height and
-                game_map.is_walkable(nx, ny) and (nx, ny) not in visited):
-                visited.add((nx, ny))
-                queue.append(((nx, ny), path + [(nx, ny)]))
-    return start  # ゴールに到達できない場合はその場に留まる
+    """startからgoalへ向かう最初の一歩を返す（到達できない場合はstartのまま）"""
+    if start == goal:
+        return start  # すでにゴール
+    next_step = DistanceField(game_map, *goal).next_step(*start)
+    return next_step if next_step is not None else start
@@ -1,6 +1,11 @@
-class Entity:
-    def __init__(self, x, y, char, color="white"):
+from flyweight import SlotsObject
+
+
+class Entity(SlotsObject):
+    # 階層には数百個のエンティティが置かれるので __dict__ を持たせない（サブクラスも __slots__ を定義すること）
+    # 表示する文字と色（char, color）はサブクラスが持つ
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.char = char
-        self.color = color
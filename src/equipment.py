@@ -2,6 +2,8 @@ from item import Item
 
 
 class Equipment(Item):
+    __slots__ = ("is_equipped", "is_cursed")
+
     def __init__(self, name, x=0, y=0, char="e", color="white", undefined_name="", is_cursed=False):
         super().__init__(name, x, y, char, color, undefined_name)
         self.is_equipped = False
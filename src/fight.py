@@ -3,20 +3,12 @@ from weapon import Weapon
 from enemy import Enemy
 from game import Game
 from weapon import Weapon
+from message_bus import DEBUG, MessageType
+from dice import parse_dice, roll_dice
 import random
 from typing import Tuple
 
-def roll_dice(ndice: int, nsides: int) -> int:
-    """Roll a specified number of dice with a given number of sides.
-    
-    Args:
-        ndice (int): Number of dice to roll
-        nsides (int): Number of sides on each die
-        
-    Returns:
-        int: Total of all dice rolls
-    """
-    return sum(random.randint(1, nsides) for _ in range(ndice))
+UNARMED_DICE = parse_dice("0d0")  # 素手（ダメージは筋力のみ）
 
 class Fight:
     def __init__(self, player: Character, enemies: Character, game: Game, logger):
@@ -41,7 +33,7 @@ class Fight:
 
         if did_hit:
             is_killed = defender.take_damage(damage)
-            self.logger.info(f"{attacker.status.name} attacks {defender.status.name} for {damage} damage.")
+            self.logger.post(MessageType.ATTACK, attacker.status.name, defender.status.name, damage)
 
             if is_killed:
                 self.handle_death(defender)
@@ -54,12 +46,17 @@ class Fight:
             return False, 0
 
     def roll_em(self, attacker: Character, defender: Character, is_throw=False):
-        print(f"atk: {attacker.status.name}, def: {defender.status.name}")
         weapon = attacker.equipped_weapon
         base_dmg = attacker.status.strength // 2
         attacker_level = attacker.status.exp_level
         def_armor = defender.status.armor
-        print(f"{weapon=}, {base_dmg=}, {attacker_level=}, {def_armor=}")
+        self.logger.post(
+            MessageType.SWING,
+            attacker.status.name,
+            defender.status.name,
+            level=DEBUG,
+            detail=(weapon, base_dmg, attacker_level, def_armor),
+        )
 
         # 武器情報の取得
         weapon_info = self._get_weapon_info(weapon, is_throw)
@@ -68,11 +65,10 @@ class Fight:
         did_hit = False
         total_damage = 0
 
-        # ダメージ計算のループ
-        for dmg in weapon_info['attack_damage'].split("+"):
+        # ダメージ計算のループ（ダイス式の項ごとに1回ずつ攻撃する）
+        for ndice, nsides, dice_bonus in weapon_info['attack_damage'].terms:
             if self.swing(attacker_level, def_armor, weapon_info['hit_bonus']):
-                ndice, nsides = map(int, dmg.split("d"))
-                roll_result = roll_dice(ndice, nsides)
+                roll_result = roll_dice(ndice, nsides, self.game.random) + dice_bonus
                 damage = self._calculate_damage(
                     base_damage=base_dmg,
                     roll_result=roll_result,
@@ -91,12 +87,12 @@ class Fight:
             return {
                 'hit_bonus': 0,
                 'dmg_bonus': 0,
-                'attack_damage': '0d0'
+                'attack_damage': UNARMED_DICE
             }
         return {
             'hit_bonus': weapon.hit_bonus,
             'dmg_bonus': weapon.dmg_bonus,
-            'attack_damage': weapon.throw_dice if is_throw else weapon.wielded_dice
+            'attack_damage': weapon.throw_roll if is_throw else weapon.wielded_roll
         }
 
     def _calculate_damage(self, base_damage: int, roll_result: int, 
@@ -127,7 +123,7 @@ class Fight:
         
         # ばらつきの追加
         rnd_damage = int(max_damage / 16) + 1
-        max_damage += random.randint(-rnd_damage, rnd_damage)
+        max_damage += self.game.random.randint(-rnd_damage, rnd_damage)
         
         # 装備品による防御効果
         defense_modifier = self._calculate_equipment_modifier(attacker, defender)
@@ -138,7 +134,14 @@ class Fight:
         # 最終ダメージの計算（0未満にはならない）
         final_damage = max(0, max_damage + defense_modifier + status_modifier)
         
-        print(f"Damage calculation: {final_damage} = {max_damage} (base) + {defense_modifier} (defense) + {status_modifier} (status)")
+        self.logger.post(
+            MessageType.DAMAGE,
+            attacker.status.name,
+            defender.status.name,
+            final_damage,
+            level=DEBUG,
+            detail=(max_damage, defense_modifier, status_modifier),
+        )
         
         return final_damage
 
@@ -160,15 +163,12 @@ class Fight:
         modifier = 0
         
         # 防具による軽減
-        print(f"{defender.equipped_armor=}")
         if defender.equipped_armor:
             # 基本防具値
             modifier -= defender.equipped_armor.armor
             # 防具のprotection bonus
             if hasattr(defender.equipped_armor, 'protection_bonus'):
                 modifier -= defender.equipped_armor.protection_bonus
-        
-            print(f"{modifier=}, {defender.equipped_armor.armor=}")
 
         # 指輪による防御補正
         if defender.equipped_left_ring and hasattr(defender.equipped_left_ring, 'protection_bonus'):
@@ -177,7 +177,7 @@ class Fight:
         if defender.equipped_right_ring and hasattr(defender.equipped_right_ring, 'protection_bonus'):
             modifier -= defender.equipped_right_ring.protection_bonus
         
-        print(f"Equipment defense modifier: {modifier} (armor + protection bonuses)")
+        self.logger.post(MessageType.DEFENSE, attacker.status.name, defender.status.name, modifier, level=DEBUG)
         return modifier
 
     def _calculate_status_modifier(self, attacker: Character, defender: Character) -> int:
@@ -186,7 +186,7 @@ class Fight:
         return 0
 
     def swing(self, attacker_level, defender_armor, hit_bonus):
-        res = random.randint(1, 20)
+        res = self.game.random.randint(1, 20)
         need = (20 - attacker_level) - defender_armor
         return res + hit_bonus >= need
 
@@ -214,23 +214,25 @@ class Fight:
         # 敵が死亡した場合の処理
         if isinstance(defender, Enemy):
             # 経験値の計算と付与
-            exp_gain = defender.calculate_exp_reward()
+            exp_gain = defender.calculate_exp_reward(self.game.random)
             if self.player:
-                self.player.gain_experience(exp_gain)
-                self.logger.info(f"{defender.status.name} is killed! Gained {exp_gain} experience!")
+                self.player.gain_experience(exp_gain, self.game.random)
+                self.logger.post(MessageType.KILL, target=defender.status.name, amount=exp_gain)
             
+            self.game.record_kill(defender)
+
             # 敵をenemiesリストから安全に削除
             if defender in self.enemies:
                 self.enemies.remove(defender)
                 self.game.remove_entity(defender)
         else:
             # プレイヤーの場合
-            self.logger.info(f"{defender.status.name} is killed!")
+            self.logger.post(MessageType.DEATH, target=defender.status.name)
 
     def handle_hit(self, defender: Character):
         # 攻撃がヒットしたが、敵が死亡しなかった場合の処理
-        self.logger.info(f"{defender.status.name} is hit!")
+        self.logger.post(MessageType.HIT, target=defender.status.name)
 
     def handle_miss(self, attacker, defender):
         # 攻撃がミスした場合の処理
-        self.logger.info(f"{attacker.status.name} missed {defender.status.name}!")
+        self.logger.post(MessageType.MISS, attacker.status.name, defender.status.name)
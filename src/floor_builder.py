@@ -0,0 +1,101 @@
+import copy
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import constants as const
+from map import GameMap
+from stair import Stairs
+
+
+def get_floor_seed(seed, level):
+    """ゲームのシードと階層から、その階層の生成に使う乱数のシードを作る"""
+    return f"{seed}:floor:{level}"
+
+
+class FloorPlan:
+    """生成済みの1階層分のマップとエンティティの配置"""
+
+    def __init__(self, seed, level, game_map, entities, player_start):
+        self.seed = seed
+        self.level = level
+        self.game_map = game_map
+        self.entities = entities  # プレイヤー以外のエンティティ（敵・階段・ゴールド・アイテム）を追加順に並べたもの
+        self.player_start = player_start  # プレイヤーを置く座標 (x, y)
+
+
+def build_floor(seed, level, enemy_manager, player, compact=None, potion_manager=None):
+    """seedとlevelだけで決まる乱数で、1階層分のマップとエンティティを生成する
+
+    生成には作業用のGameを使うので、遊んでいるゲームの状態には触れない（別スレッドから呼べる）。
+    playerは配置の目印にだけ使い、本物のプレイヤーの座標は変更しない。
+    potion_managerを渡すと、ポーションの不確定名称を遊んでいるゲームと揃える（読むだけで変更しない）。
+    """
+    from game import Game
+
+    rng = random.Random(get_floor_seed(seed, level))
+    game_map = GameMap(rng, compact=compact)
+    scratch = Game(game_map, rng=rng)
+    scratch.headless = True
+    if potion_manager is not None:
+        scratch.potion_manager = potion_manager
+
+    # プレイヤーの位置を先に決めて、敵がそのマスに置かれないようにする
+    marker = copy.copy(player)
+    scratch.teleport_entity(marker)
+    scratch.add_entity(marker)
+
+    enemy_manager.create_enemies(scratch, level, const.INITIAL_SPAWN_ENEMY_NUM)
+    stair = Stairs()
+    scratch.teleport_entity(stair)
+    scratch.add_entity(stair)
+    scratch.place_gold_in_dungeon(level)
+    scratch.place_items_in_dungeon(level)
+
+    scratch.remove_entity(marker)
+    return FloorPlan(seed, level, game_map, list(scratch.entity_locations), (marker.x, marker.y))
+
+
+class FloorPregenerator:
+    """次の階層をワーカースレッドで前もって生成しておく
+
+    生成結果は (シード, 階層) をキーに保持し、take() で取り出す。
+    まだ生成中なら終わるまで待ち、依頼していなければその場で生成する。
+    どちらでも同じシード・階層なら同じ階層になる。
+    """
+
+    def __init__(self, background=None):
+        # Falseなら前もって生成せず、take() でその場で生成する
+        self.background = const.FLOOR_PREGENERATION if background is None else background
+        self.executor = None
+        self.pending = {}  # (seed, level) -> Future
+
+    def request(self, seed, level, enemy_manager, player, compact=None, potion_manager=None):
+        """(seed, level) の階層の生成を依頼する（依頼済みなら何もしない）"""
+        if not self.background or (seed, level) in self.pending:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor-builder")
+        # プレイヤーはこの時点の複製を渡し、生成中に本物が動いても影響しないようにする
+        self.pending[(seed, level)] = self.executor.submit(
+            build_floor, seed, level, enemy_manager, copy.copy(player), compact, potion_manager
+        )
+
+    def take(self, seed, level, enemy_manager, player, compact=None, potion_manager=None):
+        """(seed, level) の階層を返す。他の階層の依頼は破棄する"""
+        future = self.pending.pop((seed, level), None)
+        self.discard()
+        if future is not None:
+            return future.result()
+        return build_floor(seed, level, enemy_manager, player, compact, potion_manager)
+
+    def discard(self):
+        """未使用の依頼をすべて破棄する"""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+
+    def shutdown(self):
+        self.discard()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -0,0 +1,98 @@
+"""種類ごとに変わらないデータを、同じ種類のインスタンスで共有するための仕組み
+
+アイテムや敵は階層に数百個置かれるが、名前・文字・色・ダイス・説明文などは種類（YAMLのファイル）ごとに同じになる。
+それらは KindTemplate にまとめて共有し、インスタンスには位置・鑑定状態・HPなどの変わる値だけを __slots__ で持たせる。
+インスタンスからは TemplateField で、今までどおり item.name のように読める（書き換えはできない）。
+"""
+
+from content_db import FrozenDict
+
+
+class KindTemplate:
+    """種類ごとに変わらないデータ。属性として読む。作ったあとは変更しないこと"""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    def __repr__(self):
+        return f"KindTemplate({self.__dict__})"
+
+
+class TemplateField:
+    """インスタンスの template（KindTemplate）の同名の属性を返す、読み取り専用の属性"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance.template, self.name)
+
+
+# (テンプレートを作る関数, id(YAMLのテンプレート)) -> (YAMLのテンプレート, KindTemplate)
+# YAMLのテンプレートも保持しておくので、idが別のオブジェクトに使い回されることはない
+_kind_templates = {}
+
+
+def get_kind_template(build, data):
+    """YAMLのデータから build(data) で KindTemplate を作る
+
+    ContentDatabaseのテンプレート（FrozenDict）からは1回だけ作り、同じ種類のインスタンスで使い回す。
+    """
+    if not isinstance(data, FrozenDict):
+        return build(data)  # テストなどで渡される普通のdictは後から変更されうるので共有しない
+    key = (build, id(data))
+    entry = _kind_templates.get(key)
+    if entry is None:
+        entry = _kind_templates[key] = (data, build(data))
+    return entry[1]
+
+
+def get_slot_names(cls):
+    """クラスとその基底クラスの __slots__ をすべて返す"""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return names
+
+
+class SlotsObject:
+    """__slots__ を使うクラスの基底
+
+    属性を __dict__ と同じ形のdictで出し入れできるようにする（セーブデータ用）。
+    __slots__ にする前に __dict__ のまま保存されたセーブデータも __setstate__ で読める。
+    """
+
+    __slots__ = ()
+
+    def get_state(self):
+        """属性をdictで返す。種類ごとのデータ（template）も展開して含める"""
+        state = {}
+        template = getattr(self, "template", None)
+        if isinstance(template, KindTemplate):
+            state.update(vars(template))
+        for name in get_slot_names(type(self)):
+            if name != "template" and hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
+    def set_state(self, state):
+        """get_state() や以前の __dict__ の形のdictから属性を設定する"""
+        state = dict(state)
+        cls = type(self)
+        if "template" not in state and "template" in get_slot_names(cls):
+            fields = [name for name in state if isinstance(getattr(cls, name, None), TemplateField)]
+            state["template"] = KindTemplate(**{name: state.pop(name) for name in fields})
+        slot_names = set(get_slot_names(cls))
+        for name, value in state.items():
+            if name in slot_names:  # 以前のバージョンにしかない属性は読み捨てる
+                setattr(self, name, value)
+
+    def __setstate__(self, state):
+        # pickleの状態は (__dict__, __slots__ の値) のタプル、古いセーブデータは __dict__ のdict
+        if isinstance(state, tuple):
+            dict_state, slots_state = state
+            state = {**(dict_state or {}), **(slots_state or {})}
+        self.set_state(state)
@@ -1,39 +1,49 @@
-import yaml
 import random
 from item import Item
 from entity import Entity
 from character import Character
 import constants as const
 from assets_manager import AssetsManager
+from flyweight import KindTemplate, TemplateField, get_kind_template
 
 
 class Food(Item):
-    def __init__(self, x=0, y=0):
+    # 名前と満腹度は食料ごとに決める
+    __slots__ = ("name", "nutrition")
+
+    food_data = TemplateField()
+    nutrition_base = TemplateField()
+    nutrition_tune = TemplateField()
+    nutrition_rand_max = TemplateField()
+
+    def __init__(self, x=0, y=0, rng=random):
         super().__init__("Food", x, y, ":", "white")
-        self.load_data()
-        self.calc_nutrition()
+        self.load_data(rng)
+        self.calc_nutrition(rng)
 
-    def load_data(self):
+    def load_data(self, rng=random):
         assets_manager = AssetsManager()
-        directory = assets_manager.get_item_path("food")
-        food_path = directory / "food.yaml"
-
-        with open(food_path, "r", encoding="utf-8") as file:
-            data = yaml.safe_load(file)
-            self.food_data = data
-            self.name = random.choice(data.get("food_names", ["Food"]))
-            self.char = data.get("char", ":")
-            self.color = data.get("color", "brown")
-            self.undefined_name = data.get("undefined_name", "Unknown Food")
-            self.nutrition_base = data.get("nutrition_base", const.HUNGERTIME)
-            self.nutrition_tune = data.get("nutrition_tune", const.FOOD_TUNE_VALUE)
-            self.nutrition_rand_max = data.get("nutrition_rand_max", const.FOOD_RAND_MAX)
-            self.display_name = self.undefined_name
-            self.is_defined = False
-
-    def calc_nutrition(self):
+        data = assets_manager.get_item_data("food", "food.yaml")
+        self.template = get_kind_template(Food.build_template, data)
+        self.name = rng.choice(data.get("food_names", ["Food"]))
+        self.display_name = self.undefined_name
+        self.is_defined = False
+
+    @staticmethod
+    def build_template(data):
+        return KindTemplate(
+            food_data=data,
+            char=data.get("char", ":"),
+            color=data.get("color", "brown"),
+            undefined_name=data.get("undefined_name", "Unknown Food"),
+            nutrition_base=data.get("nutrition_base", const.HUNGERTIME),
+            nutrition_tune=data.get("nutrition_tune", const.FOOD_TUNE_VALUE),
+            nutrition_rand_max=data.get("nutrition_rand_max", const.FOOD_RAND_MAX),
+        )
+
+    def calc_nutrition(self, rng=random):
         """満腹度の計算"""
-        self.nutrition = self.nutrition_base - self.nutrition_tune + random.randint(0, self.nutrition_rand_max)
+        self.nutrition = self.nutrition_base - self.nutrition_tune + rng.randint(0, self.nutrition_rand_max)
 
     def get_nutrition_percent(self):
         """満腹度を百分率で返す"""
@@ -1,4 +1,3 @@
-import pygame
 import random
 from map import GameMap
 import constants as const
@@ -13,10 +12,13 @@ from armor import Armor, ArmorManager
 from ring import Ring, RingManager
 from player import Player
 import pickle
-import yaml
 import os
 from potion import Potion, PotionManager
 from effect import EFFECT_MAP
+from ai import DistanceField, PlayerVisibility
+from floor_builder import FloorPregenerator
+from scheduler import TurnScheduler
+from message_bus import MessageType
 
 
 class GameState(Enum):
@@ -24,19 +26,34 @@ class GameState(Enum):
     FOOD_SELECTION = 2
 
 
+# エンティティの種類ごとのバケット名
+ENTITY_BUCKETS = ("players", "enemies", "items", "gold", "stairs", "others")
+
+
 class Game:
-    def __init__(self, game_map: GameMap, start_pos=[0, 0]):
+    def __init__(self, game_map: GameMap, start_pos=[0, 0], rng=None, seed=None):
         self.game_map = game_map
+        # このゲームで使う乱数（省略時はrandomモジュール共通の乱数）。シード付きの並列実行ではゲームごとに渡す
+        self.random = rng if rng is not None else random
+        # 2階層目以降の生成に使うシード（省略時は最初に必要になったときにself.randomから決める）
+        self.seed = seed
+        self.floor_pregenerator = FloorPregenerator()  # 次の階層を前もって生成する
         self.state = GameState.NORMAL
         self.reset_player_and_rooms(start_pos)
         self.waiting_for_food_selection = False
-        self.entity_positions = {}  # キーは座標タプル (x, y)、値はエンティティ
+        self.clear_entities()
         self.in_selection_mode = False
         self.temp_enemy_explored = set()  # 一時的に探索済みにしたマス
         self.console_mode = False
         self._restart_game = False
         self.console_input = ""
-        self.potion_manager = PotionManager()  # PotionManagerを初期化
+        self.potion_manager = PotionManager(self.random)  # PotionManagerを初期化
+        self.player_distance_field = None  # プレイヤーからの距離マップ（追跡する敵で共有）
+        self.player_visibility = None  # プレイヤーが見えるマスのスナップショット（敵のAIと描画で共有）
+        self.headless = False  # Trueなら画面描画・演出・入力待ちを行わない（シミュレーション用）
+        self.game_over = False  # ヘッドレス時にプレイヤーが倒されたらTrue
+        self.kills = 0  # プレイヤーが倒した敵の数
+        self.killed_by = None  # プレイヤーを倒した敵の名前
 
     def set_drawer(self, drawer):
         self.drawer = drawer
@@ -76,38 +93,145 @@ class Game:
                 self.player_collect_gold(player, entity)
                 break  # ゴールドを1つだけ拾う
 
+    def clear_entities(self):
+        """エンティティの登録情報をすべて初期化する"""
+        self.entity_positions = {}  # キーは座標タプル (x, y)、値はエンティティ
+        # 種類ごとのバケット（挿入順を保つため、dictを順序付き集合として使う）
+        self.entity_buckets = {name: {} for name in ENTITY_BUCKETS}
+        self.entity_locations = {}  # エンティティ -> 登録されている座標
+        self.player = None
+        # 空きマス（移動可能でキャラクターがいないマス）の配列と、座標 -> 配列の添字
+        # キャラクターが出入りしたマスは free_cells_dirty に溜め、get_free_cells() でまとめて反映する
+        self.free_cells = []
+        self.free_cell_index = {}
+        self.free_cells_dirty = set()
+        self.free_cells_map = None  # 空きマスを作ったときのGameMap（とそのversion）。地形が変わったら作り直す
+        self.free_cells_version = None
+        self.scheduler = TurnScheduler()  # 敵の行動順（次に行動する時刻の早い順）
+
+    def rebuild_entity_index(self):
+        """entity_positionsの内容からバケットとプレイヤー参照を作り直す"""
+        entity_positions = self.entity_positions
+        self.clear_entities()
+        for entities in entity_positions.values():
+            for entity in entities:
+                self.add_entity(entity)
+
+    def classify_entity(self, entity):
+        """エンティティが属するバケット名を返す"""
+        from enemy import Enemy
+
+        if isinstance(entity, Player):
+            return "players"
+        elif isinstance(entity, Enemy):
+            return "enemies"
+        elif isinstance(entity, Item):
+            return "items"
+        elif isinstance(entity, Gold):
+            return "gold"
+        elif isinstance(entity, Stairs):
+            return "stairs"
+        return "others"
+
+    def get_entities_of_type(self, bucket):
+        """指定したバケットのエンティティのリストを返す（ENTITY_BUCKETSのいずれか）"""
+        return list(self.entity_buckets[bucket])
+
+    def get_enemies(self):
+        return list(self.entity_buckets["enemies"])
+
+    def record_kill(self, enemy):
+        """敵が倒されたことを記録する（統計用）"""
+        self.kills += 1
+
     def update_entity_position(self, entity, old_pos=None):
-        """エンティティの位置を更新する"""
+        """エンティティの位置を更新する
+
+        古い位置は登録されている座標を使う（old_posは互換のために残している）。
+        """
+        if entity not in self.entity_locations:
+            self.add_entity(entity)
+            return
+
         new_pos = (entity.x, entity.y)
-        
-        # 古い位置が指定されている場合、そこからエンティティを削除
-        if old_pos:
-            old_x, old_y = old_pos
-            if (old_x, old_y) in self.entity_positions:
-                # エンティティが存在する場合のみ削除を試みる
-                if entity in self.entity_positions[(old_x, old_y)]:
-                    self.entity_positions[(old_x, old_y)].remove(entity)
-                # リストが空になった場合、キーを削除
-                if not self.entity_positions[(old_x, old_y)]:
-                    del self.entity_positions[(old_x, old_y)]
-        
+        old_pos = self.entity_locations[entity]
+        if old_pos == new_pos:
+            return
+        self._remove_from_position(entity, old_pos)
+
         # 新しい位置にエンティティを追加
-        if new_pos not in self.entity_positions:
-            self.entity_positions[new_pos] = []
-        if entity not in self.entity_positions[new_pos]:
-            self.entity_positions[new_pos].append(entity)
+        self.entity_positions.setdefault(new_pos, []).append(entity)
+        self.entity_locations[entity] = new_pos
+        if isinstance(entity, Character):
+            self.free_cells_dirty.add(old_pos)
+            self.free_cells_dirty.add(new_pos)
 
     def add_entity(self, entity):
+        if entity in self.entity_locations:
+            # 登録済みのエンティティは位置の更新として扱う
+            self.update_entity_position(entity)
+            return
+
         pos = (entity.x, entity.y)
-        if pos not in self.entity_positions:
-            self.entity_positions[pos] = []
-        self.entity_positions[pos].append(entity)
+        self.entity_positions.setdefault(pos, []).append(entity)
+        self.entity_locations[entity] = pos
+
+        bucket = self.classify_entity(entity)
+        self.entity_buckets[bucket][entity] = None
+        if bucket == "players":
+            self.player = entity
+        elif bucket == "enemies":
+            self.schedule_enemy(entity)
+        if isinstance(entity, Character):
+            self.free_cells_dirty.add(pos)
+
+    def schedule_enemy(self, enemy):
+        """敵をターンスケジューラに登録する（未探索の場所にいる敵は、プレイヤーが近づくまで眠らせる）"""
+        area = self.get_sleeping_area(enemy.x, enemy.y) if const.MONSTER_SLEEP_IN_UNEXPLORED_AREAS else None
+        if area is None:
+            self.scheduler.add(enemy)
+        else:
+            self.scheduler.add_sleeping(enemy, *area)
+
+    def get_sleeping_area(self, x, y):
+        """(x, y) にいる敵を眠らせる場所を (場所, 矩形) で返す（探索済みの場所ならNone）
+
+        部屋の中なら部屋、通路ならMONSTER_SLEEP_AREA_SIZE四方に区切った区画を場所にする。
+        """
+        game_map = self.game_map
+        room_id = game_map.get_room_id(x, y)
+        if room_id is not None:
+            if room_id in self.explored_rooms:
+                return None
+            room = game_map.rooms[room_id]
+            return room_id, (room["x1"], room["y1"], room["x2"], room["y2"])
+        if game_map.explored[y][x]:
+            return None
+        size = const.MONSTER_SLEEP_AREA_SIZE
+        x1, y1 = x - x % size, y - y % size
+        return ("corridor", x1, y1), (x1, y1, x1 + size, y1 + size)
 
     def remove_entity(self, entity):
-        pos = (entity.x, entity.y)
-        if pos in self.entity_positions and entity in self.entity_positions[pos]:
-            self.entity_positions[pos].remove(entity)
-            if not self.entity_positions[pos]:
+        pos = self.entity_locations.pop(entity, None)
+        if pos is None:
+            return
+        self._remove_from_position(entity, pos)
+
+        bucket = self.classify_entity(entity)
+        self.entity_buckets[bucket].pop(entity, None)
+        if entity is self.player:
+            self.player = next(iter(self.entity_buckets["players"]), None)
+        elif bucket == "enemies":
+            self.scheduler.remove(entity)
+        if isinstance(entity, Character):
+            self.free_cells_dirty.add(pos)
+
+    def _remove_from_position(self, entity, pos):
+        entities = self.entity_positions.get(pos)
+        if entities and entity in entities:
+            entities.remove(entity)
+            # リストが空になった場合、キーを削除
+            if not entities:
                 del self.entity_positions[pos]
 
     def apply_enemy_action(self, enemy, action):
@@ -126,76 +250,121 @@ class Game:
             self.attack_entity(enemy, action["target"])
 
     def check_new_room_entry(self, x, y):
-        room_id = self.game_map.room_info[y][x]
+        room_id = self.game_map.get_room_id(x, y)
         if room_id is not None and room_id not in self.explored_rooms:
             self.explored_rooms.add(room_id)
             self.game_map.mark_room_explored_by_id(room_id)
 
+    def get_free_cells(self):
+        """移動可能で、キャラクターがいないマスの座標の配列を返す（順序は不定）
+
+        キャラクターが出入りしたマスだけを差分で反映し、全体を作り直すのは地形が変わったときだけ。
+        """
+        game_map = self.game_map
+        if self.free_cells_map is game_map and self.free_cells_version == game_map.version:
+            for pos in self.free_cells_dirty:
+                self.update_free_cell(pos)
+        else:
+            occupied = {
+                pos
+                for pos, entities in self.entity_positions.items()
+                if any(isinstance(e, Character) for e in entities)
+            }
+            self.free_cells = [cell for cell in game_map.get_walkable_tiles() if cell not in occupied]
+            self.free_cell_index = {cell: i for i, cell in enumerate(self.free_cells)}
+            self.free_cells_map = game_map
+            self.free_cells_version = game_map.version
+        self.free_cells_dirty.clear()
+        return self.free_cells
+
+    def update_free_cell(self, pos):
+        """posが空きマスかどうかを調べ直し、空きマスの配列に反映する"""
+        game_map = self.game_map
+        is_free = game_map.is_walkable(*pos) and not any(
+            isinstance(e, Character) for e in self.entity_positions.get(pos, ())
+        )
+        index = self.free_cell_index.get(pos)
+        if is_free and index is None:
+            self.free_cell_index[pos] = len(self.free_cells)
+            self.free_cells.append(pos)
+        elif not is_free and index is not None:
+            # 末尾の要素を空いた位置に移して削除する
+            last = self.free_cells.pop()
+            del self.free_cell_index[pos]
+            if last != pos:
+                self.free_cells[index] = last
+                self.free_cell_index[last] = index
+
     def teleport_entity(self, entity):
         """teleport 1 entity"""
-        walkable_tiles = self.game_map.get_walkable_tiles()
-        if walkable_tiles:
-            # 既に他のキャラクターがいるマスを除外
-            available_tiles = [
-                (x, y) for x, y in walkable_tiles
-                if not any(isinstance(e, Character) for e in self.get_entities_at_position(x, y))
-            ]
-            if available_tiles:
-                x, y = random.choice(available_tiles)
-                entity.x = x
-                entity.y = y
-            else:
-                # 利用可能なマスがない場合は、ランダムな位置に配置
-                x, y = random.choice(walkable_tiles)
-                entity.x = x
-                entity.y = y
+        # 既に他のキャラクターがいるマスを除いた空きマスから選ぶ
+        free_cells = self.get_free_cells()
+        if free_cells:
+            x, y = self.random.choice(free_cells)
+        else:
+            # 利用可能なマスがない場合は、ランダムな位置に配置
+            walkable_tiles = self.game_map.get_walkable_tiles()
+            if not walkable_tiles:
+                return
+            x, y = self.random.choice(walkable_tiles)
+        entity.x = x
+        entity.y = y
+        # 登録済みのエンティティは登録座標も更新する
+        if entity in self.entity_locations:
+            self.update_entity_position(entity)
 
     def teleport_all_entities(self):
-        for pos, entities in self.entity_positions.items():
-            for entity in entities:
-                self.teleport_entity(entity)
+        for entity in list(self.entity_locations):
+            self.teleport_entity(entity)
 
     def get_player(self):
-        # entity_positionsからプレイヤーを取得
-        return next(
-            (
-                entity
-                for entities in self.entity_positions.values()
-                for entity in entities
-                if entity.__class__.__name__ == "Player"
-            ),
-            None,
-        )
+        return self.player
 
     def get_player_position(self):
         """Return player.x, player.y"""
-        player = next(
-            (
-                entity
-                for entities in self.entity_positions.values()
-                for entity in entities
-                if entity.__class__.__name__ == "Player"
-            ),
-            None,
-        )
+        player = self.player
         if player is None:
             return None
         return player.x, player.y
 
+    def get_player_distance_field(self):
+        """プレイヤー位置を起点とした距離マップを返す
+
+        プレイヤーが移動するかマップが変わるまではキャッシュを使い回す。
+        """
+        player = self.get_player()
+        if player is None:
+            return None
+        field = getattr(self, "player_distance_field", None)
+        if field is None or not field.is_valid_for(self.game_map, player.x, player.y):
+            field = DistanceField(self.game_map, player.x, player.y)
+            self.player_distance_field = field
+        return field
+
+    def get_player_visibility(self):
+        """プレイヤーがどのマスの敵から見えるかのスナップショットを返す
+
+        プレイヤーが移動するか、透明化状態かマップが変わるまではキャッシュを使い回す。
+        """
+        player = self.get_player()
+        if player is None:
+            return None
+        visibility = getattr(self, "player_visibility", None)
+        if visibility is None or not visibility.is_valid_for(self.game_map, player.x, player.y, player.is_invisible):
+            visibility = PlayerVisibility(
+                self.game_map, player.x, player.y, player.is_invisible, const.ENEMY_SIGHT_RADIUS
+            )
+            self.player_visibility = visibility
+        return visibility
+
     def get_walkable_tiles(self):
         """移動可能なタイルの座標のリストを返す"""
-        walkable_tiles = []
-        for y in range(self.game_map.height):
-            for x in range(self.game_map.width):
-                if self.game_map.is_walkable(x, y):
-                    walkable_tiles.append((x, y))
-        return walkable_tiles
+        return self.game_map.get_walkable_tiles()
 
     def is_walkable(self, x, y, ignore_characters=False) -> bool:
         """指定された座標が移動可能かどうかを判断する"""
-        # タイル自体が移動可能かどうかをチェック
-        walkable_tiles = self.get_walkable_tiles()
-        if (x, y) not in walkable_tiles:
+        # タイル自体が移動可能かどうかをチェック（GameMapの移動可能グリッドでO(1)）
+        if not self.game_map.is_walkable(x, y):
             return False
 
         if not ignore_characters:
@@ -212,37 +381,38 @@ class Game:
         self.remove_entity(gold_entity)
 
     def determine_gold_piles(self):
-        return random.randint(1, const.MAX_GOLDS)
+        return self.random.randint(1, const.MAX_GOLDS)
 
     def place_gold_in_dungeon(self, current_level):
         num_gold_piles = self.determine_gold_piles()
         for _ in range(num_gold_piles):
             gold = Gold()
-            gold.determine_gold_amount(current_level)
+            gold.determine_gold_amount(current_level, self.random)
             # ゲームマップにゴールドを追加
             self.teleport_entity(gold)
             self.add_entity(gold)
 
     def place_items_in_dungeon(self, current_level):
         num_items = const.NUMTHINGS + 99  # 99 is debug
+        # 武器・防具・指輪の管理クラスは状態を持たないので、階層ごとに1つずつ作って使い回す
+        # ポーションは不確定名称と鑑定状態をゲーム全体で揃えるため、ゲームのPotionManagerを使う
+        wm = WeaponManager()
+        am = ArmorManager()
+        ring = RingManager()
         for _ in range(num_items):
             entity_type_list = [Food, Weapon, Armor, Ring, Potion]  # ポーションを追加
-            entity_type = random.choice(entity_type_list)
+            entity_type = self.random.choice(entity_type_list)
 
             if entity_type == Weapon:
-                wm = WeaponManager()
-                entity = wm.get_random_weapon()
+                entity = wm.get_random_weapon(self.random)
             elif entity_type == Armor:
-                am = ArmorManager()
-                entity = am.get_random_armor()
+                entity = am.get_random_armor(self.random)
             elif entity_type == Ring:
-                ring = RingManager()
-                entity = ring.get_random_ring()
+                entity = ring.get_random_ring(self.random)
             elif entity_type == Potion:  # ポーションの生成を追加
-                pm = PotionManager()
-                entity = pm.get_random_potion()
+                entity = self.potion_manager.get_random_potion(self.random)
             else:
-                entity = Food()
+                entity = Food(rng=self.random)
 
             self.teleport_entity(entity)
             self.add_entity(entity)
@@ -261,19 +431,14 @@ class Game:
 
     def remove_player(self):
         # entity listからプレーヤーを削除
-        from player import Player
-        for pos, entities in list(self.entity_positions.items()):
-            for entity in list(entities):
-                if isinstance(entity, Player):
-                    print(f"remove player: {entity.x}, {entity.y}")
-                    self.remove_entity(entity)
+        for entity in self.get_entities_of_type("players"):
+            print(f"remove player: {entity.x}, {entity.y}")
+            self.remove_entity(entity)
 
     def remove_stairs(self):
         # 既存の階段を探して削除する
-        for pos, entities in list(self.entity_positions.items()):
-            for entity in list(entities):
-                if isinstance(entity, Stairs):
-                    self.remove_entity(entity)
+        for entity in self.get_entities_of_type("stairs"):
+            self.remove_entity(entity)
 
     def get_item_at_position(self, x, y):
         item = None
@@ -300,6 +465,10 @@ class Game:
         else:
             lines = list(message)
         self.log_messages.extend(lines)
+        if self.headless:
+            return
+        import pygame
+
         self.drawer.draw_log_window(self.log_messages)
         pygame.display.flip()
 
@@ -395,6 +564,8 @@ class Game:
         self.in_selection_mode = False
 
     def wait_for_item_selection(self, items):
+        import pygame
+
         selected_key = None
         while True:
             for event in pygame.event.get():
@@ -420,7 +591,7 @@ class Game:
         player = self.get_player()
 
         if player.turn % const.RESPAWN_TURN == 0:
-            respawn = random.randint(const.RESPAWN_DICE_MIN, const.RESPAWN_DICE_MAX)
+            respawn = self.random.randint(const.RESPAWN_DICE_MIN, const.RESPAWN_DICE_MAX)
             if respawn == 0:
                 self.enemy_manager.create_enemies(self, player.status.level, 1)
 
@@ -440,14 +611,11 @@ class Game:
             # ターン数を更新
             player.status.turn_count += 1
             
-            # ターンの区切りを表示
-            separator = "=" * 40
-            self.logger.info(separator)
-            player.add_logger(separator)
-            self.logger.info(f"Turn {player.status.turn_count}")
-            player.add_logger(f"Turn {player.status.turn_count}")
-            self.logger.info(separator)
-            player.add_logger(separator)
+            # ターンの区切りを表示（文字列にするのはメッセージを表示するときだけ）
+            self.logger.set_turn(player.status.turn_count)
+            self.logger.post(MessageType.SEPARATOR)
+            self.logger.post(MessageType.TURN)
+            self.logger.post(MessageType.SEPARATOR)
         self.respawn_enemy()
 
     def mark_initial_visibility(self):
@@ -457,12 +625,10 @@ class Game:
             # プレイヤーの周囲を探索済みにする
             for dy in range(-1, 2):
                 for dx in range(-1, 2):
-                    nx, ny = player.x + dx, player.y + dy
-                    if 0 <= nx < self.game_map.width and 0 <= ny < self.game_map.height:
-                        self.game_map.explored[ny][nx] = True
+                    self.game_map.mark_explored(player.x + dx, player.y + dy)
             
             # プレイヤーがいる部屋全体を探索済みにする
-            room_id = self.game_map.room_info[player.y][player.x]
+            room_id = self.game_map.get_room_id(player.x, player.y)
             if room_id is not None:
                 self.explored_rooms.add(room_id)
                 self.game_map.mark_room_explored_by_id(room_id)
@@ -474,7 +640,22 @@ class Game:
         if player is None:
             print("Error: No player found in enter_new_dungeon")
             return
-        
+
+        if not self.headless:
+            dark_surface = self.fade_out_floor(player)
+
+        self.generate_next_floor(player, enemy_manager)
+
+        if not self.headless:
+            self.fade_in_floor(player, dark_surface)
+
+        # ログに階層移動のメッセージを追加
+        self.renew_logger_window(f"Descended to Floor {player.status.level}...")
+
+    def fade_out_floor(self, player):
+        """階層移動時に画面を暗転させ、移動先の階層を表示する"""
+        import pygame
+
         # フェードアウト効果
         screen = pygame.display.get_surface()
         dark_surface = pygame.Surface(screen.get_size())
@@ -498,44 +679,61 @@ class Game:
         screen.blit(floor_text, text_rect)
         pygame.display.flip()
         pygame.time.wait(1000)  # 1秒間表示
-        
-        # エンティティの位置情報を初期化（プレイヤーを除く）
-        old_player_pos = None
-        if player:
-            old_player_pos = (player.x, player.y)
-        
-        self.entity_positions = {}
-        
-        # プレイヤーを再配置
-        if old_player_pos:
-            self.add_entity(player)
-        
-        # 新しいダンジョンを生成
-        self.game_map.init_explored()
+        return dark_surface
+
+    def get_seed(self):
+        """階層の生成に使うシード"""
+        if self.seed is None:
+            self.seed = self.random.getrandbits(64)
+        return self.seed
+
+    def request_next_floor(self, enemy_manager):
+        """今の階層にいる間に、次の階層の生成をワーカースレッドに依頼する"""
+        player = self.get_player()
+        if player is None:
+            return
+        self.floor_pregenerator.request(
+            self.get_seed(), player.status.level + 1, enemy_manager, player, self.game_map.compact, self.potion_manager
+        )
+
+    def generate_next_floor(self, player, enemy_manager):
+        """次の階層のマップとエンティティに切り替える
+
+        次の階層はシードと階層番号だけで決まり、前もって生成済みならそれを使う（なければここで生成する）。
+        """
+        level = player.status.level + 1
+        plan = self.floor_pregenerator.take(
+            self.get_seed(), level, enemy_manager, player, self.game_map.compact, self.potion_manager
+        )
+
+        # エンティティの位置情報を初期化し、新しいダンジョンに切り替える
+        self.clear_entities()
+        self.game_map.load_floor(plan.game_map)
         self.explored_rooms.clear()  # 探索済み部屋のリストもクリア
-        
-        # プレイヤーを新しい位置に配置
-        self.teleport_entity(player)
-        player.status.level += 1
-        
-        # 他のエンティティを生成
-        enemy_manager.create_enemies(self, player.status.level, const.INITIAL_SPAWN_ENEMY_NUM)
-        
-        # 階段、アイテム、ゴールドを配置
-        stair = Stairs()
-        self.teleport_entity(stair)
-        self.add_entity(stair)
-        self.place_gold_in_dungeon(player.status.level)
-        self.place_items_in_dungeon(player.status.level)
-        
+
+        # プレイヤーを新しい位置に配置し、敵・階段・ゴールド・アイテムを追加
+        player.x, player.y = plan.player_start
+        self.add_entity(player)
+        player.status.level = level
+        for entity in plan.entities:
+            self.add_entity(entity)
+
         # プレイヤーの初期位置周辺と部屋を探索済みにする
         self.mark_initial_visibility()
-        
+
+        # この階層にいる間に次の階層を用意しておく
+        self.request_next_floor(enemy_manager)
+
+    def fade_in_floor(self, player, dark_surface):
+        """新しい階層の画面を徐々に明るくする"""
+        import pygame
+
+        screen = pygame.display.get_surface()
         # フェードイン効果
         for alpha in range(255, 0, -5):
             # ゲーム画面を描画
             self.drawer.draw_game_map()
-            self.drawer.draw_entity(self.entity_positions.values())
+            self.drawer.draw_entity()
             self.drawer.draw_status_window(player.status)
             self.drawer.draw_inventory_window(player)
             self.drawer.draw_log_window(self.log_messages)
@@ -545,11 +743,10 @@ class Game:
             screen.blit(dark_surface, (0, 0))
             pygame.display.flip()
             pygame.time.wait(20)
-        
-        # ログに階層移動のメッセージを追加
-        self.renew_logger_window(f"Descended to Floor {player.status.level}...")
 
     def draw_help(self):
+        import pygame
+
         keymap = self.input_handler.keymap
         self.drawer.draw_help_window(keymap)
         pygame.display.flip()
@@ -578,19 +775,16 @@ class Game:
         player = self.get_player()
         if not player or not getattr(player, "enemy_search_active", False):
             return
-        from enemy import Enemy
-        for pos, entities in self.entity_positions.items():
-            for entity in entities:
-                if entity.__class__.__name__ == "Enemy":
-                    x, y = entity.x, entity.y
-                    if not self.game_map.explored[y][x]:
-                        self.game_map.explored[y][x] = True
-                        self.temp_enemy_explored.add((x, y))
+        for entity in self.entity_buckets["enemies"]:
+            x, y = entity.x, entity.y
+            if not self.game_map.explored[y][x]:
+                self.game_map.set_explored(x, y)
+                self.temp_enemy_explored.add((x, y))
 
     def unmark_enemy_positions_explored(self):
         """一時的に探索済みにしたマスを元に戻す"""
         for x, y in self.temp_enemy_explored:
-            self.game_map.explored[y][x] = False
+            self.game_map.set_explored(x, y, False)
         self.temp_enemy_explored.clear()
 
     def handle_drop_item(self, character):
@@ -624,12 +818,12 @@ class Game:
         player_data = {
             "x": player.x,
             "y": player.y,
-            "status": player.status.__dict__,  # Statusがシンプルな属性のみならOK
-            "inventory": [item.__dict__ for item in player.inventory.items],
-            "equipped_weapon": player.equipped_weapon.__dict__ if player.equipped_weapon else None,
-            "equipped_armor": player.equipped_armor.__dict__ if player.equipped_armor else None,
-            "equipped_left_ring": player.equipped_left_ring.__dict__ if player.equipped_left_ring else None,
-            "equipped_right_ring": player.equipped_right_ring.__dict__ if player.equipped_right_ring else None,
+            "status": player.status.get_state(),  # Statusがシンプルな属性のみならOK
+            "inventory": [item.get_state() for item in player.inventory.items],
+            "equipped_weapon": player.equipped_weapon.get_state() if player.equipped_weapon else None,
+            "equipped_armor": player.equipped_armor.get_state() if player.equipped_armor else None,
+            "equipped_left_ring": player.equipped_left_ring.get_state() if player.equipped_left_ring else None,
+            "equipped_right_ring": player.equipped_right_ring.get_state() if player.equipped_right_ring else None,
             "turn": player.turn,
             # 必要に応じて他の属性も
         }
@@ -650,7 +844,7 @@ class Game:
                     "class": entity.__class__.__name__,
                     "x": entity.x,
                     "y": entity.y,
-                    "data": entity.__dict__,  # 必要に応じてフィルタ
+                    "data": entity.get_state(),  # 必要に応じてフィルタ
                 })
 
         save_data = {
@@ -669,9 +863,11 @@ class Game:
 
     def set_save_data(self, data):
         map_data = data["game_map"]
-        game_map = GameMap()
+        game_map = GameMap(self.random)
         game_map.tiles = map_data["tiles"]
         game_map.room_info = map_data["room_info"]
+        game_map.build_walkable()
+        game_map.build_room_index()
 
         # exploredの型・サイズを保証
         loaded_explored = map_data["explored"]
@@ -687,6 +883,7 @@ class Game:
         self.player_position = data.get("player_position", self.player_position)
         self.entity_positions = data.get("entity_positions", self.entity_positions)
         self.explored_rooms = set(data.get("explored_rooms", []))
+        self.rebuild_entity_index()  # 敵を眠らせるかは探索済みの部屋で決めるので、その後に作り直す
 
         print(len(game_map.explored), len(game_map.explored[0]))
         print(game_map.width, game_map.height)
@@ -705,35 +902,56 @@ class Game:
     def __getstate__(self):
         state = self.__dict__.copy()
         # pickleできない属性を除外
-        for key in ["drawer", "logger", "input_handler", "enemy_manager"]:
+        for key in ["drawer", "logger", "input_handler", "enemy_manager", "floor_pregenerator"]:
             if key in state:
                 del state[key]
+        # randomモジュールはpickleできないので、共通の乱数を使っている場合は保存しない
+        if state.get("random") is random:
+            del state["random"]
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
         # 除外した属性はロード後に再セット（main.pyで）
+        # バケットを持たない古いセーブデータはentity_positionsから索引を作り直す
+        if "entity_buckets" not in state:
+            self.rebuild_entity_index()
+        # ターンスケジューラを持たない古いセーブデータは、今いる敵を登録し直す
+        if "scheduler" not in self.__dict__:
+            self.scheduler = TurnScheduler()
+            for enemy in self.entity_buckets["enemies"]:
+                self.schedule_enemy(enemy)
+        self.__dict__.setdefault("headless", False)
+        self.__dict__.setdefault("random", random)
+        self.__dict__.setdefault("kills", 0)
+        self.__dict__.setdefault("killed_by", None)
+        self.__dict__.setdefault("game_over", False)
+        self.__dict__.setdefault("seed", None)
+        # 空きマスの配列を持たない古いセーブデータは get_free_cells() で作り直す
+        self.__dict__.setdefault("free_cells", [])
+        self.__dict__.setdefault("free_cell_index", {})
+        self.__dict__.setdefault("free_cells_map", None)
+        self.__dict__.setdefault("free_cells_version", None)
+        self.__dict__.setdefault("free_cells_dirty", set())
+        self.floor_pregenerator = FloorPregenerator()
 
     def explore_around_stairs(self):
-        from stair import Stairs
-        # 全エンティティから階段を探す
-        for pos, entities in self.entity_positions.items():
-            for entity in entities:
-                if isinstance(entity, Stairs):
-                    x, y = entity.x, entity.y
-                    # 階段の周囲1マスを探索済みに
-                    for dx in [-1, 0, 1]:
-                        for dy in [-1, 0, 1]:
-                            nx, ny = x + dx, y + dy
-                            if 0 <= nx < self.game_map.width and 0 <= ny < self.game_map.height:
-                                self.game_map.explored[ny][nx] = True
-                    return  # 複数階段があっても最初の1つだけでOK
+        # 階段のバケットから最初の1つを取得
+        for entity in self.entity_buckets["stairs"]:
+            x, y = entity.x, entity.y
+            # 階段の周囲1マスを探索済みに
+            for dx in [-1, 0, 1]:
+                for dy in [-1, 0, 1]:
+                    self.game_map.mark_explored(x + dx, y + dy)
+            return  # 複数階段があっても最初の1つだけでOK
 
     def get_entity_at(self, x, y):
         # その座標にいるエンティティを返す
         return [e for e in self.entity_positions.get((x, y), []) if e.x == x and e.y == y]
 
     def handle_console_event(self, event, player):
+        import pygame
+
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:
                 self.handle_console_command(self.console_input, player)
@@ -757,7 +975,7 @@ class Game:
         if tokens[0] == "add_item" and len(tokens) > 1:
             from item_manager import ItemManager
             item_id = tokens[1]
-            item = ItemManager().create_item_by_id(item_id)
+            item = ItemManager(rng=self.random).create_item_by_id(item_id)
             if item:
                 player.inventory.append(item)
                 self.renew_logger_window(f"{item.name} をインベントリに追加しました")
@@ -770,6 +988,8 @@ class Game:
         # 必要に応じて他のコマンドも追加
 
     def draw_console_input(self, screen):
+        import pygame
+
         font = pygame.font.SysFont(None, 24)
         input_surface = font.render(":" + self.console_input, True, (255, 255, 255), (0, 0, 0))
         screen.blit(input_surface, (10, const.WINDOW_SIZE_H - 30))
@@ -782,7 +1002,7 @@ class Game:
         initializer.reset_player_status(old_player)
 
         # エンティティの位置情報を初期化
-        self.entity_positions = {}
+        self.clear_entities()
         
         # プレイヤーを新しい位置に配置して追加
         self.teleport_entity(old_player)
@@ -790,7 +1010,11 @@ class Game:
 
         # レベルを0に設定（enter_new_dungeonで1になる）
         old_player.status.level = 0
-        
+
+        # 死ぬ前に依頼した階層は捨て、新しいシードで別のダンジョンを生成する
+        self.floor_pregenerator.discard()
+        self.seed = None
+
         # 新しいダンジョンに入る（この中でマップの初期化も行われる）
         self.enter_new_dungeon(self.enemy_manager)
         self.identify_all_items()
@@ -807,6 +1031,8 @@ class Game:
             attacker.attack(target, self)
 
     def handle_potion_selection(self, character):
+        import pygame
+
         potion_items = character.get_inventory_with_key(Potion)
         if not potion_items:
             self.renew_logger_window("There is no potion.")
@@ -854,6 +1080,8 @@ class Game:
 
     def wait_for_direction(self):
         """方向入力を待つ"""
+        import pygame
+
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.KEYDOWN:
@@ -930,7 +1158,7 @@ class Game:
                 if isinstance(enemy, Character) and not enemy.is_player:
                     # 敵に当たった場合、ダメージを与える
                     damage = 1  # 基本ダメージ
-                    if hasattr(item, 'throw_dice'):
+                    if hasattr(item, 'throw_roll'):
                         damage = self.calculate_throw_damage(item)
                     enemy.take_damage(damage)
                     self.renew_logger_window(f"{character.status.name} threw {item.display_name} at {enemy.status.name} for {damage} damage!")
@@ -950,23 +1178,11 @@ class Game:
 
     def calculate_throw_damage(self, item):
         """投げたアイテムのダメージを計算"""
-        if not hasattr(item, 'throw_dice'):
+        if not hasattr(item, 'throw_roll'):
             return 1  # デフォルトのダメージ
 
-        dice_str = item.throw_dice
-        if not dice_str:
-            return 1
-
-        # ダイスロールの結果を計算
-        total_damage = 0
-        for part in dice_str.split('+'):
-            if 'd' in part:
-                num_dice, num_sides = map(int, part.split('d'))
-                total_damage += sum(random.randint(1, num_sides) for _ in range(num_dice))
-            else:
-                total_damage += int(part)
-
-        return max(1, total_damage)  # 最低1のダメージを保証
+        # ダイス式はアイテムの種類を読み込んだときに解析済み
+        return max(1, item.throw_roll.roll(self.random))  # 最低1のダメージを保証
 
     def get_potion_manager(self):
         """PotionManagerのインスタンスを返す"""
@@ -1,4 +1,3 @@
-import yaml
 from player import Player
 from status import Status
 from stair import Stairs
@@ -13,10 +12,8 @@ class GameInitializer:
         self.assets_manager = AssetsManager()
 
     def new_player(self):
-        yaml_file = self.assets_manager.get_chara_path("player.yaml")
-        with open(yaml_file, "r", encoding="utf-8") as file:
-            data = yaml.safe_load(file)
-        
+        data = self.assets_manager.get_chara_data("player.yaml")
+
         # ステータスの設定
         player_status = Status(data)
         player = Player(0, 0, player_status, self.logger)
@@ -24,7 +21,7 @@ class GameInitializer:
         # 初期装備の設定
         if "initial_equipment" in data:
             from item_manager import ItemManager
-            item_manager = ItemManager()
+            item_manager = ItemManager(rng=self.game.random)
             
             # 武器
             if "weapon" in data["initial_equipment"]:
@@ -3,9 +3,13 @@ import random
 
 
 class Gold(Entity):
+    __slots__ = ("amount",)
+    char = "*"
+    color = "darkgoldenrod2"
+
     def __init__(self, x=0, y=0, amount=0):
-        super().__init__(x, y, "*", "darkgoldenrod2")
+        super().__init__(x, y)
         self.amount = amount
 
-    def determine_gold_amount(self, current_level):
-        self.amount = random.randint(0, 50 + 10 * current_level) + random.randint(1, 3)
+    def determine_gold_amount(self, current_level, rng=random):
+        self.amount = rng.randint(0, 50 + 10 * current_level) + rng.randint(1, 3)
@@ -2,9 +2,25 @@ import pygame
 import constants as const
 from enemy import Enemy
 import time
-from keymap_loader import load_keymap, get_action_for_key
+from keymap_loader import compile_keymap
 from assets_manager import AssetsManager
 
+# 移動キー -> (押し続けたときの繰り返しを管理するキー, dx, dy)
+MOVE_KEYS = {
+    pygame.K_LEFT: (pygame.K_LEFT, -1, 0),
+    pygame.K_KP4: (pygame.K_LEFT, -1, 0),
+    pygame.K_RIGHT: (pygame.K_RIGHT, 1, 0),
+    pygame.K_KP6: (pygame.K_RIGHT, 1, 0),
+    pygame.K_UP: (pygame.K_UP, 0, -1),
+    pygame.K_KP8: (pygame.K_UP, 0, -1),
+    pygame.K_DOWN: (pygame.K_DOWN, 0, 1),
+    pygame.K_KP2: (pygame.K_DOWN, 0, 1),
+    pygame.K_KP7: (pygame.K_KP7, -1, -1),
+    pygame.K_KP9: (pygame.K_KP9, 1, -1),
+    pygame.K_KP1: (pygame.K_KP1, -1, 1),
+    pygame.K_KP3: (pygame.K_KP3, 1, 1),
+}
+
 
 class InputHandler:
     def __init__(self, movement_speed, game, game_map):
@@ -16,26 +32,45 @@ class InputHandler:
         self.last_key_time = {}
         self.key_repeat_interval = 0.1
         self.action = None
+        self.keys_held = False  # 移動キーやアクションのキーが押し続けられているか（メインループが待たずに次の入力を調べる）
 
         self.assets_manager = AssetsManager()
-        directory = self.assets_manager.get_config_path()
-        config_path = directory / "config.yaml"
-        self.keymap = load_keymap(config_path)
+        # キー設定は起動時に1回だけ (キーコード, 修飾キー) -> アクション の表にまとめる
+        self.keymap = compile_keymap(self.assets_manager.get_config_data("config.yaml")["keymap"])
+
+    def handle_keys(self, player_pos, events=None):
+        """押されたキー（events）と押し続けているキーから、プレイヤーのアクションを self.action に決める
 
-    def handle_keys(self, player_pos):
+        events はメインループが受け取ったイベントの列（省略時はここでイベントキューから取り出す）。
+        """
         if self.game.in_selection_mode:
             return
         current_time = time.time()
         keys = pygame.key.get_pressed()
         mods = pygame.key.get_mods()
         self.dx, self.dy = 0, 0
+        if events is None:
+            events = pygame.event.get()
 
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                action = get_action_for_key(event.key, mods, self.keymap)
-                if action:
-                    self.action = (action, player_pos[0], player_pos[1])
-                    return
+        # 押されたキーはキー設定の表と移動キーの表を引くだけで決める
+        # （押してすぐ離したキーも、押し続けているキーの状態に関係なく拾える）
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            action = self.keymap.get_action(event.key, event.mod)
+            if action:
+                self.last_key_time[action] = current_time
+                self.keys_held = True
+                self.action = (action, player_pos[0], player_pos[1])
+                return
+            move = MOVE_KEYS.get(event.key)
+            if move is not None:
+                repeat_key, dx, dy = move
+                self.last_key_time[repeat_key] = current_time
+                self.keys_held = True
+                self.dx, self.dy = dx * self.movement_speed, dy * self.movement_speed
+                self.determine_action(player_pos, player_pos[0] + self.dx, player_pos[1] + self.dy)
+                return
 
         # 水平方向の移動
         if keys[pygame.K_LEFT] or keys[pygame.K_KP4]:
@@ -63,39 +98,13 @@ class InputHandler:
         if keys[pygame.K_KP3] and self.is_time_for_repeat(pygame.K_KP3, current_time):
             self.dx, self.dy = self.movement_speed, self.movement_speed
 
-        # actions
-        if keys[pygame.K_PERIOD] or keys[pygame.K_LESS] or keys[pygame.K_KP_PERIOD]:
-            self.action = ("descend_stairs", player_pos[0], player_pos[1])
-        elif keys[pygame.K_KP5]:
-            self.action = ("rest", player_pos[0], player_pos[1])
-        elif keys[pygame.K_e]:
-            self.action = ("eat_food", player_pos[0], player_pos[1])
-        elif mods & pygame.KMOD_SHIFT and keys[pygame.K_w]:
-            self.action = ("wear_armor", player_pos[0], player_pos[1])
-        elif keys[pygame.K_w]:
-            self.action = ("wield_a_weapon", player_pos[0], player_pos[1])
-        elif mods & pygame.KMOD_SHIFT and keys[pygame.K_p]:
-            self.action = ("put_on_a_ring", player_pos[0], player_pos[1])
-        elif keys[pygame.K_d]:
-            self.action = ("drop_item", player_pos[0], player_pos[1])
-        elif mods & pygame.KMOD_SHIFT and keys[pygame.K_2]:
-            self.action = ("debug_mode", player_pos[0], player_pos[1])
-        elif keys[pygame.K_F12]:
-            self.action = ("console_mode", player_pos[0], player_pos[1])
-        elif mods & pygame.KMOD_SHIFT and keys[pygame.K_h]:
-            self.action = ("draw_help", player_pos[0], player_pos[1])
-        elif keys[pygame.K_i]:
-            self.action = ("inspect_item", player_pos[0], player_pos[1])
-        elif keys[pygame.K_F1]:
-            self.action = ("save_game", player_pos[0], player_pos[1])
-        elif keys[pygame.K_F2]:
-            self.action = ("load_game", player_pos[0], player_pos[1])
-        elif keys[pygame.K_COMMA] and mods & pygame.KMOD_SHIFT:
-            self.action = ("descend_stairs", player_pos[0], player_pos[1])
-        elif keys[pygame.K_q]:  # 'q'キーでポーションを使用
-            self.action = ("quaff_potion", *player_pos)
-        elif keys[pygame.K_t]:  # 't'キーでアイテムを投げる
-            self.action = ("throw_item", *player_pos)
+        # actions（押し続けているキーも、キー設定をまとめた表から引く。移動と同じ間隔で繰り返す）
+        action = self.keymap.get_held_action(keys, mods)
+        self.keys_held = action is not None or any(keys[key] for key in MOVE_KEYS)
+        if action:
+            if not self.is_time_for_repeat(action, current_time):
+                action = "none"
+            self.action = (action, player_pos[0], player_pos[1])
         else:
             # 移動先の座標を計算
             new_x = player_pos[0] + self.dx
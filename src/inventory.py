@@ -1,7 +1,10 @@
+from flyweight import SlotsObject
 from item import Item
 
 
-class Inventory:
+class Inventory(SlotsObject):
+    __slots__ = ("items",)
+
     def __init__(self):
         self.items = []
 
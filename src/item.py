@@ -1,14 +1,22 @@
 from entity import Entity
+from flyweight import KindTemplate, TemplateField
 import os
-import yaml
 from copy import deepcopy
 
 
 class Item(Entity):
+    # 名前・文字・色などの種類ごとに変わらないデータは template（KindTemplate）に置き、同じ種類のアイテムで共有する
+    # インスタンスには鑑定状態などの変わる値だけを持つ
+    __slots__ = ("template", "display_name", "is_defined")
+
+    name = TemplateField()
+    char = TemplateField()
+    color = TemplateField()
+    undefined_name = TemplateField()
+
     def __init__(self, name, x=0, y=0, char="a", color="white", undefined_name="", display_name=""):
-        super().__init__(x, y, char, color)
-        self.name = name
-        self.undefined_name = undefined_name
+        super().__init__(x, y)
+        self.template = KindTemplate(name=name, char=char, color=color, undefined_name=undefined_name)
         self.display_name = display_name
         self.is_defined = False
 
@@ -35,12 +43,11 @@ class Item(Entity):
         display_name = data.get("display_name", "")
 
         item = cls(name, x, y, char, color, undefined_name, display_name)
-        # その他の属性もセット
-        for k, v in data.items():
-            if not hasattr(item, k):
-                setattr(item, k, v)
+        # その他の属性は種類ごとのデータ（item.template）にセット
+        fields = {k: v for k, v in data.items() if not hasattr(item, k)}
+        item.template = KindTemplate(**vars(item.template), **fields)
         return item
 
     def copy(self):
-        """アイテムのディープコピーを返す"""
-        return deepcopy(self)
+        """アイテムのディープコピーを返す（種類ごとのデータはコピーせずに共有する）"""
+        return deepcopy(self, {id(self.template): self.template})
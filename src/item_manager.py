@@ -1,5 +1,5 @@
+import random
 import uuid
-import yaml
 import glob
 import os
 from assets_manager import AssetsManager
@@ -12,8 +12,9 @@ from potion import PotionManager
 
 
 class ItemManager:
-    def __init__(self, base_path=None):
+    def __init__(self, base_path=None, rng=random):
         self.assets_manager = AssetsManager(base_path)
+        self.random = rng  # 食料やポーションの不確定名の生成に使う乱数
         # assets/data/item ディレクトリ
         self.item_dir = self.assets_manager.get_item_path("")
         self._items_cache = self.get_all_items_with_unique_id()
@@ -37,7 +38,7 @@ class ItemManager:
             items_with_id.append({"id": item_id, "item": armor})
 
         # ポーションの追加
-        pm = PotionManager()
+        pm = PotionManager(self.random)
         for potion in pm.potion_instance_list:
             item_id = str(uuid.uuid4())
             items_with_id.append({"id": item_id, "item": potion})
@@ -65,7 +66,7 @@ class ItemManager:
     def create_food(self) -> Food:
         """新しい食料アイテムを生成する"""
         from food import Food
-        return Food()  # 内部でランダムな食料が生成される
+        return Food(rng=self.random)  # 内部でランダムな食料が生成される
 
     def create_potion(self, potion_id):
         """指定されたIDのポーションを生成する"""
@@ -1,4 +1,3 @@
-import yaml
 import pygame
 
 # キー名→pygameキーコード変換辞書
@@ -20,27 +19,109 @@ KEY_NAME_TO_CODE = {
     "SHIFT+h": (pygame.K_h, pygame.KMOD_SHIFT),
     "F1": pygame.K_F1,
     "F2": pygame.K_F2,
+    "F12": pygame.K_F12,
+    "d": pygame.K_d,
+    "q": pygame.K_q,
+    "t": pygame.K_t,
+    "SHIFT+,": (pygame.K_COMMA, pygame.KMOD_SHIFT),
 }
 
+# キー設定で区別する修飾キー（左右どちらのキーでも同じ扱いにする）
+MODIFIER_MASKS = (pygame.KMOD_SHIFT, pygame.KMOD_CTRL, pygame.KMOD_ALT)
+
+
+def normalize_mods(mod):
+    """pygameの修飾キーの状態を、キー設定で区別する修飾キーだけのマスクにする"""
+    mask = 0
+    for modifier in MODIFIER_MASKS:
+        if mod & modifier:
+            mask |= modifier
+    return mask
+
+
+class CompiledKeymap:
+    """YAMLのキー設定を (キーコード, 修飾キーのマスク) -> アクション の表にまとめたもの
+
+    キー名の解決と検証は読み込み時に1回だけ行い、入力の処理はキーコードで辞書を1回引くだけにする。
+    修飾キーつきの割り当ては、その修飾キーがすべて押されていれば（ほかの修飾キーも押されていても）使う。
+    修飾キーの多い割り当てを先に調べ、当てはまるものがなければ修飾キーなしの割り当てを使う。
+    ヘルプウィンドウも同じ表から作るので、表示されるのは実際に使えるキーだけになる。
+    """
+
+    def __init__(self, keymap):
+        self.bindings = {}  # (キーコード, 修飾キーのマスク) -> アクション
+        self.keys_by_action = {}  # アクション -> 割り当てられたキー名（YAMLの順）
+        self.errors = []  # 読み込み時に見つかった問題（未定義のキー名・重複した割り当て）
+        for action, key_names in keymap.items():
+            names = self.keys_by_action.setdefault(action, [])
+            for name in key_names:
+                code = KEY_NAME_TO_CODE.get(name)
+                if code is None:
+                    self.errors.append(f"unknown key {name!r} for action {action!r}")
+                    continue
+                binding = code if isinstance(code, tuple) else (code, 0)
+                if binding in self.bindings:
+                    # 先に書かれたアクションを優先する（これまでの get_action_for_key と同じ）
+                    self.errors.append(
+                        f"key {name!r} for action {action!r} is already bound to {self.bindings[binding]!r}"
+                    )
+                    continue
+                self.bindings[binding] = action
+                names.append(name)
+        # キーコード -> [(修飾キーのマスク, アクション)]（修飾キーの多い順）
+        self.bindings_by_key = {}
+        for (key, modifiers), action in sorted(self.bindings.items(), key=lambda item: -bin(item[0][1]).count("1")):
+            self.bindings_by_key.setdefault(key, []).append((modifiers, action))
+
+    def match(self, key, mask):
+        """キー key と修飾キーのマスク mask に当てはまる割り当てのアクションを返す"""
+        for modifiers, action in self.bindings_by_key.get(key, ()):
+            if modifiers & mask == modifiers:
+                return action
+        return None
+
+    def get_action(self, key, mod=0):
+        """押されたキーのアクションを返す"""
+        return self.match(key, normalize_mods(mod))
+
+    def get_held_action(self, pressed, mod=0):
+        """pygame.key.get_pressed() の結果から、押し続けているキーのアクションを返す"""
+        mask = normalize_mods(mod)
+        for key in self.bindings_by_key:
+            if pressed[key]:
+                action = self.match(key, mask)
+                if action is not None:
+                    return action
+        return None
+
+    def items(self):
+        """(アクション, キー名のリスト) を返す（ヘルプウィンドウ用。使えるキーがないアクションは除く）"""
+        return [(action, names) for action, names in self.keys_by_action.items() if names]
+
+
+def compile_keymap(keymap, report=True):
+    """キー設定を CompiledKeymap にまとめる。report=True なら設定の問題を警告として表示する"""
+    compiled = CompiledKeymap(keymap)
+    if report:
+        for error in compiled.errors:
+            print(f"Warning: keymap: {error}")
+    return compiled
+
+
 def load_keymap(yaml_path):
+    import yaml  # ゲームはキー設定をコンテンツデータベースから受け取るので、この関数を使うときだけ読み込む
+
     with open(yaml_path, "r", encoding="utf-8") as f:
         config = yaml.safe_load(f)
     keymap = config["keymap"]
     return keymap
 
 def get_action_for_key(key, mod, keymap):
-    for action, keys in keymap.items():
-        for k in keys:
-            code = KEY_NAME_TO_CODE.get(k)
-            if code is None:
-                continue  # 未定義キーはスキップ
-            if isinstance(code, tuple):
-                if key == code[0] and mod & code[1]:
-                    return action
-            else:
-                if key == code:
-                    return action
-    return None
+    if not isinstance(keymap, CompiledKeymap):
+        keymap = compile_keymap(keymap, report=False)
+    return keymap.get_action(key, mod)
 
 def get_keys_for_action(action, keymap):
+    if isinstance(keymap, CompiledKeymap):
+        return keymap.keys_by_action.get(action, [])
     return keymap.get(action, [])
@@ -11,13 +11,13 @@ from game import Game
 from enemy import EnemyManager
 from enemy import Enemy
 from assets_manager import AssetsManager
+from content_db import get_content_database
+from message_bus import ConsoleSink, MessageBus
 from status import Status
 from fight import Fight
 from stair import Stairs
 from food import Food
 import random
-import logging
-import yaml
 import threading
 import time
 from game_initializer import GameInitializer
@@ -27,26 +27,12 @@ import pickle
 # TODO
 random.seed(42)
 
-# ロガーの設定
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-# ログメッセージを保持するリスト
-log_messages = []
-
-
-# ログメッセージをリストに追加するためのハンドラ
-class ListHandler(logging.Handler):
-    def emit(self, record):
-        log_messages.append(self.format(record))
-
-
-# ハンドラとフォーマットの設定
-handler = ListHandler()
-formatter = logging.Formatter("%(asctime)s - %(message)s")
-# formatter = logging.Formatter("%(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+# ゲーム内メッセージを受け取るメッセージバス。loggerとして各クラスに渡し、
+# メッセージウィンドウにはその直近の分（log_messages）を表示する
+logger = MessageBus()
+log_messages = logger
+if const.MESSAGE_CONSOLE_OUTPUT:
+    logger.add_sink(ConsoleSink())
 
 
 def initialize_game():
@@ -59,6 +45,8 @@ def initialize_game():
 
 
 def setup_game(screen):
+    # ゲームデータのYAMLを起動時にまとめて読み込んでおく（以降はテンプレートを共有する）
+    get_content_database().preload()
     game_map = GameMap()
     assets_manager = AssetsManager()
 
@@ -78,6 +66,7 @@ def setup_game(screen):
 
     game.place_gold_in_dungeon(player.status.level)
     game.place_items_in_dungeon(player.status.level)
+    game.request_next_floor(enemy_manager)
 
     print("Game側 game_map id:", id(game_map))
     print("Draw側 game_map id:", id(drawer.game_map))
@@ -85,9 +74,9 @@ def setup_game(screen):
     return game, drawer, input_handler, player, enemy_manager
 
 
-def update_game(game, input_handler, player, enemy_manager, drawer):
+def update_game(game, input_handler, player, enemy_manager, drawer, events=None):
     use_turn = False
-    input_handler.handle_keys([player.x, player.y])
+    input_handler.handle_keys([player.x, player.y], events)
 
     action, x, y = input_handler.action
     # print(f"{action=}")
@@ -107,9 +96,7 @@ def update_game(game, input_handler, player, enemy_manager, drawer):
         return True
 
     def do_attack():
-        enemies = [
-            entity for entities in game.entity_positions.values() for entity in entities if isinstance(entity, Enemy)
-        ]
+        enemies = game.get_enemies()
         fight = Fight(player, enemies, game, logger)
         target_entity = next(
             (entity for entity in game.entity_positions.get((x, y), []) if isinstance(entity, Enemy)), None
@@ -243,39 +230,75 @@ def update_game(game, input_handler, player, enemy_manager, drawer):
 
 
 def draw_game(screen, drawer, game, player):
-    # 常にgameから最新のプレイヤーインスタンスを取得
-    current_player = game.get_player()
-    
     # 描画前
     game.unmark_enemy_positions_explored()
     game.mark_enemy_positions_explored()
-    drawer.draw_game_map()
-    drawer.draw_entity(list(game.entity_positions.values()))
-    drawer.draw_log_window(log_messages)
-    drawer.draw_status_window(current_player.status)  # 最新のプレイヤーインスタンスを使用
-    drawer.draw_inventory_window(current_player)
-
-    pygame.display.flip()
+    # 変化したマスとウィンドウだけを描き直して画面に反映する
+    drawer.render_frame(log_messages)
 
 
 def main():
     screen, clock = initialize_game()
     game, drawer, input_handler, player, enemy_manager = setup_game(screen)
 
+    run_loop = run_event_loop if const.EVENT_DRIVEN_MAIN_LOOP else run_polling_loop
+    run_loop(screen, clock, game, drawer, input_handler, enemy_manager)
+
+    logger.close()
+    pygame.quit()
+    sys.exit()
+
+
+def run_polling_loop(screen, clock, game, drawer, input_handler, enemy_manager):
+    """入力の有無に関係なく、毎フレーム入力を調べてターンを進め、描き直すループ"""
     running = True
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+        events = pygame.event.get()
+        if any(event.type == pygame.QUIT for event in events):
+            running = False
 
-        update_game(game, input_handler, game.get_player(), enemy_manager, drawer)  # playerではなくgame.get_player()を使用
-        draw_game(screen, drawer, game, game.get_player())  # playerではなくgame.get_player()を使用
+        # playerではなくgame.get_player()を使用
+        update_game(game, input_handler, game.get_player(), enemy_manager, drawer, events)
+        draw_game(screen, drawer, game, game.get_player())
 
         pygame.time.delay(const.PYGAME_ONE_TURN_WAIT_MS)
         clock.tick(const.PYGAME_FPS)
 
-    pygame.quit()
-    sys.exit()
+
+def wait_for_events(timeout_ms):
+    """イベントが来るか timeout_ms 経つまで眠って待ち、溜まっているイベントをまとめて返す"""
+    event = pygame.event.wait(timeout_ms)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+def is_animating(game, input_handler):
+    """入力がなくてもターンを進めて描き直す必要があるか（睡眠中の自動行動・押し続けているキーの繰り返し）"""
+    player = game.get_player()
+    return input_handler.keys_held or (player is not None and not player.can_act)
+
+
+def run_event_loop(screen, clock, game, drawer, input_handler, enemy_manager):
+    """入力が来るまで眠って待ち、入力があったときだけターンを進めて描き直すループ
+
+    何も動いていなければ pygame.event.wait で最長 IDLE_EVENT_TIMEOUT_MS 待つ。
+    睡眠中の自動行動や押し続けているキーがあるときは、PYGAME_ONE_TURN_WAIT_MS ごとに入力なしでも進める。
+    """
+    draw_game(screen, drawer, game, game.get_player())
+    while True:
+        animating = is_animating(game, input_handler)
+        events = wait_for_events(const.PYGAME_ONE_TURN_WAIT_MS if animating else const.IDLE_EVENT_TIMEOUT_MS)
+        if any(event.type == pygame.QUIT for event in events):
+            break
+        if any(event.type == pygame.WINDOWEXPOSED for event in events):
+            drawer.needs_full_redraw = True
+        elif not animating and not any(event.type in (pygame.KEYDOWN, pygame.KEYUP) for event in events):
+            continue  # マウスの移動などでは描き直さない
+
+        update_game(game, input_handler, game.get_player(), enemy_manager, drawer, events)
+        draw_game(screen, drawer, game, game.get_player())
+        clock.tick(const.PYGAME_FPS)  # キーの連打やイベントが続いてもフレームレートの上限は守る
 
 
 def save_all(filename="saveall.pkl"):
@@ -298,6 +321,7 @@ def load_all(filename="saveall.pkl"):
     global game, player, enemy_manager, input_handler, drawer, logger, log_messages
     with open(filename, "rb") as f:
         globals_dict = pickle.load(f)
+    logger.close()
     game = globals_dict["game"]
     player = globals_dict["player"]
     enemy_manager = globals_dict["enemy_manager"]
@@ -305,6 +329,9 @@ def load_all(filename="saveall.pkl"):
     drawer = globals_dict["drawer"]
     logger = globals_dict["logger"]
     log_messages = globals_dict["log_messages"]
+    # シンクはセーブデータに含まれないので付け直す
+    if const.MESSAGE_CONSOLE_OUTPUT:
+        logger.add_sink(ConsoleSink())
     # 必要なら再セット
     game.set_drawer(drawer)
     game.set_input_handler(input_handler)
@@ -1,43 +1,142 @@
 import constants as const
 import random
+from array import array
 from stair import Stairs
 from entity import Entity
+from map_storage import BitGrid, RoomGrid, TileGrid
+from numpy_loader import get_numpy
+
+
+WALKABLE_TILES = (".", "+", "#")
+
+# NumPyでの生成に使うタイルコード
+SPACE, FLOOR, PASSAGE, DOOR = (ord(tile) for tile in (" ", ".", "#", "+"))
+HORIZONTAL_WALL, VERTICAL_WALL = ord("-"), ord("|")
 
 
 class GameMap:
-    def __init__(self):
+    def __init__(self, rng=None, compact=None):
+        # ダンジョン生成に使う乱数（省略時はrandomモジュール共通の乱数）
+        self.random = rng if rng is not None else random
+        # Trueならtiles/explored/room_infoを1次元配列のコンパクトなグリッドで持つ（省略時は設定値に従う）
+        self.compact = const.COMPACT_MAP_STORAGE if compact is None else compact
         self.width = const.GAMEMAP_WIDTH
         self.height = const.GAMEMAP_HEIGHT
+        self.version = 0  # 地形が変わるたびに増やす（距離マップなどのキャッシュ無効化用）
         self.init_explored()
 
     def init_explored(self):
-        self.explored = [[False for _ in range(self.width)] for _ in range(self.height)]
-        self.room_info = [[None for _ in range(self.width)] for _ in range(self.height)]
-        self.tiles = self.generate_dungeon()
-
-    def generate_dungeon(self, num_rooms_range=(4, 12), room_size_range=(6, 12), max_attempts=30):
-        while True:
-            dungeon = [[" " for _ in range(self.width)] for _ in range(self.height)]
+        self.explored = self.new_explored_grid()
+        self.explored_changes = set()
+        if self.compact:
+            self.room_info = RoomGrid(self.width, self.height)
+        else:
+            self.room_info = [[None] * self.width for _ in range(self.height)]
+
+        if self.use_numpy_generator():
+            codes = self.generate_dungeon_array().tobytes()
+            if self.compact:
+                self.tiles = TileGrid.from_bytes(self.width, self.height, codes)
+            else:
+                text = codes.decode("ascii")
+                self.tiles = [list(text[y * self.width : (y + 1) * self.width]) for y in range(self.height)]
+        elif self.compact:
+            self.tiles = TileGrid.from_rows(self.generate_dungeon())
+        else:
+            self.tiles = self.generate_dungeon()
+        self.build_walkable()
+
+    def new_explored_grid(self):
+        """すべて未探索の探索済みフラグのグリッドを作る"""
+        if self.compact:
+            return BitGrid(self.width, self.height)
+        return [[False] * self.width for _ in range(self.height)]
+
+    def load_floor(self, other):
+        """別に生成したGameMapの地形と部屋の情報をこのマップに移す（探索済みフラグはリセットする）
+
+        描画などがこのGameMapへの参照を持ったままでも、新しい階層に切り替わる。
+        """
+        for name in ("width", "height", "compact", "tiles", "room_info", "rooms", "room_cells", "walkable"):
+            setattr(self, name, getattr(other, name))
+        self.explored = self.new_explored_grid()
+        self.explored_changes = set()
+        self.version = max(self.version, other.version) + 1
+
+    def use_numpy_generator(self):
+        """ダンジョン生成にNumPy版を使うか（const.DUNGEON_GENERATOR に従う）"""
+        backend = const.DUNGEON_GENERATOR
+        if backend not in ("auto", "numpy", "python"):
+            raise ValueError(f"DUNGEON_GENERATOR must be 'auto', 'numpy' or 'python', not {backend!r}")
+        if backend == "python":
+            return False
+        if backend == "numpy" and get_numpy() is None:
+            raise ImportError("DUNGEON_GENERATOR = 'numpy' requires numpy")
+        return get_numpy() is not None
+
+    def build_walkable(self):
+        """tilesから移動可能フラグのグリッド（y * width + x の1次元bytearray）を構築する"""
+        self.version = getattr(self, "version", 0) + 1
+        if isinstance(self.tiles, TileGrid):
+            codes = self.tiles.codes
+        else:
+            text = "".join("".join(row) for row in self.tiles)
+            codes = text.encode("ascii") if text.isascii() and len(text) == self.width * self.height else None
+        if codes is not None:
+            # タイルコード -> 移動可否の変換表で一括変換する
+            table = bytearray(256)
+            for tile in WALKABLE_TILES:
+                table[ord(tile)] = 1
+            self.walkable = bytearray(codes.translate(table))
+            return
+
+        self.walkable = bytearray(self.width * self.height)
+        for y, row in enumerate(self.tiles):
+            offset = y * self.width
+            for x, tile in enumerate(row):
+                if tile in WALKABLE_TILES:
+                    self.walkable[offset + x] = 1
+
+    def choose_room_layout(self, num_rooms_range=(4, 12), room_size_range=(6, 12), max_attempts=30, max_layouts=None):
+        """重ならない部屋の矩形を並べる。部屋数が範囲外なら並べ直す（グリッドには描かない）
+
+        並べ直しは max_layouts 回（省略時は const.DUNGEON_MAX_LAYOUT_ATTEMPTS）までで、
+        それでも部屋数が足りなければ、部屋が最も多かった配置を使う。
+        """
+        if max_layouts is None:
+            max_layouts = const.DUNGEON_MAX_LAYOUT_ATTEMPTS
+        best_rooms = []
+        for _ in range(max_layouts):
             rooms = []
-            room_id = 0
-
             for _ in range(max_attempts):
                 if len(rooms) >= num_rooms_range[1]:
                     break
 
-                w = random.randint(room_size_range[0], room_size_range[1])
-                h = random.randint(room_size_range[0], room_size_range[1])
-                x = random.randint(1, self.width - w - 1)
-                y = random.randint(1, self.height - h - 1)
+                w = self.random.randint(room_size_range[0], room_size_range[1])
+                h = self.random.randint(room_size_range[0], room_size_range[1])
+                x = self.random.randint(1, self.width - w - 1)
+                y = self.random.randint(1, self.height - h - 1)
 
                 new_room = {"x1": x, "y1": y, "x2": x + w, "y2": y + h}
 
                 if not any(self.rooms_overlap(new_room, existing_room) for existing_room in rooms):
-                    self.create_room(dungeon, new_room)
                     rooms.append(new_room)
 
             if num_rooms_range[0] <= len(rooms) <= num_rooms_range[1]:
-                break
+                return rooms
+            if len(rooms) > len(best_rooms):
+                best_rooms = rooms
+
+        if not best_rooms:
+            raise ValueError(f"could not place any room in a {self.width}x{self.height} map")
+        print(f"Warning: dungeon layout has only {len(best_rooms)} rooms after {max_layouts} attempts")
+        return best_rooms
+
+    def generate_dungeon(self, num_rooms_range=(4, 12), room_size_range=(6, 12), max_attempts=30):
+        rooms = self.choose_room_layout(num_rooms_range, room_size_range, max_attempts)
+        dungeon = [[" " for _ in range(self.width)] for _ in range(self.height)]
+        for room in rooms:
+            self.create_room(dungeon, room)
 
         # 通路の生成
         for i in range(1, len(rooms)):
@@ -54,14 +153,92 @@ class GameMap:
         # 通路と隣接していないドアを壁に戻す
         self.fix_isolated_doors(dungeon)
 
+        self.index_rooms(rooms)
+        return dungeon
+
+    def generate_dungeon_array(self, num_rooms_range=(4, 12), room_size_range=(6, 12), max_attempts=30):
+        """generate_dungeon() と同じ乱数の使い方・同じ結果で、タイルコードの2次元配列（uint8）を返す
+
+        部屋・通路はスライスへの代入で描き、孤立したドアは配列をずらした近傍マスクで探すので、
+        マップの面積に比例するPythonのループがない。
+        """
+        np = get_numpy()
+        rooms = self.choose_room_layout(num_rooms_range, room_size_range, max_attempts)
+        grid = np.full((self.height, self.width), SPACE, dtype=np.uint8)
+
         for room in rooms:
-            # 部屋のマスに部屋のIDを記録
-            for y in range(room["y1"], room["y2"]):
-                for x in range(room["x1"], room["x2"]):
-                    self.room_info[y][x] = room_id
-            room_id += 1
+            x1, y1, x2, y2 = room["x1"], room["y1"], room["x2"], room["y2"]
+            grid[y1 : y2 : y2 - y1 - 1, x1:x2] = HORIZONTAL_WALL
+            grid[y1 + 1 : y2 - 1, x1 : x2 : x2 - x1 - 1] = VERTICAL_WALL
 
-        return dungeon
+        # 通路の生成
+        for room1, room2 in zip(rooms, rooms[1:]):
+            center1 = ((room1["x1"] + room1["x2"]) // 2, (room1["y1"] + room1["y2"]) // 2)
+            center2 = ((room2["x1"] + room2["x2"]) // 2, (room2["y1"] + room2["y2"]) // 2)
+            grid[center1[1], min(center1[0], center2[0]) : max(center1[0], center2[0]) + 1] = PASSAGE
+            grid[min(center1[1], center2[1]) : max(center1[1], center2[1]) + 1, center2[0]] = PASSAGE
+
+        # 部屋の床を描き直し、壁を横切る通路をドアにする
+        for room in rooms:
+            x1, y1, x2, y2 = room["x1"], room["y1"], room["x2"], room["y2"]
+            grid[y1 + 1 : y2 - 1, x1 + 1 : x2 - 1] = FLOOR
+            for wall in (grid[y1, x1:x2], grid[y2 - 1, x1:x2], grid[y1:y2, x1], grid[y1:y2, x2 - 1]):
+                wall[wall == PASSAGE] = DOOR
+
+        # 通路と隣接していないドアを壁に戻す
+        doors = grid == DOOR
+        if doors.any():
+            passage = grid == PASSAGE
+            near_passage = np.zeros_like(passage)
+            near_passage[:, 1:] |= passage[:, :-1]
+            near_passage[:, :-1] |= passage[:, 1:]
+            near_passage[1:, :] |= passage[:-1, :]
+            near_passage[:-1, :] |= passage[1:, :]
+            isolated = doors & ~near_passage
+
+            # 左右が空白か通路なら縦の壁、それ以外は横の壁（determine_wall_type と同じ判定）
+            open_tiles = passage | (grid == SPACE)
+            vertical = np.zeros_like(passage)
+            vertical[:, 1:-1] = open_tiles[:, :-2] & open_tiles[:, 2:]
+            grid[isolated & vertical] = VERTICAL_WALL
+            grid[isolated & ~vertical] = HORIZONTAL_WALL
+
+        self.index_rooms(rooms)
+        return grid
+
+    def index_rooms(self, rooms):
+        """部屋の矩形と、部屋IDごとのマスの一覧を残し、room_infoに部屋IDを記録する
+
+        部屋の探索済み処理で全マスを走査しないため。
+        """
+        self.rooms = rooms
+        self.room_cells = []
+        for room_id, room in enumerate(rooms):
+            room["id"] = room_id
+            x1, x2 = room["x1"], room["x2"]
+            self.room_cells.append([(x, y) for y in range(room["y1"], room["y2"]) for x in range(x1, x2)])
+            # 部屋のマスに部屋のIDを記録（行ごとにスライスで代入する）
+            ids = [room_id] * (x2 - x1)
+            if isinstance(self.room_info, RoomGrid):
+                ids = array("h", ids)
+            for y in range(room["y1"], room["y2"]):
+                self.room_info[y][x1:x2] = ids
+
+    def build_room_index(self):
+        """room_infoから部屋の矩形とマスの一覧を作り直す（room_infoだけを持つセーブデータの読み込み用）"""
+        cells_by_id = {}
+        for y, row in enumerate(self.room_info):
+            for x, room_id in enumerate(row):
+                if room_id is not None and room_id != RoomGrid.NO_ROOM:
+                    cells_by_id.setdefault(room_id, []).append((x, y))
+
+        num_rooms = max(cells_by_id, default=-1) + 1
+        self.room_cells = [cells_by_id.get(room_id, []) for room_id in range(num_rooms)]
+        self.rooms = []
+        for room_id, cells in enumerate(self.room_cells):
+            xs = [x for x, _ in cells] or [0]
+            ys = [y for _, y in cells] or [0]
+            self.rooms.append({"x1": min(xs), "y1": min(ys), "x2": max(xs) + 1, "y2": max(ys) + 1, "id": room_id})
 
     def rooms_overlap(self, room1, room2):
         # 部屋が重なっているかどうかをチェック
@@ -123,7 +300,14 @@ class GameMap:
                 dungeon[y][x] = "."
 
     def set_tile(self, dungeon, x, y, tile: str = "."):
-        dungeon[y][x] = tile
+        if isinstance(dungeon, TileGrid):
+            dungeon.set(x, y, tile)  # 行が文字列なので添字への代入はできない
+        else:
+            dungeon[y][x] = tile
+        # 現在のマップを書き換えた場合は移動可能グリッドも更新する
+        if dungeon is getattr(self, "tiles", None):
+            self.walkable[y * self.width + x] = 1 if tile in WALKABLE_TILES else 0
+            self.version += 1
 
     def fix_isolated_doors(self, dungeon):
         width = len(dungeon[0])
@@ -157,17 +341,36 @@ class GameMap:
 
         return "#" in adjacent_tiles
 
+    def set_explored(self, x, y, value=True):
+        """探索済みフラグを設定する。変わったマスは explored_changes に記録する（描画はそのマスだけを描き直す）
+
+        explored を直接書き換えると描画に反映されないので、このメソッドか mark_explored を使うこと。
+        """
+        if self.explored[y][x] != value:
+            self.explored[y][x] = value
+            self.explored_changes.add((x, y))
+
+    def pop_explored_changes(self):
+        """前回呼んでから探索済みフラグが変わったマスの集合を返し、記録を空にする"""
+        changes = self.explored_changes
+        self.explored_changes = set()
+        return changes
+
     def mark_explored(self, x, y):
         # 指定されたマスを探索済みにする
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.explored[y][x] = True
+            self.set_explored(x, y)
 
     def mark_room_explored_by_id(self, room_id):
-        # 指定されたIDの部屋を探索済みとしてマーク
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.room_info[y][x] == room_id:
-                    self.mark_explored(x, y)
+        # 指定されたIDの部屋を探索済みとしてマーク（その部屋のマスだけを更新する）
+        if room_id is None or not 0 <= room_id < len(self.room_cells):
+            return
+        explored = self.explored
+        changes = self.explored_changes
+        for x, y in self.room_cells[room_id]:
+            if not explored[y][x]:
+                explored[y][x] = True
+                changes.add((x, y))
 
     def mark_adjacent_explored(self, x, y):
         # 隣接するマスを探索済みにする
@@ -183,28 +386,48 @@ class GameMap:
 
     def get_walkable_tiles(self):
         """return [(x,y),...]"""
-        walkable_tiles = []
-        for y, row in enumerate(self.tiles):
-            for x, tile in enumerate(row):
-                if tile in [".", "+", "#"]:
-                    walkable_tiles.append((x, y))
-        return walkable_tiles
+        width = self.width
+        return [(i % width, i // width) for i, walkable in enumerate(self.walkable) if walkable]
 
     def is_walkable(self, x, y):
         # 指定された座標がマップの範囲内かどうかを確認
-        if 0 <= x < len(self.tiles[0]) and 0 <= y < len(self.tiles):
-            # 指定された座標のタイルが移動可能かどうかを確認
-            return self.tiles[y][x] in [".", "+", "#"]
+        if 0 <= x < self.width and 0 <= y < self.height:
+            # 移動可能グリッドを参照する
+            return self.walkable[y * self.width + x] == 1
         return False
 
-    def get_room_of_cell(self, cell):
-        # すべての部屋を調べ、指定したセルがその部屋に含まれているかを確認
-        for room in self.rooms:
-            if cell in room.cells:
-                return room
+    def get_room_id(self, x, y):
+        """(x, y)が属する部屋のID（部屋の外ならNone）"""
+        # コンパクトなグリッドでは部屋の外が NO_ROOM（-1）で入っている
+        room_id = self.room_info[y][x]
+        return None if room_id == RoomGrid.NO_ROOM else room_id
 
-        # 指定したセルがどの部屋にも含まれていない場合はNoneを返す
-        return None
+    def get_room_of_cell(self, cell):
+        # 指定したセル(x, y)を含む部屋の矩形のdictを返す（どの部屋にも含まれていない場合はNone）
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        room_id = self.get_room_id(x, y)
+        if room_id is None:
+            return None
+        return self.rooms[room_id]
 
     def place_stair(self, stairs_x=0, stairs_y=0):
         self.stair = Stairs(stairs_x, stairs_y)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # randomモジュールはpickleできないので、共通の乱数を使っている場合は保存しない
+        if state.get("random") is random:
+            del state["random"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("random", random)
+        self.__dict__.setdefault("compact", False)
+        # 移動可能グリッドや部屋の一覧を持たない古いセーブデータはロード時に再構築する
+        if "walkable" not in state:
+            self.build_walkable()
+        if "room_cells" not in state:
+            self.build_room_index()
@@ -0,0 +1,146 @@
+"""GameMapのタイル・探索済みフラグ・部屋IDを1つの連続したバッファに詰めて持つコンパクトなグリッド
+
+どのグリッドも行のリスト（listのサブクラス）として振る舞うので、grid[y][x] の読み出し、
+len(grid)、行の反復はリストのリストを前提にした既存のコードからそのまま使える。
+各行はバッファへのビュー（タイルは文字列）なので、マス単位のアクセスはCレベルで完結する。
+"""
+
+from array import array
+
+# 0/1のバイト <-> "0"/"1"の文字の変換表
+_FLAG_TO_DIGIT = bytes.maketrans(b"\x00\x01", b"01")
+_DIGIT_TO_FLAG = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def pack_bits(flags):
+    """0/1のバイト列を1マス1ビットに詰める（先頭のマスが最下位ビット）"""
+    if not flags:
+        return b""
+    digits = bytes(flags).translate(_FLAG_TO_DIGIT)[::-1]
+    return int(digits, 2).to_bytes((len(flags) + 7) // 8, "little")
+
+
+def unpack_bits(packed, length):
+    """pack_bits() の逆変換"""
+    digits = format(int.from_bytes(packed, "little"), "b").zfill(length)[::-1]
+    return digits[:length].encode("ascii").translate(_DIGIT_TO_FLAG)
+
+
+class TileGrid(list):
+    """タイル文字を1マス1バイトで持つグリッド。各行は長さwidthの文字列
+
+    行は不変なので tiles[y][x] = tile による書き換えはできない。書き換えは set() を使う。
+    """
+
+    def __init__(self, width, height, fill=" "):
+        super().__init__([fill * width] * height)
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def from_rows(cls, rows):
+        grid = cls(len(rows[0]), len(rows))
+        grid[:] = ["".join(row) for row in rows]
+        for row in grid:
+            if len(row) != grid.width or not row.isascii():
+                raise ValueError("TileGrid rows must be ASCII strings of the same width")
+        return grid
+
+    @classmethod
+    def from_bytes(cls, width, height, codes):
+        grid = cls(width, height)
+        text = codes.decode("ascii")
+        grid[:] = [text[y * width : (y + 1) * width] for y in range(height)]
+        return grid
+
+    @property
+    def codes(self):
+        """全マスのタイルコード（y * width + x のバイト列）"""
+        return "".join(self).encode("ascii")
+
+    def get(self, x, y):
+        return self[y][x]
+
+    def set(self, x, y, tile):
+        if len(tile) != 1 or not tile.isascii():
+            raise ValueError(f"tile must be a single ASCII character: {tile!r}")
+        row = self[y]
+        self[y] = row[:x] + tile + row[x + 1 :]
+
+    def to_lists(self):
+        return [list(row) for row in self]
+
+    def __reduce__(self):
+        return TileGrid.from_bytes, (self.width, self.height, self.codes)
+
+
+class BufferGrid(list):
+    """1次元のバッファ（y * width + x）を持ち、各行をそのmemoryviewとして並べたグリッド"""
+
+    def __init__(self, width, height, buffer, view_format):
+        self.width = width
+        self.height = height
+        self.buffer = buffer
+        view = memoryview(buffer).cast("B").cast(view_format)
+        super().__init__(view[y * width : (y + 1) * width] for y in range(height))
+
+    def get(self, x, y):
+        return self[y][x]
+
+    def set(self, x, y, value):
+        self[y][x] = value
+
+    def to_lists(self):
+        return [row.tolist() for row in self]
+
+
+class BitGrid(BufferGrid):
+    """真偽値のグリッド。メモリ上は1マス1バイト、pickle（セーブデータ）では1マス1ビットに詰める
+
+    ビット単位のままだとPythonでの読み書きが1回ごとにシフトとマスクの計算になるため、
+    メモリ上ではmemoryviewで直接読み書きできる1バイト表現にしている。
+    """
+
+    def __init__(self, width, height):
+        super().__init__(width, height, bytearray(width * height), "?")
+
+    @classmethod
+    def from_packed(cls, width, height, packed):
+        grid = cls(width, height)
+        grid.buffer[:] = unpack_bits(packed, width * height)
+        return grid
+
+    def __reduce__(self):
+        return BitGrid.from_packed, (self.width, self.height, pack_bits(self.buffer))
+
+
+class RoomGrid(BufferGrid):
+    """部屋IDを1マス2バイト（int16）で持つグリッド。部屋の外は NO_ROOM（-1）
+
+    room_info[y][x] は部屋の外で -1 を返す。Noneで受け取りたい場合は get() を使う。
+    """
+
+    NO_ROOM = -1
+
+    def __init__(self, width, height):
+        super().__init__(width, height, array("h", [self.NO_ROOM]) * (width * height), "h")
+
+    @classmethod
+    def from_array(cls, width, height, room_ids):
+        grid = cls(width, height)
+        grid.buffer[:] = room_ids
+        return grid
+
+    def get(self, x, y):
+        room_id = self[y][x]
+        return None if room_id == self.NO_ROOM else room_id
+
+    def set(self, x, y, value):
+        self[y][x] = self.NO_ROOM if value is None else value
+
+    def to_lists(self):
+        no_room = self.NO_ROOM
+        return [[None if room_id == no_room else room_id for room_id in row] for row in self]
+
+    def __reduce__(self):
+        return RoomGrid.from_array, (self.width, self.height, self.buffer)
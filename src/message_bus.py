@@ -0,0 +1,219 @@
+"""ゲーム内メッセージ（戦闘・移動・効果など）を構造化したイベントとして受け取るメッセージバス
+
+メッセージは種類・行動した側・対象・数値・ターンをそのまま持ち、文字列にするのは
+表示（メッセージウィンドウ）やシンクが読むときだけにする。
+直近のメッセージは上限つきのリングバッファ（MessageLog）に残し、古いものから捨てる。
+コンソール・ファイルへの書き出し（シンク）は任意で、別スレッドで整形して書くので、
+ターンの処理は誰も読まない文字列の整形を待たない。
+"""
+
+import queue
+import sys
+import threading
+
+import constants as const
+from message_log import MessageLog
+
+# メッセージの重要度（数値はloggingのレベルと同じ）
+DEBUG = 10  # 戦闘の計算過程など、開発用の詳細
+INFO = 20  # 通常のゲーム内メッセージ
+WARNING = 30
+
+
+class MessageType:
+    """メッセージの種類"""
+
+    TEXT = "text"  # 文字列をそのまま表示するメッセージ
+    ATTACK = "attack"
+    MISS = "miss"
+    HIT = "hit"
+    KILL = "kill"
+    DEATH = "death"
+    TURN = "turn"
+    SEPARATOR = "separator"
+    SWING = "swing"
+    DAMAGE = "damage"
+    DEFENSE = "defense"
+
+
+# 種類ごとの表示用の書式（読むときに初めて整形する）
+TEMPLATES = {
+    MessageType.TEXT: "{text}",
+    MessageType.ATTACK: "{actor} attacks {target} for {amount} damage.",
+    MessageType.MISS: "{actor} missed {target}!",
+    MessageType.HIT: "{target} is hit!",
+    MessageType.KILL: "{target} is killed! Gained {amount} experience!",
+    MessageType.DEATH: "{target} is killed!",
+    MessageType.TURN: "Turn {turn}",
+    MessageType.SEPARATOR: "=" * 40,
+    MessageType.SWING: (
+        "atk: {actor}, def: {target}, weapon={detail[0]}, base_dmg={detail[1]}, "
+        "attacker_level={detail[2]}, def_armor={detail[3]}"
+    ),
+    MessageType.DAMAGE: "Damage calculation: {amount} = {detail[0]} (base) + {detail[1]} (defense) + {detail[2]} (status)",
+    MessageType.DEFENSE: "Equipment defense modifier: {amount} (armor + protection bonuses)",
+}
+
+
+class Message:
+    """1件のメッセージ。文字列は render() で初めて作り、以後はそれを返す"""
+
+    __slots__ = ("kind", "actor", "target", "amount", "turn", "level", "text", "detail", "rendered")
+
+    def __init__(self, kind, actor=None, target=None, amount=None, turn=None, level=INFO, text=None, detail=()):
+        self.kind = kind
+        self.actor = actor
+        self.target = target
+        self.amount = amount
+        self.turn = turn
+        self.level = level
+        self.text = text
+        self.detail = detail
+        self.rendered = None
+
+    def render(self):
+        if self.rendered is None:
+            self.rendered = TEMPLATES[self.kind].format(
+                actor=self.actor,
+                target=self.target,
+                amount=self.amount,
+                turn=self.turn,
+                text=self.text,
+                detail=self.detail,
+            )
+        return self.rendered
+
+    def __repr__(self):
+        return f"Message({self.kind!r}, turn={self.turn}, {self.render()!r})"
+
+
+class MessageSink:
+    """別スレッドでメッセージを受け取り、1行ずつ書き出すシンク"""
+
+    def __init__(self, level=INFO):
+        self.level = level
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name=type(self).__name__, daemon=True)
+        self.thread.start()
+
+    def put(self, message):
+        self.queue.put(message)
+
+    def run(self):
+        while True:
+            message = self.queue.get()
+            if message is None:
+                break
+            self.write(f"[Turn {message.turn}] {message.render()}")
+
+    def write(self, line):
+        raise NotImplementedError
+
+    def close(self):
+        """受け取り済みのメッセージをすべて書き出してから止める"""
+        self.queue.put(None)
+        self.thread.join()
+
+
+class ConsoleSink(MessageSink):
+    def write(self, line):
+        # batch_runnerなどがsys.stdoutを差し替えても、その時点の出力先に書く
+        print(line, file=sys.stdout)
+
+
+class FileSink(MessageSink):
+    def __init__(self, path, level=INFO):
+        self.file = open(path, "a", encoding="utf-8")
+        super().__init__(level)
+
+    def write(self, line):
+        self.file.write(line + "\n")
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+
+class MessageBus:
+    """ゲーム内メッセージの受け口
+
+    post() で構造化したメッセージを送る。loggingのLoggerと同じ info() / debug() / warning() も使えるので、
+    これまでloggerを渡していた箇所（Character・Fight・Game）にそのまま渡せる。
+    メッセージウィンドウには、表示する重要度（verbosity）以上のメッセージを文字列の並びとして見せる
+    （len() / 反復 / reversed() / [-1] / append / extend / clear が使える）。
+    """
+
+    def __init__(self, capacity=None, verbosity=None):
+        self.messages = MessageLog(capacity=capacity)
+        self.verbosity = const.MESSAGE_VERBOSITY if verbosity is None else verbosity
+        self.sinks = []
+        self.min_level = self.verbosity  # これより低い重要度のメッセージは誰も読まないので作らない
+        self.turn = 0
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self.min_level = min([self.verbosity] + [sink.level for sink in self.sinks])
+        return sink
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+        self.min_level = self.verbosity
+
+    def set_turn(self, turn):
+        self.turn = turn
+
+    def post(self, kind, actor=None, target=None, amount=None, level=INFO, text=None, detail=()):
+        if level < self.min_level:
+            return
+        message = Message(kind, actor, target, amount, self.turn, level, text, detail)
+        if level >= self.verbosity:
+            self.messages.append(message)
+        for sink in self.sinks:
+            if level >= sink.level:
+                sink.put(message)
+
+    def debug(self, text):
+        self.post(MessageType.TEXT, level=DEBUG, text=text)
+
+    def info(self, text):
+        self.post(MessageType.TEXT, level=INFO, text=text)
+
+    def warning(self, text):
+        self.post(MessageType.TEXT, level=WARNING, text=text)
+
+    # メッセージウィンドウ向けの、文字列のリストとしての振る舞い
+
+    @property
+    def total_count(self):
+        return self.messages.total_count
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return (message.render() for message in self.messages)
+
+    def __reversed__(self):
+        return (message.render() for message in reversed(self.messages))
+
+    def __getitem__(self, index):
+        return self.messages[index].render()
+
+    def append(self, text):
+        self.info(text)
+
+    def extend(self, texts):
+        for text in texts:
+            self.info(text)
+
+    def clear(self):
+        self.messages.clear()
+
+    def __getstate__(self):
+        # シンク（スレッドとファイル）はセーブデータに含めない
+        state = self.__dict__.copy()
+        state["sinks"] = []
+        state["min_level"] = self.verbosity
+        return state
@@ -0,0 +1,26 @@
+"""メッセージウィンドウに出すログを保持する、上限つきのリングバッファ"""
+
+from collections import deque
+
+import constants as const
+
+
+class MessageLog(deque):
+    """上限を超えると古いものから捨てるログ。listと同じく append / extend / clear / len() / [-1] が使える
+
+    total_count は追加されたメッセージの通算数。上限に達して len() が変わらなくなっても増え続けるので、
+    描画側はこれでログが更新されたかを判断する。
+    """
+
+    def __init__(self, messages=(), capacity=None):
+        super().__init__(messages, const.LOG_HISTORY_SIZE if capacity is None else capacity)
+        self.total_count = len(self)
+
+    def append(self, message):
+        super().append(message)
+        self.total_count += 1
+
+    def extend(self, messages):
+        messages = list(messages)
+        super().extend(messages)
+        self.total_count += len(messages)
@@ -0,0 +1,20 @@
+"""NumPyを任意の依存として読み込む
+
+NumPyがなくてもゲームは動く（ダンジョン生成はPythonのループ、ダイスは random.Random で振る）。
+importに時間がかかるので、このモジュールをimportしただけでは読み込まず、get_numpy を初めて呼んだときに読み込む。
+"""
+
+_numpy = None  # 読み込む前はNone、NumPyがなければFalse
+
+
+def get_numpy():
+    """NumPyを初めて必要になったときに読み込んで返す（なければNone）"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
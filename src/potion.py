@@ -1,10 +1,20 @@
 from item import Item
 from effect import StrengthEffect, RegenerationEffect, ProtectionEffect, FullRestorationEffect, InvisibilityEffect, PoisonEffect, SleepEffect
 import random
+from flyweight import KindTemplate, TemplateField, get_kind_template
 
 class Potion(Item):
+    # 不確定名はPotionManagerが決めるので、種類ごとのデータではなくポーションごとに持つ
+    __slots__ = ("undefined_name", "potion_manager")
+
+    type = TemplateField()
+    effect_type = TemplateField()
+    effect_duration = TemplateField()
+    flavor_text = TemplateField()
+
     def __init__(self, x=0, y=0, potion_data={}):
         super().__init__("Potion", x, y, char="!", color="white")
+        self.undefined_name = ""
         self.load_data(potion_data)
         self.potion_manager = None  # PotionManagerの参照を保持
 
@@ -13,17 +23,23 @@ class Potion(Item):
             print("Warning: Empty potion data loaded.", data)
             return
 
-        self.type = data.get("type", "Potion")
-        self.name = data.get("name", "Unknown potion")
-        self.char = data.get("char", "!")
-        self.color = data.get("color", "white")
+        self.template = get_kind_template(Potion.build_template, data)
         self.undefined_name = data.get("undefined_name", "Unknown potion")
-        self.effect_type = data.get("effect", None)
-        self.effect_duration = data.get("duration", 0)
-        self.flavor_text = data.get("flavor_text", "")
         self.display_name = self.undefined_name
         self.is_defined = False  # 初期状態は不確定
 
+    @staticmethod
+    def build_template(data):
+        return KindTemplate(
+            type=data.get("type", "Potion"),
+            name=data.get("name", "Unknown potion"),
+            char=data.get("char", "!"),
+            color=data.get("color", "white"),
+            effect_type=data.get("effect", None),
+            effect_duration=data.get("duration", 0),
+            flavor_text=data.get("flavor_text", ""),
+        )
+
     def use(self, character):
         """ポーションを使用する"""
         if self.effect_type == "strength":
@@ -88,7 +104,7 @@ from assets_manager import AssetsManager
 from typing import List
 
 class PotionManager:
-    def __init__(self):
+    def __init__(self, rng=random):
         self.undefined_names = [
             "Mysterious potion",
             "Strange potion",
@@ -103,9 +119,9 @@ class PotionManager:
         ]
         self.identified_potions = set()  # 鑑定済みのポーション名を保持
         self.potion_undefined_names = {}  # ポーションの種類ごとの不確定名称を保持
-        self.load_potion_data_from_directory()
+        self.load_potion_data_from_directory(rng)
 
-    def load_potion_data_from_directory(self) -> None:
+    def load_potion_data_from_directory(self, rng=random) -> None:
         assets_manager = AssetsManager()
         self.potion_data_list = assets_manager.get_item_data_list("potion")
         # ポーションの種類ごとに不確定名称を割り当て
@@ -118,7 +134,7 @@ class PotionManager:
                     # すべての名称が使用済みの場合は、最初からやり直す
                     used_names.clear()
                     available_names = self.undefined_names
-                selected_name = random.choice(available_names)
+                selected_name = rng.choice(available_names)
                 used_names.add(selected_name)
                 self.potion_undefined_names[potion_data["name"]] = selected_name
         self.potion_instance_list = self.get_potion_instance_list()
@@ -138,9 +154,9 @@ class PotionManager:
             potion_instance_list.append(potion_instance)
         return potion_instance_list
 
-    def get_random_potion(self) -> Potion:
+    def get_random_potion(self, rng=random) -> Potion:
         if self.potion_data_list:
-            data = random.choice(self.potion_data_list)
+            data = rng.choice(self.potion_data_list)
             potion = Potion(potion_data=data)
             potion.set_potion_manager(self)  # PotionManagerの参照を設定
             # ポーションの種類ごとに固定された不確定名称を割り当て
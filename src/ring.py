@@ -3,36 +3,76 @@ from assets_manager import AssetsManager
 import random
 from effect import *
 from typing import List
+from dice import DiceField, parse_dice
+from flyweight import KindTemplate, TemplateField, get_kind_template
 
 
 class Ring(Equipment):
+    # 効果は装備中の状態を持つことがあるので、種類ごとのデータではなく指輪ごとに作る（_effect）
+    __slots__ = ("_effect", "_equip_msg", "_curse_msg")
+
+    type = TemplateField()
+    armor = TemplateField()
+    throw_dice = TemplateField()
+    throw_roll = DiceField("throw_dice")  # 解析済みのダイス式
+    use_effect = TemplateField()
+    protection_bonus = TemplateField()
+    avoidance_bonus = TemplateField()
+    dmg_bonus = TemplateField()
+    hit_bonus = TemplateField()
+    flavor_text = TemplateField()
+    undefined_name_CONST = TemplateField()
+    effect_name = TemplateField()
+
     def __init__(self, x=0, y=0, ring_data={}, is_cursed=False, effect=None):
         super().__init__("Ring", x, y, char="=", color="white")
         self.is_defined = False
         self.load_data(ring_data)
 
     def load_data(self, data):
-        self.type = data.get("type", "Ring")
-        self.name = data.get("name", "Unknown Ring")
-        self.char = data.get("char", "=")
-        self.color = data.get("color", "white")
-        self.undefined_name = data.get("undefined_name", "Unknown Ring")
-        self.armor = data.get("armor", 0)
-        self.throw_dice = data.get("throw_dice", "0d0")
-        self.use_effect = data.get("use_effect", None)
-        self.protection_bonus = data.get("protection_bonus", 0)
-        self.avoidance_bonus = data.get("avoidance_bonus", 0)
-        self.dmg_bonus = data.get("dmg_bonus", 0)
-        self.hit_bonus = data.get("hit_bonus", 0)
-        self.flavor_text = data.get("flavor_text", "")
+        self.template = get_kind_template(Ring.build_template, data)
         self.display_name = self.undefined_name
-        self.undefined_name_CONST = self.undefined_name
 
-        self.effect_name = data.get("use_effect")
-        if self.effect_name in EFFECT_MAP:
-            self.effect = EFFECT_MAP[self.effect_name]()
-        else:
-            self.effect = None
+    @property
+    def effect(self):
+        """指輪の効果。床に落ちている指輪には持たせず、装備や投擲で初めて使うときに作る"""
+        try:
+            return self._effect
+        except AttributeError:
+            if self.effect_name in EFFECT_MAP:
+                self._effect = EFFECT_MAP[self.effect_name]()
+            else:
+                self._effect = None
+            return self._effect
+
+    def set_state(self, state):
+        state = dict(state)
+        if "effect" in state:  # 効果を遅れて作るようにする前のセーブデータ
+            state["_effect"] = state.pop("effect")
+        super().set_state(state)
+
+    @staticmethod
+    def build_template(data):
+        undefined_name = data.get("undefined_name", "Unknown Ring")
+        throw_dice = data.get("throw_dice", "0d0")
+        return KindTemplate(
+            type=data.get("type", "Ring"),
+            name=data.get("name", "Unknown Ring"),
+            char=data.get("char", "="),
+            color=data.get("color", "white"),
+            undefined_name=undefined_name,
+            armor=data.get("armor", 0),
+            throw_dice=throw_dice,
+            throw_roll=parse_dice(throw_dice),
+            use_effect=data.get("use_effect", None),
+            protection_bonus=data.get("protection_bonus", 0),
+            avoidance_bonus=data.get("avoidance_bonus", 0),
+            dmg_bonus=data.get("dmg_bonus", 0),
+            hit_bonus=data.get("hit_bonus", 0),
+            flavor_text=data.get("flavor_text", ""),
+            undefined_name_CONST=undefined_name,
+            effect_name=data.get("use_effect"),
+        )
 
     def attach_equip_info(self):
         # [E] を装備時のみ display_name の先頭に付与
@@ -107,9 +147,9 @@ class RingManager:
             ring_instance_list.append(ring_instance)
         return ring_instance_list
 
-    def get_random_ring(self) -> Ring:
+    def get_random_ring(self, rng=random) -> Ring:
         if self.ring_data_list:
-            data = random.choice(self.ring_data_list)
+            data = rng.choice(self.ring_data_list)
             return Ring(ring_data=data)
         else:
             print("error select ring.")
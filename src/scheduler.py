@@ -0,0 +1,141 @@
+"""敵の行動順を決めるターンスケジューラ
+
+敵ごとに「次に行動できる時刻」を持ち、時刻の早い順に取り出す優先度つきキュー（heapq）で管理する。
+時刻の単位はティックで、1ターンは const.TICKS_PER_TURN ティック。
+速さ（speed）が const.NORMAL_SPEED の敵は1ターンに1回、2倍なら2回、半分なら2ターンに1回行動する。
+
+まだ探索していない場所にいる敵は眠らせてキューに入れず、プレイヤーが近づいたときに起こす。
+眠っている敵は場所（部屋、または通路を区切った区画）ごとにまとめ、場所の矩形との距離で起こす。
+起こす範囲は粗いグリッドで索引しておき、毎ターン調べるのはプレイヤーのいるグリッドにかかる場所だけにする。
+1ターンの処理は起きている敵の数だけに比例し、フロア全体の敵の数には比例しない。
+"""
+
+import heapq
+
+import constants as const
+
+
+class TurnScheduler:
+    def __init__(self):
+        self.time = 0  # 次に処理するターンの開始時刻（ティック）
+        self.queue = []  # (次に行動する時刻, 登録番号, 敵) のヒープ
+        self.entries = {}  # 起きている敵 -> キューにある有効なエントリの登録番号
+        self.counter = 0
+        self.sleeping = {}  # 場所 -> そこで眠っている敵（挿入順を保つため、dictを順序付き集合として使う）
+        self.sleeping_areas = {}  # 眠っている敵 -> 場所
+        self.area_rects = {}  # 場所 -> 矩形 (x1, y1, x2, y2)（x2, y2は含まない）
+        self.wake_index = {}  # グリッド -> そこにプレイヤーが来たら起こす候補の場所
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, enemy):
+        return enemy in self.entries or enemy in self.sleeping_areas
+
+    def get_delay(self, enemy):
+        """1回行動してから次に行動するまでのティック数"""
+        speed = getattr(enemy, "speed", const.NORMAL_SPEED)
+        return max(1, const.TICKS_PER_TURN * const.NORMAL_SPEED // max(speed, 1))
+
+    def push(self, enemy, time):
+        self.counter += 1
+        self.entries[enemy] = self.counter
+        heapq.heappush(self.queue, (time, self.counter, enemy))
+
+    def add(self, enemy):
+        """起きている敵として登録し、次のターンから行動させる"""
+        if enemy in self.entries:
+            return
+        if enemy in self.sleeping_areas:
+            self.remove(enemy)
+        self.push(enemy, self.time)
+
+    def add_sleeping(self, enemy, area, rect):
+        """場所 area（矩形 rect）で眠っている敵として登録する（wake_area() / wake_near() で起きるまで行動しない）"""
+        if enemy in self:
+            return
+        if area not in self.sleeping:
+            self.sleeping[area] = {}
+            self.index_area(area, rect)
+        self.sleeping[area][enemy] = None
+        self.sleeping_areas[enemy] = area
+
+    def get_wake_cells(self, rect):
+        """矩形から MONSTER_WAKE_RADIUS マス以内にかかるグリッドの一覧"""
+        size = const.MONSTER_SLEEP_AREA_SIZE
+        radius = const.MONSTER_WAKE_RADIUS
+        x1, y1, x2, y2 = rect
+        return [
+            (cx, cy)
+            for cy in range((y1 - radius) // size, (y2 - 1 + radius) // size + 1)
+            for cx in range((x1 - radius) // size, (x2 - 1 + radius) // size + 1)
+        ]
+
+    def index_area(self, area, rect):
+        self.area_rects[area] = rect
+        for cell in self.get_wake_cells(rect):
+            self.wake_index.setdefault(cell, {})[area] = None
+
+    def forget_area(self, area):
+        """眠っている敵がいなくなった場所を索引から外す"""
+        del self.sleeping[area]
+        for cell in self.get_wake_cells(self.area_rects.pop(area)):
+            areas = self.wake_index[cell]
+            del areas[area]
+            if not areas:
+                del self.wake_index[cell]
+
+    def remove(self, enemy):
+        # キューのエントリは残しておき、取り出したときに無効なものとして読み飛ばす
+        self.entries.pop(enemy, None)
+        area = self.sleeping_areas.pop(enemy, None)
+        if area is not None:
+            sleepers = self.sleeping[area]
+            sleepers.pop(enemy, None)
+            if not sleepers:
+                self.forget_area(area)
+
+    def wake_area(self, area):
+        """場所で眠っている敵をすべて起こす"""
+        if area not in self.sleeping:
+            return
+        for enemy in self.sleeping[area]:
+            del self.sleeping_areas[enemy]
+            self.push(enemy, self.time)
+        self.forget_area(area)
+
+    def wake_near(self, x, y):
+        """(x, y) から MONSTER_WAKE_RADIUS マス以内（チェビシェフ距離）にある場所の敵を起こす"""
+        size = const.MONSTER_SLEEP_AREA_SIZE
+        areas = self.wake_index.get((x // size, y // size))
+        if not areas:
+            return
+        radius = const.MONSTER_WAKE_RADIUS
+        for area in list(areas):
+            x1, y1, x2, y2 = self.area_rects[area]
+            dx = max(x1 - x, 0, x - (x2 - 1))
+            dy = max(y1 - y, 0, y - (y2 - 1))
+            if max(dx, dy) <= radius:
+                self.wake_area(area)
+
+    def advance(self):
+        """1ターン進め、このターンに行動する敵を行動する順に返すジェネレータ
+
+        行動し終えた（次の敵を取り出すときに削除されていない）敵は、速さに応じた次の時刻に入れ直す。
+        ターンの途中で登録された敵は次のターンから行動する。
+        """
+        end = self.time + const.TICKS_PER_TURN
+        self.time = end
+        queue = self.queue
+        entries = self.entries
+        while queue and queue[0][0] < end:
+            time, number, enemy = heapq.heappop(queue)
+            if entries.get(enemy) != number:
+                continue  # 削除済み、または入れ直し済みのエントリ
+            yield enemy
+            if entries.get(enemy) == number:
+                self.push(enemy, time + self.get_delay(enemy))
+        # 削除済みのエントリが溜まりすぎたらヒープを作り直す
+        if len(queue) > 2 * len(entries) + 64:
+            self.queue = [entry for entry in queue if entries.get(entry[2]) == entry[1]]
+            heapq.heapify(self.queue)
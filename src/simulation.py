@@ -0,0 +1,230 @@
+import random
+import time
+
+import constants as const
+from ai import DistanceField, NEIGHBOR_OFFSETS
+from character import Character
+from enemy import Enemy
+from fight import Fight
+from floor_builder import FloorPregenerator
+from game import Game
+from game_initializer import GameInitializer
+from map import GameMap
+from message_bus import MessageBus
+
+# 1ターンの処理の内訳（Simulation.phase_times のキー）
+PHASES = ("player_action", "enemy_update", "effects", "respawn")
+
+
+def get_policy_seed(seed):
+    """ゲームのシードから方策用のシードを作る（ゲームの乱数と同じ列にならないようにする。Noneならそのまま）"""
+    return None if seed is None else f"{seed}:policy"
+
+
+def find_adjacent_enemy(game, player):
+    """プレイヤーに隣接する敵を1体返す（いなければNone）"""
+    for dx, dy in NEIGHBOR_OFFSETS:
+        for entity in game.get_entities_at_position(player.x + dx, player.y + dy):
+            if isinstance(entity, Enemy):
+                return entity
+    return None
+
+
+class RandomPolicy:
+    """隣接する敵がいれば攻撃し、階段に乗ったら降り、それ以外はランダムに歩くプレイヤー"""
+
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+
+    def choose_action(self, game, player):
+        enemy = find_adjacent_enemy(game, player)
+        if enemy is not None:
+            return "attack", enemy.x, enemy.y
+        if game.player_on_stairs():
+            return "descend_stairs", player.x, player.y
+
+        moves = [
+            (player.x + dx, player.y + dy)
+            for dx, dy in NEIGHBOR_OFFSETS
+            if game.is_walkable(player.x + dx, player.y + dy)
+        ]
+        if not moves:
+            return "rest", player.x, player.y
+        x, y = self.random.choice(moves)
+        return "move", x, y
+
+
+class StairsPolicy(RandomPolicy):
+    """隣接する敵を倒しながら、最短経路で階段を目指すプレイヤー（到達できなければランダムに歩く）"""
+
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.stairs_field = None
+
+    def choose_action(self, game, player):
+        enemy = find_adjacent_enemy(game, player)
+        if enemy is not None:
+            return "attack", enemy.x, enemy.y
+        if game.player_on_stairs():
+            return "descend_stairs", player.x, player.y
+
+        stairs = game.get_entities_of_type("stairs")
+        if stairs:
+            stair = stairs[0]
+            if self.stairs_field is None or not self.stairs_field.is_valid_for(game.game_map, stair.x, stair.y):
+                self.stairs_field = DistanceField(game.game_map, stair.x, stair.y)
+            next_step = self.stairs_field.next_step(
+                player.x,
+                player.y,
+                is_blocked=lambda x, y: any(isinstance(e, Character) for e in game.get_entities_at_position(x, y)),
+            )
+            if next_step is not None:
+                return ("move",) + next_step
+        return super().choose_action(game, player)
+
+
+class ScriptedPolicy:
+    """あらかじめ決めた (アクション名, dx, dy) の列をプレイヤー位置からの相対座標で順に実行する
+
+    列を使い切ったらNoneを返し、シミュレーションを終了させる。
+    """
+
+    def __init__(self, actions):
+        self.actions = iter(actions)
+
+    def choose_action(self, game, player):
+        step = next(self.actions, None)
+        if step is None:
+            return None
+        action, dx, dy = step
+        return action, player.x + dx, player.y + dy
+
+
+class Simulation:
+    """画面・入力・待ち時間なしで Game / EnemyManager / Fight を回すヘッドレス実行環境
+
+    1回の step() が main.update_game() の1回分に相当する。
+    プレイヤーの行動は policy.choose_action(game, player) が (アクション名, x, y) で返す。
+    """
+
+    def __init__(self, policy=None, num_enemies=5, logger=None, seed=None):
+        if logger is None:
+            logger = MessageBus()
+        self.logger = logger  # メッセージバス（シンクなし。直近のメッセージだけをリングバッファに残す）
+        self.log_messages = logger
+        # ゲームごとの乱数。マップ生成・AI・戦闘・アイテム生成はすべてこれを使うので、同じシードなら同じ展開になる
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.policy = policy if policy is not None else RandomPolicy(get_policy_seed(seed))
+        self.turns = 0  # ターンを消費した行動の数
+        self.steps = 0  # step() を呼んだ回数
+        self.finished = False
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self.setup(num_enemies)
+
+    def setup(self, num_enemies):
+        """main.setup_game() と同じ手順で、描画・入力なしのゲームを組み立てる"""
+        self.game_map = GameMap(self.random)
+        self.game = Game(self.game_map, rng=self.random, seed=self.seed)
+        self.game.headless = True
+        # 入力待ちの時間がないので、次の階層は降りるときにその場で生成する（結果は前もって生成した場合と同じ）
+        self.game.floor_pregenerator = FloorPregenerator(background=False)
+        self.game.set_logger(self.logger, self.log_messages)
+
+        initializer = GameInitializer(self.game, self.logger)
+        player = initializer.setup_player()
+        initializer.setup_stairs()
+        self.enemy_manager = initializer.setup_enemies(player.status.level, num_enemies)
+
+        self.game.place_gold_in_dungeon(player.status.level)
+        self.game.place_items_in_dungeon(player.status.level)
+        self.game.mark_initial_visibility()
+
+    @property
+    def player(self):
+        return self.game.get_player()
+
+    def apply_player_action(self, player, action, x, y):
+        """プレイヤーの行動を適用し、ターンを消費したかを返す（main.update_game と同じ規則）"""
+        game = self.game
+        if action == "move":
+            player.move(x - player.x, y - player.y, game)
+            game.update_player_position([player.x, player.y])
+            return True
+        if action == "attack":
+            target = next((e for e in game.get_entities_at_position(x, y) if isinstance(e, Enemy)), None)
+            if target is None:
+                return False
+            Fight(player, game.get_enemies(), game, self.logger).attack(player, target)
+            return True
+        if action == "descend_stairs":
+            if game.player_on_stairs():
+                game.enter_new_dungeon(self.enemy_manager)
+            return False
+        if action == "rest":
+            return True
+        game.update_player_position([player.x, player.y])
+        return False
+
+    def step(self):
+        """プレイヤーの1回の行動と、それに続く敵・エフェクト・再出現の処理を行う"""
+        if self.finished:
+            return False
+        game = self.game
+        player = game.get_player()
+        phase_times = self.phase_times
+        self.steps += 1
+
+        # 睡眠状態の場合は自動的にrestを実行（敵は動かない）
+        if not player.can_act:
+            start_time = time.perf_counter()
+            player.update_turn()
+            phase_times["effects"] += time.perf_counter() - start_time
+            self.turns += 1
+            return True
+
+        start_time = time.perf_counter()
+        choice = self.policy.choose_action(game, player)
+        if choice is None:
+            self.finished = True
+            return False
+        use_turn = self.apply_player_action(player, *choice)
+        game.update_after_player_action()
+        phase_times["player_action"] += time.perf_counter() - start_time
+
+        if use_turn and not game.game_over:
+            start_time = time.perf_counter()
+            self.enemy_manager.update_enemies(game)
+            enemy_time = time.perf_counter()
+            player.update_turn()
+            effects_time = time.perf_counter()
+            game.update_turn()  # ターン数の更新と敵の再出現
+            end_time = time.perf_counter()
+            phase_times["enemy_update"] += enemy_time - start_time
+            phase_times["effects"] += effects_time - enemy_time
+            phase_times["respawn"] += end_time - effects_time
+            self.turns += 1
+
+        if game.game_over:
+            self.finished = True
+        return not self.finished
+
+    def run(self, max_turns):
+        """ゲームオーバーになるか、max_turns ターン経過するまで進める"""
+        max_steps = max_turns * const.SIMULATION_MAX_STEPS_PER_TURN
+        while self.turns < max_turns and self.steps < max_steps and self.step():
+            pass
+        return self.get_summary()
+
+    def get_summary(self):
+        player = self.game.get_player()
+        return {
+            "seed": self.seed,
+            "turns": self.turns,
+            "steps": self.steps,
+            "depth": player.status.level,
+            "exp_level": player.status.exp_level,
+            "kills": self.game.kills,
+            "game_over": self.game.game_over,
+            "cause_of_death": self.game.killed_by if self.game.game_over else None,
+        }
@@ -2,5 +2,9 @@ from entity import Entity
 
 
 class Stairs(Entity):
+    __slots__ = ()
+    char = "<"
+    color = "white"
+
     def __init__(self, x=0, y=0):
-        super().__init__(x, y, "<", "white")
+        super().__init__(x, y)
@@ -1,12 +1,37 @@
-import yaml
 import constants as const
+from flyweight import KindTemplate, SlotsObject, TemplateField, get_kind_template
 
 
-class Status:
+class Status(SlotsObject):
+    # 名前・文字・色・ダイスなどの種類ごとに変わらない値は template（KindTemplate）に置き、同じ種類の敵で共有する
+    __slots__ = (
+        "template",
+        "level",
+        "max_hp",
+        "current_hp",
+        "strength",
+        "armor",
+        "exp",
+        "exp_level",
+        "next_exp",
+        "gold",
+        "food_left",
+        "turn_count",
+        "attack_power",
+        "defense_power",
+    )
+
+    name = TemplateField()
+    char = TemplateField()
+    color = TemplateField()
+    based_hit_rate = TemplateField()
+    dice_sides = TemplateField()
+    dice_count = TemplateField()
+    chase_power = TemplateField()
+    speed = TemplateField()
+
     def __init__(self, data: dict):
-        self.name = data.get("name", "Unknown")
-        self.char = data.get("char", "?")
-        self.color = data.get("color", "white")
+        self.template = get_kind_template(Status.build_template, data)
         self.level = data.get("level", 1)
         self.max_hp = data.get("max_hp", 10)
         self.current_hp = self.max_hp
@@ -17,18 +42,26 @@ class Status:
         self.next_exp = 0
         self.gold = data.get("gold", 0)
         self.food_left = data.get("food_left", const.STOMACHSIZE)
-        self.based_hit_rate = data.get("based_hit_rate", const.BASED_HIT_RATE)
 
         self.turn_count = 0
-        
-        # ダイス情報の追加
-        self.dice_sides = data.get("dice_sides", 4)  # デフォルトは4面ダイス
-        self.dice_count = data.get("dice_count", 1)  # デフォルトは1個
 
         # calc
         self.attack_power = self.strength
         self.defense_power = self.armor
-        self.chase_power = data.get("chase_power", 0)
+
+    @staticmethod
+    def build_template(data):
+        return KindTemplate(
+            name=data.get("name", "Unknown"),
+            char=data.get("char", "?"),
+            color=data.get("color", "white"),
+            based_hit_rate=data.get("based_hit_rate", const.BASED_HIT_RATE),
+            # ダイス情報
+            dice_sides=data.get("dice_sides", 4),  # デフォルトは4面ダイス
+            dice_count=data.get("dice_count", 1),  # デフォルトは1個
+            chase_power=data.get("chase_power", 0),
+            speed=data.get("speed", const.NORMAL_SPEED),  # 行動の速さ（NORMAL_SPEEDで1ターンに1回）
+        )
 
     def __repr__(self):
         message = f"{self.name}: {self.current_hp}/{self.max_hp}"
@@ -62,6 +95,7 @@ class Status:
             "color": self.color,
             "exp_level": self.exp_level,
             "chase_power": self.chase_power,
+            "speed": self.speed,
             "dice_sides": self.dice_sides,
             "dice_count": self.dice_count
         }
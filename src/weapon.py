@@ -1,12 +1,25 @@
-import yaml
 import random
 import glob
 from typing import List
 from equipment import Equipment
 from assets_manager import AssetsManager
+from dice import DiceField, parse_dice
+from flyweight import KindTemplate, TemplateField, get_kind_template
 
 
 class Weapon(Equipment):
+    __slots__ = ()
+
+    type = TemplateField()
+    wielded_dice = TemplateField()
+    throw_dice = TemplateField()
+    wielded_roll = DiceField("wielded_dice")  # 解析済みのダイス式
+    throw_roll = DiceField("throw_dice")
+    dmg_bonus = TemplateField()
+    hit_bonus = TemplateField()
+    use_effect = TemplateField()
+    flavor_text = TemplateField()
+
     def __init__(self, x=0, y=0, weapon_data={}, is_cursed=False):
         super().__init__("Weapon", x, y, char=")", color="white", is_cursed=is_cursed)
         self.load_data(weapon_data)
@@ -16,19 +29,29 @@ class Weapon(Equipment):
             print("Warning: Empty weapon data loaded.", data)
             return
 
-        self.type = data.get("type", "Weapon")
-        self.name = data.get("name", "Unknown weapon")
-        self.char = data.get("char", ")")
-        self.color = data.get("color", "white")
-        self.undefined_name = data.get("undefined_name", "Unknown weapon")
-        self.wielded_dice = data.get("wielded_dice", "0d0")
-        self.throw_dice = data.get("throw_dice", "0d0")
-        self.dmg_bonus = data.get("dmg_bonus", "0")
-        self.hit_bonus = data.get("hit_bonus", "0")
-        self.use_effect = data.get("use_effect", None)
-        self.flavor_text = data.get("flavor_text", "")
+        self.template = get_kind_template(Weapon.build_template, data)
         self.display_name = self.undefined_name
 
+    @staticmethod
+    def build_template(data):
+        wielded_dice = data.get("wielded_dice", "0d0")
+        throw_dice = data.get("throw_dice", "0d0")
+        return KindTemplate(
+            type=data.get("type", "Weapon"),
+            name=data.get("name", "Unknown weapon"),
+            char=data.get("char", ")"),
+            color=data.get("color", "white"),
+            undefined_name=data.get("undefined_name", "Unknown weapon"),
+            wielded_dice=wielded_dice,
+            throw_dice=throw_dice,
+            wielded_roll=parse_dice(wielded_dice),
+            throw_roll=parse_dice(throw_dice),
+            dmg_bonus=int(data.get("dmg_bonus", 0)),
+            hit_bonus=int(data.get("hit_bonus", 0)),
+            use_effect=data.get("use_effect", None),
+            flavor_text=data.get("flavor_text", ""),
+        )
+
     def attach_equip_info(self):
         equip_msg = ""
         if self.is_equipped:
@@ -96,9 +119,9 @@ class WeaponManager:
             weapon_instance_list.append(weapon_instance)
         return weapon_instance_list
 
-    def get_random_weapon(self) -> Weapon:
+    def get_random_weapon(self, rng=random) -> Weapon:
         if self.weapon_data_list:
-            weapon_data = random.choice(self.weapon_data_list)
+            weapon_data = rng.choice(self.weapon_data_list)
             return Weapon(weapon_data=weapon_data)
         else:
             return None
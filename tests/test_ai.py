@@ -0,0 +1,169 @@
+import pytest
+import random
+from collections import deque
+from unittest.mock import MagicMock
+
+from ai import AStarContext, DistanceField, Node, PlayerVisibility, a_star_search, heuristic
+from map import GameMap
+
+
+ROWS = [
+    "##########",
+    "#........#",
+    "#.######.#",
+    "#.#....#.#",
+    "#.#.##.#.#",
+    "#...#..#.#",
+    "#####.##.#",
+    "#........#",
+    "##########",
+]
+
+
+def make_game(rows):
+    game = MagicMock()
+    game.game_map.width = len(rows[0])
+    game.game_map.height = len(rows)
+    game.is_walkable = lambda x, y: 0 <= y < len(rows) and 0 <= x < len(rows[0]) and rows[y][x] == "."
+    return game
+
+
+def bfs_distance(rows, start, goal):
+    queue = deque([(start, 0)])
+    visited = {start}
+    while queue:
+        (x, y), dist = queue.popleft()
+        if (x, y) == goal:
+            return dist
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nx, ny = x + dx, y + dy
+                if (nx, ny) not in visited and rows[ny][nx] == ".":
+                    visited.add((nx, ny))
+                    queue.append(((nx, ny), dist + 1))
+    return None
+
+
+@pytest.mark.parametrize("goal", [(8, 7), (3, 3), (6, 5), (1, 7), (8, 1)])
+def test_path_is_shortest(goal):
+    game = make_game(ROWS)
+    path = a_star_search(Node(1, 1), Node(*goal), game)
+    assert path is not None
+    assert len(path) == bfs_distance(ROWS, (1, 1), goal)
+    assert (path[-1].x, path[-1].y) == goal
+
+
+def test_path_shape_links_back_to_start():
+    game = make_game(ROWS)
+    start = Node(1, 1)
+    path = a_star_search(start, Node(8, 7), game)
+    previous = start
+    for node in path:
+        assert node.parent is previous
+        assert max(abs(node.x - previous.x), abs(node.y - previous.y)) == 1
+        assert game.is_walkable(node.x, node.y)
+        previous = node
+
+
+def test_start_equals_goal_returns_empty_path():
+    game = make_game(ROWS)
+    assert a_star_search(Node(1, 1), Node(1, 1), game) == []
+
+
+def test_unreachable_goal_returns_none():
+    rows = ["#####", "#.#.#", "#####"]
+    game = make_game(rows)
+    assert a_star_search(Node(1, 1), Node(3, 1), game) is None
+
+
+def test_context_is_reusable_across_searches():
+    game = make_game(ROWS)
+    context = AStarContext()
+    first = a_star_search(Node(1, 1), Node(8, 7), game, context)
+    for _ in range(5):
+        again = a_star_search(Node(1, 1), Node(8, 7), game, context)
+        assert [(n.x, n.y) for n in again] == [(n.x, n.y) for n in first]
+
+
+def test_heuristic_is_chebyshev_for_unit_diagonal_cost():
+    assert heuristic(Node(0, 0), Node(3, 5)) == 5
+    assert heuristic(Node(4, 4), Node(1, 3)) == 3
+
+
+class FakeMap:
+    def __init__(self, rows):
+        self.width = len(rows[0])
+        self.height = len(rows)
+        self.version = 1
+        self.walkable = bytearray(1 if c == "." else 0 for row in rows for c in row)
+
+
+def test_distance_field_matches_bfs():
+    game_map = FakeMap(ROWS)
+    field = DistanceField(game_map, 8, 7)
+    for y, row in enumerate(ROWS):
+        for x, c in enumerate(row):
+            if c == ".":
+                assert field.get_distance(x, y) == bfs_distance(ROWS, (x, y), (8, 7))
+            else:
+                assert field.get_distance(x, y) == DistanceField.UNREACHABLE
+
+
+def test_distance_field_next_step_walks_downhill_to_origin():
+    game_map = FakeMap(ROWS)
+    field = DistanceField(game_map, 8, 7)
+    position = (1, 1)
+    steps = 0
+    while position != (8, 7):
+        next_step = field.next_step(*position)
+        assert field.get_distance(*next_step) == field.get_distance(*position) - 1
+        position = next_step
+        steps += 1
+    assert steps == bfs_distance(ROWS, (1, 1), (8, 7))
+
+
+def test_distance_field_next_step_avoids_blocked_cells():
+    game_map = FakeMap(ROWS)
+    field = DistanceField(game_map, 8, 7)
+    blocked = {(5, 6)}
+    assert field.next_step(5, 5) == (5, 6)
+    assert field.next_step(5, 5, is_blocked=lambda x, y: (x, y) in blocked) is None
+
+
+def test_distance_field_is_invalidated_by_map_version():
+    game_map = FakeMap(ROWS)
+    field = DistanceField(game_map, 8, 7)
+    assert field.is_valid_for(game_map, 8, 7)
+    assert not field.is_valid_for(game_map, 8, 6)
+    game_map.version += 1
+    assert not field.is_valid_for(game_map, 8, 7)
+
+
+def can_see_by_distance(game_map, enemy, player):
+    """部屋IDと距離から直接判定する（スナップショットを使わない）can_see_player"""
+    enemy_room, player_room = game_map.get_room_id(*enemy), game_map.get_room_id(*player)
+    if enemy_room is not None and player_room is not None:
+        return enemy_room == player_room
+    dx, dy = player[0] - enemy[0], player[1] - enemy[1]
+    return dx * dx + dy * dy <= 9
+
+
+def test_player_visibility_matches_room_and_distance_rule():
+    game_map = GameMap(random.Random(3))
+    tiles = game_map.get_walkable_tiles()
+    cells = [(x, y) for y in range(game_map.height) for x in range(game_map.width)]
+    for player in random.Random(0).sample(tiles, 20):
+        visibility = PlayerVisibility(game_map, *player)
+        for cell in cells:
+            assert visibility.can_see(*cell) == can_see_by_distance(game_map, cell, player)
+
+
+def test_player_visibility_hides_invisible_player_and_follows_map_version():
+    game_map = GameMap(random.Random(3))
+    x, y = game_map.get_walkable_tiles()[0]
+    visibility = PlayerVisibility(game_map, x, y, invisible=True)
+    assert not visibility.can_see(x, y)
+    assert visibility.is_valid_for(game_map, x, y, True)
+    assert not visibility.is_valid_for(game_map, x, y, False)
+    game_map.version += 1
+    assert not visibility.is_valid_for(game_map, x, y, True)
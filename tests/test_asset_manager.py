@@ -1,6 +1,9 @@
 import unittest
 from unittest.mock import patch
 from pathlib import Path
+import pygame
+
+import constants as const
 from assets_manager import AssetsManager
 
 class TestAssetsManager(unittest.TestCase):
@@ -41,5 +44,41 @@ class TestAssetsManager(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertTrue(all(isinstance(item, Path) for item in result))
 
+
+class TestAssetsManagerCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.assets_manager = AssetsManager(font_cache_size=2, glyph_cache_size=2)
+
+    def test_load_font_is_cached(self):
+        font = self.assets_manager.load_font(const.FONT_DEFAULT, 20)
+        self.assertIs(self.assets_manager.load_font(const.FONT_DEFAULT, 20), font)
+        stats = self.assets_manager.get_cache_stats()
+        self.assertEqual(stats["font_misses"], 1)
+        self.assertEqual(stats["font_hits"], 1)
+
+    def test_font_cache_evicts_least_recently_used(self):
+        font_20 = self.assets_manager.load_font(const.FONT_DEFAULT, 20)
+        self.assets_manager.load_font(const.FONT_DEFAULT, 21)
+        self.assets_manager.load_font(const.FONT_DEFAULT, 20)  # 20を最近使ったものにする
+        self.assets_manager.load_font(const.FONT_DEFAULT, 22)  # 21が追い出される
+        self.assertEqual(
+            list(self.assets_manager.font_cache), [(const.FONT_DEFAULT, 20), (const.FONT_DEFAULT, 22)]
+        )
+        self.assertIs(self.assets_manager.load_font(const.FONT_DEFAULT, 20), font_20)
+
+    def test_render_text_is_cached_per_color(self):
+        white = self.assets_manager.render_text(const.FONT_DEFAULT, 20, "@", "white")
+        self.assertIs(self.assets_manager.render_text(const.FONT_DEFAULT, 20, "@", "white"), white)
+        self.assertIsNot(self.assets_manager.render_text(const.FONT_DEFAULT, 20, "@", "red"), white)
+        stats = self.assets_manager.get_cache_stats()
+        self.assertEqual((stats["glyph_hits"], stats["glyph_misses"]), (1, 2))
+        self.assertEqual(stats["glyphs_cached"], 2)
+
+    def test_render_bold_text_restores_shared_font(self):
+        self.assets_manager.render_text(const.FONT_DEFAULT, 20, "!", "red", bold=True)
+        self.assertFalse(self.assets_manager.load_font(const.FONT_DEFAULT, 20).get_bold())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,82 @@
+import collections
+import contextlib
+import io
+import random
+from fractions import Fraction
+
+from combat_odds import AttackOdds, BalanceMatrix, enemy_attack_odds, player_attack_odds
+from enemy import EnemyManager
+from fight import Fight
+from simulation import RandomPolicy, Simulation
+from weapon import WeaponManager
+
+
+def make_fight(seed=0):
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation = Simulation(RandomPolicy(seed), num_enemies=0, seed=seed)
+    game, player = simulation.game, simulation.player
+    return game, player, Fight(player, [], game, game.logger)
+
+
+def assert_close(odds, counts, samples):
+    assert set(counts) <= set(odds.damage)
+    for damage, p in odds.damage.items():
+        assert abs(counts[damage] / samples - float(p)) < 0.015, damage
+
+
+def test_player_odds_match_roll_em():
+    game, player, fight = make_fight()
+    enemy = EnemyManager().create_enemy(6, 0, 0, random.Random(1))
+    player.equipped_weapon = WeaponManager().get_weapon_by_partial_name("dagger")  # 1d6+1d6（項ごとに命中判定）
+    player.status.exp_level = 5
+    odds = player_attack_odds(player, enemy)
+    assert sum(odds.damage.values()) == 1
+
+    game.random = random.Random(2)
+    samples = 20000
+    counts = collections.Counter(fight.roll_em(player, enemy)[1] for _ in range(samples))
+    assert_close(odds, counts, samples)
+
+
+def test_enemy_odds_match_roll_attack():
+    game, player, _ = make_fight()
+    rng = random.Random(3)
+    for enemy_level in (1, 6, 12):
+        enemy = EnemyManager().create_enemy(enemy_level, 0, 0, rng)
+        odds = enemy_attack_odds(enemy, player)
+        samples = 20000
+        counts = collections.Counter(enemy._roll_attack(player, rng)[1] for _ in range(samples))
+        assert_close(odds, counts, samples)
+        assert abs(counts[0] / samples - float(1 - odds.hit_chance)) < 0.015
+
+
+def test_attacks_to_kill():
+    always_three = AttackOdds(Fraction(1), {3: Fraction(1)})
+    assert always_three.attacks_to_kill(7) == 3
+    assert always_three.kill_chance(7, 2) == 0 and always_three.kill_chance(7, 3) == 1
+
+    half = AttackOdds(Fraction(1, 2), {0: Fraction(1, 2), 1: Fraction(1, 2)})
+    assert half.attacks_to_kill(1) == 2  # 当たるまでの回数は幾何分布
+    assert abs(half.attacks_to_kill(3) - 6) < 1e-9
+    assert half.kill_chance(2, 2) == Fraction(1, 4)
+
+    never = AttackOdds(Fraction(0), {0: Fraction(1)})
+    assert never.attacks_to_kill(5) == float("inf")
+
+
+def test_balance_matrix_covers_every_combination():
+    with contextlib.redirect_stdout(io.StringIO()):
+        matrix = BalanceMatrix()
+    rows = matrix.build(range(1, 3))
+    combinations = len(matrix.enemies) * 2 * len(matrix.weapons) * len(matrix.armors) * len(matrix.rings)
+    assert len(rows) == combinations
+    protection = [row for row in rows if row["ring"] == "protection ring"]
+
+    def key(row):
+        return row["enemy"], row["player_level"], row["weapon"], row["armor"]
+
+    plain = {key(row): row for row in rows if row["ring"] is None}
+    for row in protection:
+        other = plain[key(row)]
+        assert row["enemy_mean_damage"] <= other["enemy_mean_damage"]
+        assert row["turns_to_kill"] == other["turns_to_kill"]
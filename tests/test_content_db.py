@@ -0,0 +1,80 @@
+import copy
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import pytest
+
+from armor import ArmorManager
+from content_db import ContentDatabase, FrozenDict, get_content_database
+from content_pack import build_pack
+from enemy import EnemyManager
+from food import Food
+from weapon import WeaponManager
+
+
+def test_templates_are_loaded_once_and_shared():
+    database = get_content_database()
+    assert WeaponManager().weapon_data_list is WeaponManager().weapon_data_list
+    assert WeaponManager().weapon_data_list is database.get_templates("item/weapon")
+    assert EnemyManager().enemy_data is database.get_templates("enemy")
+    assert ArmorManager().armor_data_list
+
+
+def test_templates_are_read_only():
+    template = get_content_database().get_templates("item/weapon")[0]
+    assert isinstance(template, FrozenDict)
+    with pytest.raises(TypeError):
+        template["name"] = "changed"
+    with pytest.raises(TypeError):
+        template.update(name="changed")
+    player = get_content_database().get_template("chara", "player.yaml")
+    assert isinstance(player["initial_equipment"]["food"], tuple)
+
+
+def test_templates_survive_pickle_and_deepcopy():
+    food = Food()
+    restored = pickle.loads(pickle.dumps(food))
+    assert restored.food_data == food.food_data
+    assert isinstance(restored.food_data, FrozenDict)
+    assert food.copy().food_data == food.food_data
+    assert copy.deepcopy(food.food_data) == food.food_data
+
+
+def test_missing_template_raises():
+    with pytest.raises(FileNotFoundError):
+        get_content_database().get_template("chara", "missing.yaml")
+
+
+@pytest.fixture
+def assets_copy(tmp_path):
+    shutil.copytree(Path(__file__).parent.parent.joinpath("assets", "data"), tmp_path.joinpath("assets", "data"))
+    shutil.copytree(Path(__file__).parent.parent.joinpath("assets", "config"), tmp_path.joinpath("assets", "config"))
+    return tmp_path
+
+
+def test_pack_matches_yaml(assets_copy):
+    from_yaml = ContentDatabase(assets_copy, use_pack=True)
+    from_yaml.preload()
+    assert from_yaml.stats["source"] == "yaml"
+
+    build_pack(assets_copy.joinpath("assets"))
+    from_pack = ContentDatabase(assets_copy, use_pack=True)
+    from_pack.preload()
+    assert from_pack.stats == {"source": "pack", "files_opened": 1}
+    assert from_pack.categories == from_yaml.categories
+    assert list(from_pack.categories["enemy"]) == sorted(from_yaml.categories["enemy"])
+    assert isinstance(from_pack.get_template("config", "config.yaml")["keymap"]["rest"], tuple)
+
+
+def test_stale_pack_falls_back_to_yaml(assets_copy, capsys):
+    build_pack(assets_copy.joinpath("assets"))
+    dagger = assets_copy.joinpath("assets", "data", "item", "weapon", "Dagger.yaml")
+    dagger.write_text(dagger.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+    os.utime(dagger, ns=(0, 0))  # 更新時刻が古くなっても、一覧が違えば使わない
+
+    database = ContentDatabase(assets_copy, use_pack=True)
+    database.preload()
+    assert database.stats["source"] == "yaml"
+    assert "out of date" in capsys.readouterr().out
@@ -0,0 +1,50 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+from dice import parse_dice, roll_dice
+from numpy_loader import get_numpy
+from weapon import WeaponManager
+
+
+def test_parse_dice_into_terms():
+    assert parse_dice("1d6+1d6").terms == ((1, 6, 0), (1, 6, 0))
+    assert parse_dice("2d4+1").terms == ((2, 4, 1),)
+    assert parse_dice("3").terms == ((0, 0, 3),)
+    assert parse_dice("0d0").terms == ((0, 0, 0),)
+    assert parse_dice("2d4") is parse_dice("2d4")  # 同じ文字列は1回だけ解析する
+    with pytest.raises(ValueError):
+        parse_dice("2x4")
+
+
+def test_weapon_templates_hold_parsed_dice():
+    dagger = WeaponManager().get_weapon_by_partial_name("dagger")
+    assert dagger.wielded_roll is parse_dice(dagger.wielded_dice)
+    assert isinstance(dagger.dmg_bonus, int) and isinstance(dagger.hit_bonus, int)
+
+
+def test_roll_uses_random_numbers_like_roll_dice():
+    dice = parse_dice("2d4+1+1d6")
+    rng, expected_rng = random.Random(5), random.Random(5)
+    for _ in range(20):
+        expected = roll_dice(2, 4, expected_rng) + 1 + roll_dice(1, 6, expected_rng)
+        assert dice.roll(rng) == expected
+
+
+def test_exact_distribution():
+    dice = parse_dice("2d4+1")
+    distribution = dice.distribution()
+    assert sum(distribution.values()) == 1
+    assert (min(distribution), max(distribution)) == (dice.minimum, dice.maximum) == (3, 9)
+    assert distribution[6] == Fraction(4, 16)
+    assert dice.mean == sum(value * p for value, p in distribution.items()) == 6
+
+
+@pytest.mark.skipif(get_numpy() is None, reason="numpy is not installed")
+def test_numpy_sampling_matches_distribution():
+    np = get_numpy()
+    dice = parse_dice("3d6")
+    samples = dice.sample(20000, np.random.default_rng(0))
+    assert samples.min() >= dice.minimum and samples.max() <= dice.maximum
+    assert abs(samples.mean() - float(dice.mean)) < 0.1
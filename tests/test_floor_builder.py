@@ -0,0 +1,98 @@
+import contextlib
+import io
+
+from floor_builder import FloorPregenerator, build_floor
+from simulation import Simulation
+
+
+def make_simulation(seed):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Simulation(num_enemies=3, seed=seed)
+
+
+def describe_floor(game):
+    entities = [(type(entity).__name__, entity.x, entity.y) for entity in game.entity_locations]
+    return game.game_map.tiles, entities, game.get_player_position()
+
+
+def descend(simulation):
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.game.generate_next_floor(simulation.player, simulation.enemy_manager)
+
+
+def test_build_floor_depends_only_on_seed_and_level():
+    simulation = make_simulation(seed=1)
+    player, enemy_manager = simulation.player, simulation.enemy_manager
+    with contextlib.redirect_stdout(io.StringIO()):
+        plans = [build_floor(7, 3, enemy_manager, player) for _ in range(2)]
+        other_level = build_floor(7, 4, enemy_manager, player)
+
+    assert plans[0].game_map.tiles == plans[1].game_map.tiles
+    assert [(type(e).__name__, e.x, e.y) for e in plans[0].entities] == [
+        (type(e).__name__, e.x, e.y) for e in plans[1].entities
+    ]
+    assert plans[0].player_start == plans[1].player_start
+    assert other_level.game_map.tiles != plans[0].game_map.tiles
+    assert player not in plans[0].entities
+
+
+def test_pregenerated_floor_matches_floor_built_on_descent():
+    background = make_simulation(seed=4)
+    background.game.floor_pregenerator = FloorPregenerator(background=True)
+    background.game.request_next_floor(background.enemy_manager)
+    assert (4, 2) in background.game.floor_pregenerator.pending
+
+    on_descent = make_simulation(seed=4)
+    descend(background)
+    descend(on_descent)
+
+    assert background.player.status.level == on_descent.player.status.level == 2
+    assert describe_floor(background.game) == describe_floor(on_descent.game)
+    # 切り替えた階層の次の階層がすぐに依頼される
+    assert (4, 3) in background.game.floor_pregenerator.pending
+    background.game.floor_pregenerator.shutdown()
+
+
+def test_descending_keeps_the_same_game_map_object():
+    simulation = make_simulation(seed=6)
+    game_map = simulation.game.game_map
+    version = game_map.version
+    descend(simulation)
+
+    assert simulation.game.game_map is game_map
+    assert game_map.version > version
+    player = simulation.player
+    assert game_map.is_walkable(player.x, player.y)
+    assert game_map.explored[player.y][player.x]
+
+
+def test_restart_builds_a_new_dungeon():
+    simulation = make_simulation(seed=8)
+    simulation.game.floor_pregenerator = FloorPregenerator(background=True)
+    floors = []
+    for _ in range(2):
+        simulation.game.request_next_floor(simulation.enemy_manager)
+        old_seed = simulation.game.get_seed()
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulation.game.restart_game(simulation.player)
+        # 死ぬ前に依頼した階層は捨て、新しいシードの階層だけを依頼する
+        assert simulation.game.seed != old_seed
+        assert all(seed == simulation.game.seed for seed, _ in simulation.game.floor_pregenerator.pending)
+        level_1 = describe_floor(simulation.game)
+        descend(simulation)
+        floors.append((level_1, describe_floor(simulation.game)))
+
+    assert floors[0][0] != floors[1][0]
+    assert floors[0][1] != floors[1][1]
+    simulation.game.floor_pregenerator.shutdown()
+
+
+def test_floor_potions_use_the_game_potion_names():
+    simulation = make_simulation(seed=9)
+    descend(simulation)
+    potion_manager = simulation.game.potion_manager
+    potions = [entity for entity in simulation.game.get_entities_of_type("items") if type(entity).__name__ == "Potion"]
+    assert potions
+    for potion in potions:
+        assert potion.potion_manager is potion_manager
+        assert potion.undefined_name == potion_manager.potion_undefined_names[potion.name]
@@ -0,0 +1,61 @@
+import pickle
+import random
+
+import pytest
+
+import constants as const
+from enemy import EnemyManager
+from flyweight import KindTemplate
+from potion import PotionManager
+from status import Status
+from weapon import Weapon, WeaponManager
+
+
+def test_items_of_the_same_kind_share_their_template():
+    manager = WeaponManager()
+    rng = random.Random(0)
+    first = manager.get_weapon_by_partial_name("dagger")
+    second = manager.get_weapon_by_partial_name("dagger")
+    assert first.template is second.template
+    assert not hasattr(first, "__dict__")
+
+    first.appraisal()
+    assert first.is_defined and not second.is_defined  # 鑑定状態はインスタンスごと
+    with pytest.raises(AttributeError):
+        first.wielded_dice = "9d9"  # 種類ごとのデータは書き換えられない
+
+    potions = [PotionManager(rng).get_random_potion(rng) for _ in range(2)]
+    assert all(potion.undefined_name == potion.display_name for potion in potions)
+
+
+def test_enemies_share_status_template():
+    enemy_manager = EnemyManager()
+    rng = random.Random(0)
+    enemies = [enemy_manager.create_enemy(const.AMULETLEVEL, 0, 0, rng) for _ in range(20)]
+    by_name = {}
+    for enemy in enemies:
+        by_name.setdefault(enemy.status.name, []).append(enemy)
+    same_kind = max(by_name.values(), key=len)
+    assert len(same_kind) > 1
+    assert same_kind[0].status.template is same_kind[1].status.template
+    same_kind[0].status.current_hp -= 1
+    assert same_kind[0].status.current_hp != same_kind[1].status.current_hp
+
+
+def test_pickle_keeps_shared_templates_and_reads_old_saves():
+    manager = WeaponManager()
+    weapons = [manager.get_weapon_by_partial_name("dagger") for _ in range(2)]
+    restored = pickle.loads(pickle.dumps(weapons))
+    assert restored[0].template is restored[1].template
+    assert restored[0].get_state() == weapons[0].get_state()
+
+    # __slots__ にする前のセーブデータは、すべての属性を __dict__ に持っている
+    old_state = dict(weapons[0].get_state(), display_name="Old dagger", is_equipped=True, removed_attribute=1)
+    weapon = Weapon.__new__(Weapon)
+    weapon.__setstate__(old_state)
+    assert (weapon.name, weapon.display_name, weapon.is_equipped) == (weapons[0].name, "Old dagger", True)
+    assert isinstance(weapon.template, KindTemplate)
+
+    status = Status.__new__(Status)
+    status.__setstate__({"name": "Player", "char": "@", "max_hp": 12, "current_hp": 3})
+    assert (status.name, status.char, status.current_hp) == ("Player", "@", 3)
@@ -6,6 +6,10 @@ from game import Game
 from map import GameMap
 from character import Character
 from status import Status
+from player import Player
+from enemy import Enemy
+from stair import Stairs
+from gold import Gold
 
 class TestIsWalkable(unittest.TestCase):
     def get_walkable_coordinates_list(self, game_map):
@@ -59,5 +63,104 @@ class TestIsWalkable(unittest.TestCase):
             result = game.is_walkable(coord[0], coord[1])
             self.assertFalse(result, f"座標 {coord} は移動不可能であるべきですが、True が返されました。")
 
+class TestEntityRegistry(unittest.TestCase):
+    def setUp(self):
+        self.game_map = GameMap()
+        self.game = Game(self.game_map)
+        self.walkable = self.game_map.get_walkable_tiles()
+
+    def generate_status(self, char):
+        return Status({"char": char, "name": char, "max_hp": 10, "strength": 1})
+
+    def test_add_entity_fills_buckets_and_player(self):
+        x, y = self.walkable[0]
+        player = Player(x, y, self.generate_status("@"), None)
+        enemy = Enemy(*self.walkable[1], self.generate_status("B"))
+        stairs = Stairs(*self.walkable[2])
+        gold = Gold(*self.walkable[3])
+        for entity in (player, enemy, stairs, gold):
+            self.game.add_entity(entity)
+
+        self.assertIs(self.game.get_player(), player)
+        self.assertEqual(self.game.get_player_position(), (x, y))
+        self.assertEqual(self.game.get_enemies(), [enemy])
+        self.assertEqual(self.game.get_entities_of_type("stairs"), [stairs])
+        self.assertEqual(self.game.get_entities_of_type("gold"), [gold])
+
+    def test_update_entity_position_moves_spatial_entry(self):
+        enemy = Enemy(*self.walkable[0], self.generate_status("B"))
+        self.game.add_entity(enemy)
+        old_pos = (enemy.x, enemy.y)
+        enemy.x, enemy.y = self.walkable[1]
+        self.game.update_entity_position(enemy, old_pos)
+
+        self.assertEqual(self.game.get_entities_at_position(*old_pos), [])
+        self.assertEqual(self.game.get_entities_at_position(*self.walkable[1]), [enemy])
+
+    def test_remove_entity_uses_registered_position(self):
+        player = Player(*self.walkable[0], self.generate_status("@"), None)
+        self.game.add_entity(player)
+        # 登録後に座標だけ書き換えられても、登録座標から削除できる
+        player.x, player.y = self.walkable[1]
+        self.game.remove_entity(player)
+
+        self.assertIsNone(self.game.get_player())
+        self.assertEqual(self.game.entity_positions, {})
+
+
+class TestFreeCells(unittest.TestCase):
+    def setUp(self):
+        self.game_map = GameMap()
+        self.game = Game(self.game_map)
+        self.walkable = self.game_map.get_walkable_tiles()
+
+    def generate_status(self, char):
+        return Status({"char": char, "name": char, "max_hp": 10, "strength": 1})
+
+    def expected_free_cells(self):
+        return {
+            (x, y) for x, y in self.walkable
+            if not any(isinstance(e, Character) for e in self.game.get_entities_at_position(x, y))
+        }
+
+    def assert_free_cells_consistent(self):
+        free_cells = self.game.get_free_cells()
+        self.assertEqual(set(free_cells), self.expected_free_cells())
+        self.assertEqual(len(free_cells), len(set(free_cells)))
+        for i, cell in enumerate(free_cells):
+            self.assertEqual(self.game.free_cell_index[cell], i)
+
+    def test_free_cells_follow_add_move_and_remove(self):
+        self.assert_free_cells_consistent()
+        enemy = Enemy(*self.walkable[0], self.generate_status("B"))
+        gold = Gold(*self.walkable[1])
+        self.game.add_entity(enemy)
+        self.game.add_entity(gold)
+        self.assertNotIn(self.walkable[0], self.game.get_free_cells())
+        self.assertIn(self.walkable[1], self.game.get_free_cells())  # アイテムのあるマスは空きマス
+
+        enemy.x, enemy.y = self.walkable[2]
+        self.game.update_entity_position(enemy)
+        self.assert_free_cells_consistent()
+
+        self.game.remove_entity(enemy)
+        self.assert_free_cells_consistent()
+
+    def test_teleport_entity_avoids_characters(self):
+        for x, y in self.walkable[:-1]:
+            self.game.add_entity(Enemy(x, y, self.generate_status("B")))
+        gold = Gold()
+        self.game.teleport_entity(gold)
+        self.assertEqual((gold.x, gold.y), self.walkable[-1])
+
+    def test_free_cells_rebuilt_when_terrain_changes(self):
+        self.game.get_free_cells()
+        x, y = self.walkable[0]
+        self.game_map.set_tile(self.game_map.tiles, x, y, "|")
+        self.assertNotIn((x, y), self.game.get_free_cells())
+        self.walkable.remove((x, y))
+        self.assert_free_cells_consistent()
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -32,6 +32,8 @@ def test_setup_player(MockAssetsManager):
         "color": "white"
     }
     player_yaml_content_str = yaml.dump(player_yaml_content)
+    # プレイヤーのデータはContentDatabase経由で受け取る
+    mock_assets_manager.get_chara_data.return_value = player_yaml_content
 
     with patch('builtins.open', mock_open(read_data=player_yaml_content_str)), \
          patch('yaml.safe_load', return_value=player_yaml_content):
@@ -0,0 +1,15 @@
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).parent.parent.joinpath("src")
+
+# pygameを読み込まずに使えるはずのモジュール（ゲームロジックとヘッドレス実行）
+LOGIC_MODULES = ["map", "ai", "fight", "status", "item", "effect", "game", "simulation", "batch_runner"]
+
+
+def test_logic_modules_do_not_import_pygame():
+    # 他のテストがpygameを読み込んでいる可能性があるので、新しいプロセスで確かめる
+    code = f"import sys; import {', '.join(LOGIC_MODULES)}; print('pygame' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC_PATH, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,48 @@
+import os
+import random
+
+import pygame
+import pytest
+
+from game import Game
+from input_handler import InputHandler
+from map import GameMap
+
+
+@pytest.fixture
+def input_handler():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    game_map = GameMap(random.Random(0))
+    handler = InputHandler(1, Game(game_map), game_map)
+    yield handler
+    pygame.display.quit()
+
+
+def room_center(game_map):
+    room = game_map.rooms[0]
+    return (room["x1"] + room["x2"]) // 2, (room["y1"] + room["y2"]) // 2
+
+
+def keydown(key, mod=0):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=mod)
+
+
+def test_keydown_events_are_dispatched_without_polling(input_handler):
+    x, y = room_center(input_handler.game_map)
+    input_handler.handle_keys([x, y], [keydown(pygame.K_KP5)])
+    assert input_handler.action == ("rest", x, y)
+    input_handler.handle_keys([x, y], [keydown(pygame.K_w, pygame.KMOD_LSHIFT)])
+    assert input_handler.action == ("wear_armor", x, y)
+
+    # 押してすぐ離した移動キーも、イベントから移動として扱う
+    input_handler.handle_keys([x, y], [keydown(pygame.K_LEFT), pygame.event.Event(pygame.KEYUP, key=pygame.K_LEFT)])
+    assert input_handler.action == ("move", x - 1, y)
+
+
+def test_unbound_keys_leave_no_stale_action(input_handler):
+    x, y = room_center(input_handler.game_map)
+    input_handler.handle_keys([x, y], [keydown(pygame.K_KP5)])
+    input_handler.handle_keys([x, y], [keydown(pygame.K_z)])
+    assert input_handler.action == ("none", x, y)
+    assert not input_handler.keys_held
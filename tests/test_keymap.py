@@ -0,0 +1,63 @@
+import pygame
+
+from assets_manager import AssetsManager
+from keymap_loader import CompiledKeymap, compile_keymap, get_action_for_key
+
+
+KEYMAP = {
+    "wear_armor": ["W"],
+    "wield_a_weapon": ["w"],
+    "rest": ["KP5", "NO_SUCH_KEY"],
+    "draw_help": ["?", "SHIFT+h"],
+    "descend_stairs": [".", "KP5"],
+}
+
+
+def test_compiled_keymap_prefers_modified_binding():
+    keymap = compile_keymap(KEYMAP, report=False)
+    assert keymap.get_action(pygame.K_w) == "wield_a_weapon"
+    assert keymap.get_action(pygame.K_w, pygame.KMOD_LSHIFT) == "wear_armor"
+    assert keymap.get_action(pygame.K_w, pygame.KMOD_CTRL) == "wield_a_weapon"  # 割り当てのない修飾キーは無視する
+    assert keymap.get_action(pygame.K_h) is None
+    assert keymap.get_action(pygame.K_h, pygame.KMOD_RSHIFT) == "draw_help"
+    assert get_action_for_key(pygame.K_w, pygame.KMOD_SHIFT, KEYMAP) == "wear_armor"
+
+
+class Pressed(dict):
+    """pygame.key.get_pressed() の代わり（押されていないキーはFalse）"""
+
+    def __missing__(self, key):
+        return False
+
+
+def test_held_keys_use_the_same_table():
+    keymap = compile_keymap(KEYMAP, report=False)
+    pressed = Pressed({pygame.K_w: True})
+    assert keymap.get_held_action(pressed) == "wield_a_weapon"
+    assert keymap.get_held_action(pressed, pygame.KMOD_SHIFT) == "wear_armor"
+    assert keymap.get_held_action(Pressed()) is None
+
+
+def test_extra_modifiers_still_match_modified_bindings():
+    keymap = compile_keymap(KEYMAP, report=False)
+    shift_ctrl = pygame.KMOD_LSHIFT | pygame.KMOD_LCTRL
+    assert keymap.get_action(pygame.K_h, shift_ctrl) == "draw_help"
+    assert keymap.get_held_action(Pressed({pygame.K_h: True}), shift_ctrl) == "draw_help"
+    assert keymap.get_action(pygame.K_w, shift_ctrl | pygame.KMOD_ALT) == "wear_armor"
+    assert keymap.get_held_action(Pressed({pygame.K_w: True}), shift_ctrl | pygame.KMOD_ALT) == "wear_armor"
+
+
+def test_unknown_and_duplicate_keys_are_reported(capsys):
+    keymap = compile_keymap(KEYMAP)
+    output = capsys.readouterr().out
+    assert "unknown key 'NO_SUCH_KEY' for action 'rest'" in output
+    assert "key 'KP5' for action 'descend_stairs' is already bound to 'rest'" in output
+    assert len(keymap.errors) == 2
+    # ヘルプには実際に割り当てられたキーだけが並ぶ
+    assert dict(keymap.items())["rest"] == ["KP5"]
+    assert dict(keymap.items())["descend_stairs"] == ["."]
+
+
+def test_game_keymap_is_valid():
+    keymap = CompiledKeymap(AssetsManager().get_config_data("config.yaml")["keymap"])
+    assert keymap.errors == []
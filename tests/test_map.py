@@ -0,0 +1,164 @@
+import pickle
+import random
+
+import pytest
+
+import constants as const
+from map import GameMap, WALKABLE_TILES
+
+
+@pytest.fixture
+def game_map():
+    return GameMap()
+
+
+def test_walkable_grid_matches_tiles(game_map):
+    for y in range(game_map.height):
+        for x in range(game_map.width):
+            assert game_map.is_walkable(x, y) == (game_map.tiles[y][x] in WALKABLE_TILES)
+
+
+def test_get_walkable_tiles_matches_is_walkable(game_map):
+    walkable_tiles = game_map.get_walkable_tiles()
+    expected = [
+        (x, y) for y in range(game_map.height) for x in range(game_map.width) if game_map.tiles[y][x] in WALKABLE_TILES
+    ]
+    assert walkable_tiles == expected
+
+
+def test_out_of_range_is_not_walkable(game_map):
+    assert not game_map.is_walkable(-1, 0)
+    assert not game_map.is_walkable(0, -1)
+    assert not game_map.is_walkable(game_map.width, 0)
+    assert not game_map.is_walkable(0, game_map.height)
+
+
+def test_set_tile_updates_walkable_grid(game_map):
+    x, y = game_map.get_walkable_tiles()[0]
+    game_map.set_tile(game_map.tiles, x, y, "|")
+    assert not game_map.is_walkable(x, y)
+    game_map.set_tile(game_map.tiles, x, y, ".")
+    assert game_map.is_walkable(x, y)
+
+
+@pytest.fixture
+def compact_map():
+    return GameMap(random.Random(7), compact=True)
+
+
+def test_compact_storage_generates_same_dungeon():
+    game_map = GameMap(random.Random(7), compact=False)
+    compact_map = GameMap(random.Random(7), compact=True)
+    assert compact_map.tiles.to_lists() == game_map.tiles
+    assert compact_map.room_info.to_lists() == game_map.room_info
+    assert compact_map.walkable == game_map.walkable
+
+
+def test_compact_storage_supports_list_style_access(compact_map):
+    assert len(compact_map.tiles) == compact_map.height
+    assert len(compact_map.tiles[0]) == compact_map.width
+    assert compact_map.tiles[-1][-1] == compact_map.tiles[compact_map.height - 1][compact_map.width - 1]
+
+    compact_map.mark_explored(3, 2)
+    assert compact_map.explored[2][3]
+    assert not compact_map.explored[2][4]
+    assert list(compact_map.explored[2][:5]) == [False, False, False, True, False]
+
+
+def test_compact_storage_room_id(compact_map):
+    x, y = next((x, y) for x, y in compact_map.get_walkable_tiles() if compact_map.tiles[y][x] == ".")
+    assert compact_map.get_room_id(x, y) == compact_map.room_info[y][x] >= 0
+    x, y = next((x, y) for x, y in compact_map.get_walkable_tiles() if compact_map.tiles[y][x] == "#")
+    assert compact_map.get_room_id(x, y) is None
+
+
+def test_compact_storage_set_tile_updates_walkable_grid(compact_map):
+    x, y = compact_map.get_walkable_tiles()[0]
+    compact_map.set_tile(compact_map.tiles, x, y, "|")
+    assert compact_map.tiles[y][x] == "|"
+    assert not compact_map.is_walkable(x, y)
+
+
+def test_compact_storage_pickle_round_trip(compact_map):
+    compact_map.mark_explored(5, 5)
+    compact_map.mark_explored(compact_map.width - 1, compact_map.height - 1)
+    restored = pickle.loads(pickle.dumps(compact_map))
+    assert restored.tiles == compact_map.tiles
+    assert restored.explored.to_lists() == compact_map.explored.to_lists()
+    assert restored.room_info.to_lists() == compact_map.room_info.to_lists()
+    assert restored.explored[5][5]
+
+
+def test_room_cells_match_room_info(game_map):
+    for room_id, cells in enumerate(game_map.room_cells):
+        assert cells
+        assert all(game_map.room_info[y][x] == room_id for x, y in cells)
+    total = sum(len(cells) for cells in game_map.room_cells)
+    assert total == sum(room_id is not None for row in game_map.room_info for room_id in row)
+
+
+def test_mark_room_explored_by_id_marks_only_that_room(game_map):
+    game_map.mark_room_explored_by_id(0)
+    room_cells = set(game_map.room_cells[0])
+    for y in range(game_map.height):
+        for x in range(game_map.width):
+            assert game_map.explored[y][x] == ((x, y) in room_cells)
+
+
+def test_explored_changes_record_only_flipped_cells(game_map):
+    game_map.pop_explored_changes()
+    game_map.mark_room_explored_by_id(0)
+    assert game_map.pop_explored_changes() == set(game_map.room_cells[0])
+    assert game_map.pop_explored_changes() == set()
+
+    x, y = game_map.room_cells[0][0]
+    game_map.mark_explored(x, y)  # 既に探索済みなので変化なし
+    assert game_map.pop_explored_changes() == set()
+    game_map.set_explored(x, y, False)
+    assert game_map.pop_explored_changes() == {(x, y)}
+    assert not game_map.explored[y][x]
+
+
+def test_get_room_of_cell(game_map):
+    room = game_map.rooms[1]
+    assert game_map.get_room_of_cell((room["x1"], room["y1"])) is room
+    assert game_map.get_room_of_cell((room["x2"] - 1, room["y2"] - 1)) is room
+    assert game_map.get_room_of_cell((-1, 0)) is None
+    x, y = next((x, y) for x, y in game_map.get_walkable_tiles() if game_map.tiles[y][x] == "#")
+    assert game_map.get_room_of_cell((x, y)) is None
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_build_room_index_restores_rooms(compact):
+    game_map = GameMap(random.Random(3), compact=compact)
+    rooms = [dict(room) for room in game_map.rooms]
+    room_cells = [list(cells) for cells in game_map.room_cells]
+    game_map.build_room_index()
+    assert game_map.rooms == rooms
+    assert game_map.room_cells == room_cells
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_numpy_generator_matches_python_generator(monkeypatch, compact):
+    pytest.importorskip("numpy")
+    maps = []
+    for backend in ("python", "numpy"):
+        monkeypatch.setattr(const, "DUNGEON_GENERATOR", backend)
+        maps.append(GameMap(random.Random(11), compact=compact))
+    python_map, numpy_map = maps
+    assert numpy_map.tiles == python_map.tiles
+    assert numpy_map.walkable == python_map.walkable
+    assert numpy_map.rooms == python_map.rooms
+    assert numpy_map.room_cells == python_map.room_cells
+
+
+def test_unknown_generator_is_rejected(monkeypatch):
+    monkeypatch.setattr(const, "DUNGEON_GENERATOR", "pyton")
+    with pytest.raises(ValueError):
+        GameMap(random.Random(0))
+
+
+def test_choose_room_layout_gives_up_after_max_layouts(game_map, capsys):
+    rooms = game_map.choose_room_layout(num_rooms_range=(13, 20), max_layouts=3)
+    assert 0 < len(rooms) < 13
+    assert "Warning" in capsys.readouterr().out
@@ -0,0 +1,50 @@
+import pickle
+
+from message_bus import DEBUG, INFO, FileSink, MessageBus, MessageType
+
+
+def test_messages_are_rendered_only_when_read():
+    bus = MessageBus(capacity=10, verbosity=INFO)
+    bus.set_turn(3)
+    bus.post(MessageType.ATTACK, "Orc", "Player", 4)
+    message = bus.messages[-1]
+    assert (message.kind, message.actor, message.target, message.amount, message.turn) == (
+        MessageType.ATTACK,
+        "Orc",
+        "Player",
+        4,
+        3,
+    )
+    assert message.rendered is None
+    assert bus[-1] == "Orc attacks Player for 4 damage."
+    assert list(reversed(bus)) == ["Orc attacks Player for 4 damage."]
+
+
+def test_messages_below_verbosity_are_dropped():
+    bus = MessageBus(capacity=2, verbosity=INFO)
+    bus.post(MessageType.DAMAGE, "Orc", "Player", 1, level=DEBUG, detail=(1, 0, 0))
+    assert len(bus) == 0
+    bus.extend(["a", "b", "c"])
+    assert list(bus) == ["b", "c"]
+    assert bus.total_count == 3
+
+
+def test_file_sink_writes_all_levels_it_accepts(tmp_path):
+    path = tmp_path / "messages.log"
+    bus = MessageBus(verbosity=INFO)
+    bus.add_sink(FileSink(path, level=DEBUG))
+    bus.set_turn(1)
+    bus.post(MessageType.HIT, target="Bat")
+    bus.post(MessageType.DEFENSE, "Bat", "Player", -2, level=DEBUG)
+
+    # シンクはセーブデータに含めない
+    restored = pickle.loads(pickle.dumps(bus))
+    assert restored.sinks == []
+    assert list(restored) == ["Bat is hit!"]
+
+    bus.close()
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "[Turn 1] Bat is hit!",
+        "[Turn 1] Equipment defense modifier: -2 (armor + protection bonuses)",
+    ]
+    assert len(bus) == 1
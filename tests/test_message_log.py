@@ -0,0 +1,44 @@
+import pickle
+from unittest.mock import MagicMock
+
+from draw import Draw
+from message_log import MessageLog
+
+
+def test_message_log_drops_oldest_and_counts_all():
+    log = MessageLog(capacity=3)
+    log.extend(["a", "b", "c"])
+    log.append("d")
+    assert list(log) == ["b", "c", "d"]
+    assert log[-1] == "d"
+    assert log.total_count == 4
+
+    restored = pickle.loads(pickle.dumps(log))
+    assert list(restored) == ["b", "c", "d"]
+    assert restored.maxlen == 3
+    assert restored.total_count == 4
+
+
+class FakeFont:
+    """1文字10pxの等幅フォント。size() の呼び出し回数を数える"""
+
+    def __init__(self):
+        self.size_calls = 0
+
+    def size(self, text):
+        self.size_calls += 1
+        return len(text) * 10, 20
+
+
+def test_wrapped_log_lines_are_cached_until_width_changes():
+    drawer = Draw(MagicMock(), MagicMock(), MagicMock(), MagicMock())
+    font = FakeFont()
+
+    lines = drawer.get_wrapped_log_lines("one two three four", font, 100)
+    assert lines == ("one two", "three four")
+    calls = font.size_calls
+    assert drawer.get_wrapped_log_lines("one two three four", font, 100) == lines
+    assert font.size_calls == calls
+
+    assert drawer.get_wrapped_log_lines("one two three four", font, 200) == ("one two three four",)
+    assert font.size_calls > calls
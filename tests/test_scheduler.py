@@ -0,0 +1,98 @@
+import random
+
+import constants as const
+from enemy import Enemy, EnemyManager
+from game import Game
+from map import GameMap
+from player import Player
+from scheduler import TurnScheduler
+from status import Status
+
+
+class FakeEnemy:
+    def __init__(self, name, speed=const.NORMAL_SPEED):
+        self.name = name
+        self.speed = speed
+
+    def __repr__(self):
+        return self.name
+
+
+def run_turns(scheduler, turns):
+    return [[enemy.name for enemy in scheduler.advance()] for _ in range(turns)]
+
+
+def test_enemies_act_in_proportion_to_speed():
+    scheduler = TurnScheduler()
+    scheduler.add(FakeEnemy("normal"))
+    scheduler.add(FakeEnemy("fast", speed=const.NORMAL_SPEED * 2))
+    scheduler.add(FakeEnemy("slow", speed=const.NORMAL_SPEED // 2))
+    assert run_turns(scheduler, 3) == [
+        ["normal", "fast", "slow", "fast"],
+        ["normal", "fast", "fast"],
+        ["slow", "normal", "fast", "fast"],
+    ]
+
+
+def test_removed_and_added_enemies_during_a_turn():
+    scheduler = TurnScheduler()
+    a, b, c = FakeEnemy("a"), FakeEnemy("b"), FakeEnemy("c")
+    scheduler.add(a)
+    scheduler.add(b)
+    acted = []
+    for enemy in scheduler.advance():
+        acted.append(enemy.name)
+        scheduler.remove(b)  # aの行動でbが倒された
+        scheduler.add(c)  # 途中で出現した敵は次のターンから行動する
+    assert acted == ["a"]
+    assert run_turns(scheduler, 1) == [["c", "a"]]
+    assert b not in scheduler
+
+
+def test_sleeping_enemies_wake_when_player_comes_near():
+    scheduler = TurnScheduler()
+    sleeper = FakeEnemy("sleeper")
+    scheduler.add_sleeping(sleeper, 0, (20, 10, 30, 15))
+    assert sleeper in scheduler
+    assert run_turns(scheduler, 1) == [[]]
+
+    radius = const.MONSTER_WAKE_RADIUS
+    scheduler.wake_near(20 - radius - 1, 12)
+    assert run_turns(scheduler, 1) == [[]]
+    scheduler.wake_near(20 - radius, 12)
+    assert run_turns(scheduler, 1) == [["sleeper"]]
+    assert scheduler.sleeping == {}
+    assert scheduler.wake_index == {}
+
+
+def corner_distance(room, other):
+    return max(abs(room["x1"] - other["x1"]), abs(room["y1"] - other["y1"]))
+
+
+def test_monsters_in_unexplored_rooms_sleep_until_player_arrives():
+    rng = random.Random(0)
+    game_map = GameMap(rng)
+    game = Game(game_map, rng=rng)
+    enemy_manager = EnemyManager()
+    start_room = game_map.rooms[0]
+    far_room = max(game_map.rooms, key=lambda room: corner_distance(room, start_room))
+    assert corner_distance(far_room, start_room) > const.MONSTER_WAKE_RADIUS
+    status = {"char": "@", "name": "Player", "max_hp": 10**9, "strength": 1}
+    player = Player(start_room["x1"], start_room["y1"], Status(status), None)
+    game.add_entity(player)
+    game.mark_initial_visibility()
+
+    enemy = Enemy(far_room["x1"], far_room["y1"], Status({"char": "B", "name": "bat", "max_hp": 10}))
+    game.add_entity(enemy)
+    assert enemy in game.scheduler.sleeping_areas
+    enemy_manager.update_enemies(game)
+    assert (enemy.x, enemy.y) == (far_room["x1"], far_room["y1"])
+
+    player.x, player.y = far_room["x2"] - 1, far_room["y2"] - 1
+    game.update_entity_position(player)
+    game.update_player_position([player.x, player.y])
+    enemy_manager.update_enemies(game)
+    assert enemy in game.scheduler.entries
+
+    game.remove_entity(enemy)
+    assert enemy not in game.scheduler
@@ -0,0 +1,87 @@
+import contextlib
+import csv
+import io
+import random
+
+from batch_runner import ResultWriter, run_batch, summarize
+from simulation import PHASES, RandomPolicy, ScriptedPolicy, Simulation, StairsPolicy, get_policy_seed
+
+
+def make_simulation(policy, seed=0, num_enemies=5, immortal=True):
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation = Simulation(policy, num_enemies=num_enemies, seed=seed)
+    if immortal:
+        player = simulation.player
+        player.status.max_hp = player.status.current_hp = 10**9
+    return simulation
+
+
+def run_quietly(simulation, max_turns):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return simulation.run(max_turns)
+
+
+def test_simulation_runs_headless_without_display():
+    simulation = make_simulation(RandomPolicy(seed=1))
+    summary = run_quietly(simulation, 200)
+    assert summary["turns"] == 200
+    assert not summary["game_over"]
+    assert set(simulation.phase_times) == set(PHASES)
+    assert simulation.phase_times["enemy_update"] > 0
+
+
+def test_stairs_policy_descends_without_fades():
+    simulation = make_simulation(StairsPolicy(seed=2))
+    with contextlib.redirect_stdout(io.StringIO()):
+        while simulation.player.status.level == 1 and simulation.turns < 300:
+            simulation.step()
+    assert simulation.player.status.level == 2
+    assert simulation.game.get_entities_of_type("stairs")
+
+
+def test_scripted_policy_stops_when_script_ends():
+    simulation = make_simulation(ScriptedPolicy([("rest", 0, 0)] * 3))
+    summary = run_quietly(simulation, 100)
+    assert summary["turns"] == 3
+    assert simulation.finished
+
+
+def test_player_death_ends_simulation():
+    simulation = make_simulation(RandomPolicy(seed=3), immortal=False)
+    player = simulation.player
+    with contextlib.redirect_stdout(io.StringIO()):
+        player.take_damage(player.status.current_hp)
+        player.die(simulation.game)
+        assert simulation.game.game_over
+        assert not simulation.step()
+    assert simulation.finished
+    assert simulation.get_summary()["game_over"]
+
+
+def test_same_seed_reproduces_the_same_game():
+    summaries = [run_quietly(make_simulation(StairsPolicy(seed=5), seed=5, immortal=False), 40) for _ in range(2)]
+    assert summaries[0] == summaries[1]
+
+
+def test_default_policy_does_not_share_the_game_seed():
+    simulation = make_simulation(None, seed=7)
+    assert simulation.policy.random.random() == random.Random(get_policy_seed(7)).random()
+    assert random.Random(get_policy_seed(7)).random() != random.Random(7).random()
+    assert get_policy_seed(None) is None
+
+
+def test_batch_results_do_not_depend_on_order(tmp_path):
+    output = tmp_path / "results.csv"
+    writer = ResultWriter(str(output))
+    forward = run_batch([1, 2], 30, 3, "random", workers=1, on_result=writer.write)
+    writer.close()
+    backward = run_batch([2, 1], 30, 3, "random", workers=1)
+
+    def strip(results):
+        return [{key: value for key, value in result.items() if key != "elapsed"} for result in results]
+
+    assert strip(forward) == strip(backward)
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["seed"] for row in rows] == ["1", "2"]
+    assert summarize(forward)["games"] == 2